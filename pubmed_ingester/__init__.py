@@ -2,14 +2,27 @@
 
 """Top-level package for pubmed-ingester."""
 
+from pubmed_ingester import batches
+from pubmed_ingester import caches
 from pubmed_ingester import config
+from pubmed_ingester import decompressors
 from pubmed_ingester import excs
+from pubmed_ingester import indices
 from pubmed_ingester import ingesters
+from pubmed_ingester import loaders
 from pubmed_ingester import loggers
+from pubmed_ingester import lookups
+from pubmed_ingester import parser_targets
 from pubmed_ingester import parser_utils
 from pubmed_ingester import parsers
+from pubmed_ingester import planners
 from pubmed_ingester import pubmed_ingester
+from pubmed_ingester import records
+from pubmed_ingester import stats
+from pubmed_ingester import synthetic
+from pubmed_ingester import tables
+from pubmed_ingester import transactions
 
 __author__ = """Adamos Kyriakou"""
 __email__ = 'adam@bearnd.io'
-__version__ = '0.6.1'
+__version__ = '0.7.0'
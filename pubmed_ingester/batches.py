@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+""" Column-oriented batches of parsed Pubmed articles.
+
+This module contains functions to flatten the nested `PubmedArticle` documents
+produced by the `ParserXmlPubmedArticle` class into column-oriented batches,
+i.e., one list per field per entity type, which bulk-loaders and analytics can
+consume without walking the nested documents.
+
+Every entity row carries the `pmid` of the citation it belongs to.
+
+Attributes:
+    batch_columns (dict): The column names per entity type of a batch.
+"""
+
+from typing import Dict, List
+
+batch_columns = {
+    "citations": (
+        "pmid",
+        "version",
+        "status",
+        "owner",
+        "date_created",
+        "date_completed",
+        "date_revised",
+        "title",
+        "title_vernacular",
+        "language",
+        "publication_model",
+        "publication_year",
+        "publication_month",
+        "publication_day",
+        "date_published",
+        "journal_issn",
+        "journal_issn_type",
+        "journal_title",
+        "journal_abbreviation",
+        "journal_volume",
+        "journal_issue",
+        "journal_country",
+        "journal_medline_ta",
+        "journal_nlmid",
+        "journal_issn_linking",
+        "num_references",
+    ),
+    "authors": (
+        "pmid",
+        "ordinance",
+        "is_valid",
+        "name_last",
+        "name_first",
+        "name_initials",
+        "name_suffix",
+        "identifier",
+        "identifier_source",
+        "email",
+    ),
+    "affiliations": (
+        "pmid",
+        "author_ordinance",
+        "affiliation",
+        "identifier",
+        "identifier_source",
+    ),
+    "mesh_headings": (
+        "pmid",
+        "descriptor_ui",
+        "descriptor_name",
+        "is_descriptor_major",
+        "qualifier_ui",
+        "qualifier_name",
+        "is_qualifier_major",
+    ),
+    "keywords": (
+        "pmid",
+        "keyword",
+        "is_major",
+    ),
+    "grants": (
+        "pmid",
+        "grant_id",
+        "acronym",
+        "agency",
+        "country",
+    ),
+}
+
+
+def create_batch() -> Dict[str, Dict[str, List]]:
+    """Creates an empty column-oriented batch.
+
+    Returns:
+        Dict[str, Dict[str, List]]: The batch with an empty list per column per
+            entity type as defined under `batch_columns`.
+    """
+
+    batch = {
+        entity: {column: [] for column in columns}
+        for entity, columns in batch_columns.items()
+    }
+
+    return batch
+
+
+def append_pubmed_article(
+    batch: Dict[str, Dict[str, List]],
+    pubmed_article: Dict,
+):
+    """Appends the rows of a parsed `PubmedArticle` document to a batch.
+
+    Sections left out of a projection, i.e., parsed with the `sections`
+    argument of the `ParserXmlPubmedArticle` parse methods, are empty and yield
+    `None` columns or no rows.
+
+    Args:
+        batch (Dict[str, Dict[str, List]]): The batch as created by
+            `create_batch`.
+        pubmed_article (Dict): The `PubmedArticle` document as produced by
+            the `ParserXmlPubmedArticle` class.
+    """
+
+    medline_citation = pubmed_article["MedlineCitation"]
+    article = medline_citation["Article"]["Article"]
+    journal = article.get("Journal") or {}
+    journal_issue = (
+        (journal.get("JournalIssue") or {}).get("JournalIssue") or {}
+    )
+    pub_date = journal_issue.get("PubDate") or {}
+    article_date = article.get("ArticleDate") or {}
+    journal_info = medline_citation.get("MedlineJournalInfo") or {}
+
+    pmid = int(medline_citation["PMID"]["PMID"])
+
+    citations = batch["citations"]
+    citations["pmid"].append(pmid)
+    citations["version"].append(medline_citation["PMID"]["Version"])
+    citations["status"].append(medline_citation["Status"])
+    citations["owner"].append(medline_citation["Owner"])
+    citations["date_created"].append(medline_citation["DateCreated"]["Date"])
+    citations["date_completed"].append(
+        medline_citation["DateCompleted"]["Date"]
+    )
+    citations["date_revised"].append(medline_citation["DateRevised"]["Date"])
+    citations["title"].append(article["ArticleTitle"])
+    citations["title_vernacular"].append(article.get("VernacularTitle"))
+    citations["language"].append(article.get("Language"))
+    citations["publication_model"].append(
+        medline_citation["Article"]["PubModel"]
+    )
+    # Fallback to the journal-issue publication date should the article date
+    # be missing as the ingester does.
+    citations["publication_year"].append(
+        article_date.get("Year") or pub_date.get("Year")
+    )
+    citations["publication_month"].append(
+        article_date.get("Month") or pub_date.get("Month")
+    )
+    citations["publication_day"].append(
+        article_date.get("Day") or pub_date.get("Day")
+    )
+    citations["date_published"].append(
+        article_date.get("Date") or pub_date.get("Date")
+    )
+    citations["journal_issn"].append((journal.get("ISSN") or {}).get("ISSN"))
+    citations["journal_issn_type"].append(
+        (journal.get("ISSN") or {}).get("IssnType")
+    )
+    citations["journal_title"].append(journal.get("Title"))
+    citations["journal_abbreviation"].append(journal.get("ISOAbbreviation"))
+    citations["journal_volume"].append(journal_issue.get("Volume"))
+    citations["journal_issue"].append(journal_issue.get("Issue"))
+    citations["journal_country"].append(journal_info.get("Country"))
+    citations["journal_medline_ta"].append(journal_info.get("MedlineTA"))
+    citations["journal_nlmid"].append(journal_info.get("NlmUniqueID"))
+    citations["journal_issn_linking"].append(journal_info.get("ISSNLinking"))
+    citations["num_references"].append(
+        medline_citation.get("NumberOfReferences")
+    )
+
+    authors = batch["authors"]
+    affiliations = batch["affiliations"]
+    documents_author = (article.get("AuthorList") or {}).get("Authors") or []
+    for ordinance, document_author in enumerate(documents_author, 1):
+        doc = document_author["Author"]["Author"]
+        authors["pmid"].append(pmid)
+        authors["ordinance"].append(ordinance)
+        authors["is_valid"].append(document_author["Author"]["IsValid"])
+        authors["name_last"].append(doc["LastName"])
+        authors["name_first"].append(doc["ForeName"])
+        authors["name_initials"].append(doc["Initials"])
+        authors["name_suffix"].append(doc["Suffix"])
+        authors["identifier"].append(doc["Identifier"]["Identifier"])
+        authors["identifier_source"].append(doc["Identifier"]["Source"])
+        authors["email"].append(doc["Email"])
+
+        affiliation_info = doc["AffiliationInfo"]
+        if not affiliation_info:
+            continue
+
+        for document_affiliation in affiliation_info["Affiliations"]:
+            affiliations["pmid"].append(pmid)
+            affiliations["author_ordinance"].append(ordinance)
+            affiliations["affiliation"].append(
+                document_affiliation["Affiliation"]
+            )
+            affiliations["identifier"].append(
+                affiliation_info["Identifier"]["Identifier"]
+            )
+            affiliations["identifier_source"].append(
+                affiliation_info["Identifier"]["Source"]
+            )
+
+    # MeSH headings are flattened into descriptor-qualifier pairs with a
+    # `None` qualifier for descriptors without qualifiers.
+    mesh_headings = batch["mesh_headings"]
+    documents_mesh_heading = (
+        (medline_citation.get("MeshHeadingList") or {}).get("MeshHeadings") or
+        []
+    )
+    for document_mesh_heading in documents_mesh_heading:
+        descriptor = document_mesh_heading["MeshHeading"]["DescriptorName"]
+        qualifiers = [
+            document["QualifierName"] for document in
+            document_mesh_heading["MeshHeading"]["QualifierNames"]
+        ] or [{}]
+        for qualifier in qualifiers:
+            mesh_headings["pmid"].append(pmid)
+            mesh_headings["descriptor_ui"].append(descriptor.get("UI"))
+            mesh_headings["descriptor_name"].append(
+                descriptor.get("DescriptorName")
+            )
+            mesh_headings["is_descriptor_major"].append(
+                descriptor.get("IsMajorTopic")
+            )
+            mesh_headings["qualifier_ui"].append(qualifier.get("UI"))
+            mesh_headings["qualifier_name"].append(
+                qualifier.get("QualifierName")
+            )
+            mesh_headings["is_qualifier_major"].append(
+                qualifier.get("IsMajorTopic")
+            )
+
+    keywords = batch["keywords"]
+    documents_keyword = (
+        (medline_citation.get("KeywordList") or {}).get("Keywords") or []
+    )
+    for document_keyword in documents_keyword:
+        keywords["pmid"].append(pmid)
+        keywords["keyword"].append(document_keyword["Keyword"]["Keyword"])
+        keywords["is_major"].append(
+            document_keyword["Keyword"]["IsMajorTopic"]
+        )
+
+    grants = batch["grants"]
+    documents_grant = (article.get("GrantList") or {}).get("Grants") or []
+    for document_grant in documents_grant:
+        grants["pmid"].append(pmid)
+        grants["grant_id"].append(document_grant["Grant"]["GrantID"])
+        grants["acronym"].append(document_grant["Grant"]["Acronym"])
+        grants["agency"].append(document_grant["Grant"]["Agency"])
+        grants["country"].append(document_grant["Grant"]["Country"])
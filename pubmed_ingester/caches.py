@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+""" Caches of parsed documents and ingested records.
+
+This module contains the `CacheDocuments` class which stores the documents
+parsed out of an XML file under a cache directory so that later runs can stream
+them back instead of decompressing and parsing the file again.
+
+Entries are keyed by the checksum of the XML file and the version of the parser
+that produced them, and are named `<basename>.<checksum>.v<version>.pickle`.
+Whenever an entry is written any other entries under the same basename, i.e.,
+entries of previous revisions of the file or previous parser versions, are
+removed.
+
+It also contains the `CacheLru` class, a size-bounded in-memory cache evicting
+the least recently used entries, which the `IngesterDocumentPubmedArticle`
+class uses to map the MD5 of upserted entities to their IDs.
+"""
+
+import os
+import glob
+import pickle
+import hashlib
+import tempfile
+import collections
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional
+
+from pubmed_ingester.loggers import create_logger
+
+
+class CacheDocuments(object):
+    def __init__(
+        self,
+        cache_dir: str,
+        version: int,
+        batch_size: int = 500,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            cache_dir (str): The directory the entries are stored under. It's
+                created if it doesn't exist.
+            version (int): The version of the parser producing the documents.
+            batch_size (int, optional): The number of documents pickled
+                together. Defaults to 500.
+        """
+
+        self.cache_dir = cache_dir
+        self.version = version
+        self.batch_size = batch_size
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def checksum_file(filename: str, read_size: int = 1024 * 1024) -> str:
+        """Calculates the checksum of a file.
+
+        Args:
+            filename (str): The file to calculate the checksum of.
+            read_size (int, optional): The number of bytes read at a time.
+                Defaults to 1MB.
+
+        Returns:
+            str: The hexadecimal BLAKE2 checksum of the file.
+        """
+
+        checksum = hashlib.blake2b(digest_size=16)
+        with open(filename, "rb") as finp:
+            while True:
+                data = finp.read(read_size)
+                if not data:
+                    break
+                checksum.update(data)
+
+        return checksum.hexdigest()
+
+    def get_filename_entry(self, filename_xml: str) -> str:
+        """Returns the filename of the entry of an XML file.
+
+        Args:
+            filename_xml (str): The XML file.
+
+        Returns:
+            str: The filename of the entry, whether it exists or not.
+        """
+
+        filename_entry = "{}.{}.v{}.pickle".format(
+            os.path.basename(filename_xml),
+            self.checksum_file(filename=filename_xml),
+            self.version,
+        )
+
+        return os.path.join(self.cache_dir, filename_entry)
+
+    def purge_stale(self, filename_xml: str, filename_entry: str):
+        """Removes any entries of an XML file other than `filename_entry`.
+
+        Args:
+            filename_xml (str): The XML file.
+            filename_entry (str): The filename of the current entry.
+        """
+
+        pattern = os.path.join(
+            self.cache_dir,
+            "{}.*.v*.pickle".format(glob.escape(os.path.basename(filename_xml)))
+        )
+        for filename in glob.glob(pattern):
+            if filename == filename_entry:
+                continue
+
+            msg = "Removing stale cache entry '{}'"
+            msg_fmt = msg.format(filename)
+            self.logger.info(msg_fmt)
+
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+
+    def read(self, filename_entry: str) -> Iterator[Dict]:
+        """Lazily streams the documents of an entry.
+
+        Args:
+            filename_entry (str): The filename of the entry.
+
+        Yields:
+            Dict: The cached documents in their original order.
+        """
+
+        msg = "Reading cached documents from '{}'"
+        msg_fmt = msg.format(filename_entry)
+        self.logger.info(msg_fmt)
+
+        with open(filename_entry, "rb") as finp:
+            while True:
+                try:
+                    documents = pickle.load(finp)
+                except EOFError:
+                    break
+
+                yield from documents
+
+    def write(
+        self,
+        filename_xml: str,
+        filename_entry: str,
+        documents: Iterable[Dict],
+    ) -> Iterator[Dict]:
+        """Lazily passes documents through while writing them to an entry.
+
+        The entry is written to a temporary file which is only moved into
+        place once `documents` is exhausted so that partial parses, e.g., when
+        the consumer stops early or parsing fails, never produce an entry.
+
+        Args:
+            filename_xml (str): The XML file the documents were parsed from.
+            filename_entry (str): The filename of the entry.
+            documents (Iterable[Dict]): The parsed documents.
+
+        Yields:
+            Dict: The documents in `documents`.
+        """
+
+        fd, filename_tmp = tempfile.mkstemp(
+            dir=self.cache_dir,
+            suffix=".tmp",
+        )
+
+        is_complete = False
+        try:
+            with os.fdopen(fd, "wb") as fout:
+                batch = []
+                for document in documents:
+                    batch.append(document)
+                    if len(batch) == self.batch_size:
+                        pickle.dump(batch, fout, pickle.HIGHEST_PROTOCOL)
+                        batch = []
+                    yield document
+
+                if batch:
+                    pickle.dump(batch, fout, pickle.HIGHEST_PROTOCOL)
+
+            os.replace(filename_tmp, filename_entry)
+            is_complete = True
+
+            msg = "Cached documents of '{}' under '{}'"
+            msg_fmt = msg.format(filename_xml, filename_entry)
+            self.logger.info(msg_fmt)
+        finally:
+            if not is_complete:
+                os.remove(filename_tmp)
+
+        self.purge_stale(
+            filename_xml=filename_xml,
+            filename_entry=filename_entry,
+        )
+
+    def cached(
+        self,
+        filename_xml: str,
+        documents: Iterable[Dict],
+        filename_entry: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Streams the documents of an XML file from its entry if one exists
+        or passes `documents` through while caching them otherwise.
+
+        Args:
+            filename_xml (str): The XML file.
+            documents (Iterable[Dict]): The lazily parsed documents of the XML
+                file which are only consumed when no entry exists.
+            filename_entry (str, optional): The filename of the entry as
+                returned by `get_filename_entry`. Defaults to `None` in which
+                case it's calculated.
+
+        Yields:
+            Dict: The documents of the XML file.
+        """
+
+        if filename_entry is None:
+            filename_entry = self.get_filename_entry(filename_xml=filename_xml)
+
+        if os.path.isfile(filename_entry):
+            yield from self.read(filename_entry=filename_entry)
+        else:
+            yield from self.write(
+                filename_xml=filename_xml,
+                filename_entry=filename_entry,
+                documents=documents,
+            )
+
+
+class CacheLru(object):
+    def __init__(self, max_size: int = 100000):
+        """Constructor and initialization.
+
+        Args:
+            max_size (int, optional): The maximum number of entries after
+                which the least recently used entries are evicted. Nothing is
+                cached if `0`. Defaults to 100000.
+        """
+
+        self.max_size = max_size
+
+        self.entries = collections.OrderedDict()  # type: Dict[Hashable, Any]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retrieves the value of an entry marking it as the most recently
+        used.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            Any: The value of the entry or `None` if it isn't cached.
+        """
+
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Stores an entry evicting the least recently used entry if the cache
+        is full.
+
+        Args:
+            key (Hashable): The key of the entry.
+            value (Any): The value of the entry.
+        """
+
+        if self.max_size <= 0:
+            return
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries keeping the hit and miss counts."""
+
+        self.entries.clear()
+
+    def summary(self) -> str:
+        """Summarizes the size and hit ratio of the cache.
+
+        Returns:
+            str: The summary.
+        """
+
+        num_lookups = self.hits + self.misses
+
+        return "{} entries {} hits {} misses ({:.1f}% hits)".format(
+            len(self.entries),
+            self.hits,
+            self.misses,
+            100.0 * self.hits / num_lookups if num_lookups else 0.0,
+        )
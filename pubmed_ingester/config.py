@@ -58,6 +58,84 @@ config_schema_default = {
         "sql_db": {
             "type": "string", "description": "SQL server database name."
         },
+        # Parser Configuration Settings.
+        "decompression_backend": {
+            "type": "string",
+            "description": ("The backend used to decompress gzipped XML "
+                            "files."),
+            "enum": [
+                "stdlib",
+                "isal",
+                "zlib_ng",
+                "fast",
+                "subprocess"
+            ]
+        },
+        "parser_engine": {
+            "type": "string",
+            "description": ("The engine used to parse Pubmed XML files, i.e., "
+                            "`etree.iterparse` or an `lxml` parser target."),
+            "enum": [
+                "iterparse",
+                "target"
+            ]
+        },
+        "cache_dir": {
+            "type": "string",
+            "description": ("The directory parsed documents are cached under "
+                            "(disabled if undefined)."),
+        },
+        "prefetch_max_size": {
+            "type": "integer",
+            "description": ("The maximum number of decompressed bytes of the "
+                            "next file read ahead while the current file is "
+                            "ingested (disabled if undefined or 0)."),
+        },
+        "ingest_batch_size": {
+            "type": "integer",
+            "description": ("The number of articles ingested together through "
+                            "the `ingest_many` method of the ingester (one by "
+                            "one if undefined or 1)."),
+        },
+        "unit_of_work_size": {
+            "type": "integer",
+            "description": ("The number of articles ingested through the DAL "
+                            "in a single transaction, with a savepoint per "
+                            "article, rather than a transaction per DAL call "
+                            "(disabled if undefined or 0). Requires a single "
+                            "worker as the transactions of several workers "
+                            "could deadlock on shared records, e.g., "
+                            "authors."),
+        },
+        "ingest_loader": {
+            "type": "string",
+            "description": ("The path articles are ingested through, i.e., "
+                            "upserts through the DAL or `COPY` into staging "
+                            "tables merged in bulk for full baseline loads."),
+            "enum": [
+                "dal",
+                "copy"
+            ]
+        },
+        "identity_cache_size": {
+            "type": "integer",
+            "description": ("The maximum number of IDs of upserted entities, "
+                            "e.g., journals or authors, cached per entity "
+                            "type by every ingester (defaults to 100000, "
+                            "disabled if 0)."),
+        },
+        "mesh_missing_ttl": {
+            "type": "number",
+            "description": ("The number of seconds after which the MeSH UIs "
+                            "found missing from the database are looked up "
+                            "again by every ingester (defaults to 3600, "
+                            "remembered until the end of the run if 0)."),
+        },
+        "parser_stats": {
+            "type": "boolean",
+            "description": ("Whether to log the per-method parser timings at "
+                            "the end of every file."),
+        },
     }
 }
 
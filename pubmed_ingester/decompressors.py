@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+""" Pluggable decompression backends for gzipped XML files.
+
+This module contains the `ReaderReadAhead` file-like class, which reads and
+decompresses an underlying stream on a background thread, and the
+`open_gzip_file` function which opens a gzipped file through one of the
+supported decompression backends:
+
+- `stdlib`: The standard-library `gzip` module.
+- `isal`: The `isal.igzip` module (Intel ISA-L) if installed.
+- `zlib_ng`: The `zlib_ng.gzip_ng` module if installed.
+- `fast`: The fastest of the above that is installed.
+- `subprocess`: An external `pigz -dc` (or `gzip -dc` if `pigz` isn't
+    available) process piped into the reader.
+"""
+
+import gzip
+import queue
+import shutil
+import threading
+import subprocess
+from typing import Optional
+
+from pubmed_ingester.excs import InvalidArguments
+from pubmed_ingester.excs import DecompressionBackendUnavailable
+
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+try:
+    from zlib_ng import gzip_ng
+except ImportError:
+    gzip_ng = None
+
+
+decompression_backends = ("stdlib", "isal", "zlib_ng", "fast", "subprocess")
+
+
+class ReaderReadAhead(object):
+    """File-like object reading chunks off an underlying binary stream on a
+    background thread into a bounded queue.
+
+    The reader only implements the subset of the file interface used by
+    `lxml.etree.iterparse`, i.e., `read` and `close`.
+    """
+
+    def __init__(
+        self,
+        file_obj,
+        chunk_size: int = 1024 * 1024,
+        max_chunks: int = 16,
+        process: Optional[subprocess.Popen] = None,
+    ):
+        """Constructor and initialization.
+
+        Args:
+            file_obj: The binary file-like object to read from.
+            chunk_size (int, optional): The size in bytes of the chunks read
+                off `file_obj`. Defaults to 1MB.
+            max_chunks (int, optional): The maximum number of chunks buffered
+                ahead of the consumer. Defaults to 16.
+            process (subprocess.Popen, optional): The process writing into
+                `file_obj` (if any) whose exit-code is checked upon EOF.
+        """
+
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.process = process
+
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._event_stop = threading.Event()
+        self._chunk = b""
+        self._offset = 0
+        self._is_eof = False
+
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Puts an item in the queue unless the reader is being closed."""
+
+        while not self._event_stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def _read_ahead(self):
+        """Reads chunks off the underlying stream until EOF or closing."""
+
+        try:
+            while True:
+                chunk = self.file_obj.read(self.chunk_size)
+                if not chunk:
+                    break
+                if not self._put(chunk):
+                    return
+
+            if self.process is not None and self.process.wait() != 0:
+                msg = "Decompression process exited with code {}."
+                msg_fmt = msg.format(self.process.returncode)
+                self._put(IOError(msg_fmt))
+                return
+        except Exception as exc:
+            self._put(exc)
+            return
+
+        # An empty chunk signals EOF to the consumer.
+        self._put(b"")
+
+    def _next_chunk(self):
+        """Retrieves the next chunk read off the underlying stream."""
+
+        chunk = self._queue.get()
+        if isinstance(chunk, Exception):
+            self._is_eof = True
+            raise chunk
+
+        if not chunk:
+            self._is_eof = True
+
+        return chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to `size` bytes or everything if `size` is negative."""
+
+        parts = []
+        remaining = size if (size is not None and size >= 0) else None
+        while remaining is None or remaining > 0:
+            if self._offset >= len(self._chunk):
+                if self._is_eof:
+                    break
+                self._chunk = self._next_chunk()
+                self._offset = 0
+                if not self._chunk:
+                    break
+
+            if remaining is None:
+                part = self._chunk[self._offset:]
+            else:
+                part = self._chunk[self._offset:self._offset + remaining]
+                remaining -= len(part)
+            self._offset += len(part)
+            parts.append(part)
+
+        return b"".join(parts)
+
+    def close(self):
+        """Stops the background thread and closes the underlying stream."""
+
+        self._event_stop.set()
+        self._thread.join()
+
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+
+        self.file_obj.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _open_subprocess(filename: str, chunk_size: int):
+    """Opens a gzipped file through an external decompression process."""
+
+    executable = shutil.which("pigz") or shutil.which("gzip")
+    if executable is None:
+        msg_fmt = "Neither `pigz` nor `gzip` were found in the `PATH`."
+        raise DecompressionBackendUnavailable(msg_fmt)
+
+    process = subprocess.Popen(
+        [executable, "-dc", filename],
+        stdout=subprocess.PIPE,
+        bufsize=chunk_size,
+    )
+
+    return process
+
+
+def open_gzip_file(
+    filename: str,
+    backend: str = "stdlib",
+    chunk_size: int = 1024 * 1024,
+    max_chunks: int = 16,
+) -> ReaderReadAhead:
+    """Opens a gzipped file through a decompression backend read ahead on a
+    background thread.
+
+    Args:
+        filename (str): The path to the gzipped file.
+        backend (str, optional): The decompression backend, one of
+            `decompression_backends`. Defaults to `stdlib`.
+        chunk_size (int, optional): The size in bytes of the decompressed
+            chunks read ahead. Defaults to 1MB.
+        max_chunks (int, optional): The maximum number of decompressed chunks
+            buffered ahead of the consumer. Defaults to 16.
+
+    Returns:
+        ReaderReadAhead: The read-ahead file-like object.
+
+    Raises:
+        InvalidArguments: Raised when an unknown backend is requested.
+        DecompressionBackendUnavailable: Raised when the requested backend
+            isn't installed.
+    """
+
+    if backend not in decompression_backends:
+        msg = "Invalid decompression backend '{}'. Expected one of {}."
+        msg_fmt = msg.format(backend, decompression_backends)
+        raise InvalidArguments(msg_fmt)
+
+    # Resolve the fastest installed in-process backend.
+    if backend == "fast":
+        if igzip is not None:
+            backend = "isal"
+        elif gzip_ng is not None:
+            backend = "zlib_ng"
+        else:
+            backend = "stdlib"
+
+    process = None
+    if backend == "stdlib":
+        file_obj = gzip.GzipFile(filename=filename, mode="rb")
+    elif backend == "isal":
+        if igzip is None:
+            msg_fmt = "The `isal` package is not installed."
+            raise DecompressionBackendUnavailable(msg_fmt)
+        file_obj = igzip.open(filename, "rb")
+    elif backend == "zlib_ng":
+        if gzip_ng is None:
+            msg_fmt = "The `zlib-ng` package is not installed."
+            raise DecompressionBackendUnavailable(msg_fmt)
+        file_obj = gzip_ng.open(filename, "rb")
+    else:
+        process = _open_subprocess(filename=filename, chunk_size=chunk_size)
+        file_obj = process.stdout
+
+    reader = ReaderReadAhead(
+        file_obj=file_obj,
+        chunk_size=chunk_size,
+        max_chunks=max_chunks,
+        process=process,
+    )
+
+    return reader
@@ -31,3 +31,10 @@ class GooglePlacesApiQueryLimitError(Exception):
     reached."""
     def __init__(self, message, *args):
         super(GooglePlacesApiQueryLimitError, self).__init__(message, *args)
+
+
+class DecompressionBackendUnavailable(Exception):
+    """Exception raised when a requested decompression backend is not
+    installed or available."""
+    def __init__(self, message, *args):
+        super(DecompressionBackendUnavailable, self).__init__(message, *args)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+""" In-memory indices over the ingested citations.
+
+This module contains the `IndexRevisions` class which maps the PMIDs of the
+ingested citations to their revision dates so that articles whose
+`<DateRevised>` matches the stored one can be skipped before any DB call.
+
+Rather than ORM objects or a `dict` the index is backed by two parallel
+`array.array` objects of PMIDs, kept sorted, and revision dates as proleptic
+Gregorian ordinals which take 8 bytes per citation and are looked up through
+`bisect`. Changes made after the index is loaded, e.g., newly ingested or
+deleted citations, are kept in a small overlay `dict` in front of the arrays.
+"""
+
+import array
+import bisect
+import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import sqlalchemy
+from fform.dals_pubmed import DalPubmed
+from fform.orm_pubmed import Citation
+
+from pubmed_ingester.loggers import create_logger
+
+
+class IndexRevisions(object):
+    # Ordinal stored for citations without a revision date.
+    ordinal_missing = 0
+    # Overlay value marking deleted citations.
+    ordinal_deleted = -1
+
+    def __init__(self, **kwargs):
+        """Constructor and initialization."""
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        self.pmids = array.array("I")
+        self.ordinals = array.array("I")
+        self.overlay = {}  # type: Dict[int, int]
+
+    def __len__(self):
+        return len(self.pmids)
+
+    @classmethod
+    def _to_ordinal(cls, date: Optional[datetime.date]) -> int:
+        if date is None:
+            return cls.ordinal_missing
+
+        return date.toordinal()
+
+    def load(self, rows: Iterable[Tuple[int, Optional[datetime.date]]]):
+        """Loads the index from `(pmid, date_revised)` rows replacing any
+        previous contents.
+
+        Args:
+            rows (Iterable[Tuple[int, Optional[datetime.date]]]): The PMIDs
+                and revision dates of the citations, ideally sorted by PMID.
+        """
+
+        pmids = array.array("I")
+        ordinals = array.array("I")
+        is_sorted = True
+        pmid_last = -1
+        for pmid, date_revised in rows:
+            if pmid < pmid_last:
+                is_sorted = False
+            pmid_last = pmid
+
+            pmids.append(pmid)
+            ordinals.append(self._to_ordinal(date_revised))
+
+        # Unsorted rows are only sorted once at the end.
+        if not is_sorted:
+            pairs = sorted(zip(pmids, ordinals))
+            pmids = array.array("I", (pair[0] for pair in pairs))
+            ordinals = array.array("I", (pair[1] for pair in pairs))
+
+        self.pmids = pmids
+        self.ordinals = ordinals
+        self.overlay = {}
+
+        msg = "Loaded revision dates of {} citations ({:.1f}MB)"
+        msg_fmt = msg.format(
+            len(self.pmids),
+            (
+                self.pmids.itemsize * len(self.pmids) +
+                self.ordinals.itemsize * len(self.ordinals)
+            ) / 1024 / 1024,
+        )
+        self.logger.info(msg_fmt)
+
+    def load_citations(self, dal: DalPubmed, batch_size: int = 100000):
+        """Loads the index from the `citations` table streaming the PMIDs and
+        revision dates in batches without creating any ORM objects.
+
+        Args:
+            dal (DalPubmed): The DAL used to query the citations.
+            batch_size (int, optional): The number of rows fetched at a time.
+                Defaults to 100000.
+        """
+
+        table_citation = Citation.__table__  # type: sqlalchemy.Table
+
+        query = sqlalchemy.select([
+            table_citation.c.pmid,
+            table_citation.c.date_revision,
+        ]).order_by(table_citation.c.pmid)
+
+        def generate_rows():
+            with dal.session_scope() as session:
+                result = session.execute(
+                    query.execution_options(stream_results=True)
+                )
+                while True:
+                    rows = result.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+
+        self.load(rows=generate_rows())
+
+    def get(self, pmid: int) -> Optional[datetime.date]:
+        """Retrieves the revision date of a citation.
+
+        Args:
+            pmid (int): The PMID of the citation.
+
+        Returns:
+            datetime.date: The revision date of the citation or `None` if the
+                citation isn't in the index or has no revision date.
+        """
+
+        ordinal = self.overlay.get(pmid)
+        if ordinal is None:
+            idx = bisect.bisect_left(self.pmids, pmid)
+            if idx == len(self.pmids) or self.pmids[idx] != pmid:
+                return None
+            ordinal = self.ordinals[idx]
+
+        if ordinal in (self.ordinal_missing, self.ordinal_deleted):
+            return None
+
+        return datetime.date.fromordinal(ordinal)
+
+    def __contains__(self, pmid: int) -> bool:
+
+        ordinal = self.overlay.get(pmid)
+        if ordinal is not None:
+            return ordinal != self.ordinal_deleted
+
+        idx = bisect.bisect_left(self.pmids, pmid)
+
+        return idx != len(self.pmids) and self.pmids[idx] == pmid
+
+    def update(self, pmid: int, date_revised: Optional[datetime.date]):
+        """Records the revision date of an ingested citation.
+
+        Args:
+            pmid (int): The PMID of the citation.
+            date_revised (datetime.date): The revision date of the citation.
+        """
+
+        self.overlay[pmid] = self._to_ordinal(date_revised)
+
+    def remove(self, pmid: int):
+        """Records the deletion of a citation.
+
+        Args:
+            pmid (int): The PMID of the citation.
+        """
+
+        self.overlay[pmid] = self.ordinal_deleted
+
+    def is_revised(self, header: Dict) -> bool:
+        """Decides whether an article is new or revised compared to the
+        ingested citation, so that it can be combined with the
+        `IngesterDocumentPubmedArticle.is_ingestible` method into the article
+        filter of the `ParserXmlPubmedArticle.parse` method.
+
+        Args:
+            header (Dict): The article header with the `PMID` and
+                `DateRevised` as returned by the
+                `ParserXmlPubmedArticle.parse_header` method.
+
+        Returns:
+            bool: `False` if a citation with the same PMID and revision date
+                is already ingested, `True` otherwise.
+        """
+
+        # Leave malformed headers to the ingester.
+        if header["PMID"] is None:
+            return True
+
+        pmid = int(header["PMID"])
+        if pmid not in self:
+            return True
+
+        return self.get(pmid) != header["DateRevised"]
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import abc
-from typing import List, Dict
+import collections
+from typing import Callable, List, Dict, Optional, Union, Iterable, Tuple
+
+import sqlalchemy
+import sqlalchemy.dialects.postgresql
 
 from pubmed_ingester.loggers import create_logger
 from fform.dals_pubmed import DalPubmed
+from fform.orm_pubmed import Citation
 from fform.orm_pubmed import Author
 from fform.orm_pubmed import ArticleIdentifierType
 from fform.orm_pubmed import AbstractText
@@ -18,10 +23,18 @@ from fform.orm_pubmed import Article
 from fform.orm_pubmed import Databank
 from fform.orm_pubmed import AccessionNumber
 from fform.orm_pubmed import Grant
-from fform.orm_mt import Descriptor
-from fform.orm_mt import Qualifier
 from pubmed_ingester.utils import log_ingestion_of_document
 from pubmed_ingester.utils import log_ingestion_of_documents
+from pubmed_ingester.utils import chunk_generator
+from pubmed_ingester.records import PubmedArticle
+from pubmed_ingester.records import to_document
+from pubmed_ingester.lookups import LookupMesh
+from pubmed_ingester.caches import CacheLru
+from pubmed_ingester.transactions import TransactionUnitOfWork
+from pubmed_ingester.tables import dedupe_link_rows
+from pubmed_ingester.tables import get_link_key
+from pubmed_ingester.tables import link_tables
+from pubmed_ingester.tables import to_rows
 
 
 class IngesterDocumentBase(object):
@@ -46,14 +59,101 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
     def __init__(
         self,
         dal: DalPubmed,
+        batch_size: int = 1,
+        lookup_mesh: Optional[LookupMesh] = None,
+        identity_cache_size: int = 100000,
+        unit_of_work_size: int = 0,
         **kwargs
     ):
+        """Constructor and initialization.
+
+        Args:
+            dal (DalPubmed): The DAL used to ingest the articles.
+            batch_size (int, optional): The number of articles callers should
+                ingest together through the `ingest_many` method. Defaults to
+                `1`, i.e., one by one through the `ingest` method.
+            lookup_mesh (LookupMesh, optional): The lookup of MeSH descriptor
+                and qualifier IDs, e.g., loaded before forking worker
+                processes. Defaults to an empty lookup filled as UIs are
+                resolved.
+            identity_cache_size (int, optional): The maximum number of IDs of
+                upserted entities cached per entity type, e.g., journals or
+                authors, so that entities already upserted by this ingester
+                skip the DB. Disabled if `0`. Defaults to 100000.
+            unit_of_work_size (int, optional): The number of articles
+                ingested in a single session and transaction, with every
+                article ingested within its own savepoint, until the `commit`
+                method is called. Disabled if `0`, i.e., every DAL call
+                commits its own session scope. Defaults to `0`.
+        """
 
         super(IngesterDocumentPubmedArticle, self).__init__(
             dal=dal,
             kwargs=kwargs
         )
 
+        self.batch_size = max(1, batch_size)
+
+        if lookup_mesh is None:
+            lookup_mesh = LookupMesh(
+                logger_level=kwargs.get("logger_level", "DEBUG")
+            )
+        self.lookup_mesh = lookup_mesh
+
+        # Caches of the IDs of upserted entities keyed by their MD5 (or
+        # equivalent key) per entity type. Keys cover every upserted column so
+        # that an entity whose columns changed misses the cache and is
+        # upserted again.
+        self.caches = {
+            name: CacheLru(max_size=identity_cache_size)
+            for name in [
+                "JournalInfo",
+                "Journal",
+                "PublicationType",
+                "Keyword",
+                "Grant",
+                "Databank",
+                "AccessionNumber",
+                "Author",
+                "Affiliation",
+            ]
+        }  # type: Dict[str, CacheLru]
+
+        # The unit of work standing in for the DAL, if enabled.
+        self.unit_of_work = None  # type: Optional[TransactionUnitOfWork]
+        if unit_of_work_size > 0:
+            self.unit_of_work = TransactionUnitOfWork(
+                dal=dal,
+                size=unit_of_work_size,
+                logger_level=kwargs.get("logger_level", "DEBUG"),
+            )
+            self.dal = self.unit_of_work
+
+        # The arguments of the `biodi_*` DAL calls upserting link rows, e.g.,
+        # `biodi_citation_keywords`, deferred by the `ingest_many` method
+        # keyed by DAL method name.
+        self.links = None  # type: Optional[Dict[str, List[Dict]]]
+
+    @staticmethod
+    def is_ingestible(header: Dict) -> bool:
+        """Decides whether an article should be ingested based on its header
+        alone so that it can also be used as the article filter of the
+        `ParserXmlPubmedArticle.parse` method.
+
+        Only articles where the `MedlineCitation` version of the `PMID` is
+        `1` are ingested to ensure unique records.
+
+        Args:
+            header (Dict): The article header with the `PMID`, `Version`,
+                `Status`, `Owner`, and `DateRevised` as returned by the
+                `ParserXmlPubmedArticle.parse_header` method.
+
+        Returns:
+            bool: Whether the article should be ingested.
+        """
+
+        return header["Version"] == "1"
+
     @staticmethod
     def _convert_enum_value(value: str):
         """Converts enumeration values to a form compatible with PostgreSQL by
@@ -73,24 +173,126 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
 
         return value
 
+    @staticmethod
+    def _biodi_unique(
+        method: Callable,
+        keys: List,
+        cache: Optional[CacheLru] = None,
+        **columns
+    ) -> List[int]:
+        """Calls a `biodi_*` DAL method with the unique records only, i.e., the
+        first record of every key, so that records repeated within an article
+        or across a batch of articles are upserted once per statement, in
+        order of their key.
+
+        Args:
+            method (Callable): The `biodi_*` DAL method.
+            keys (List): The key of every record, e.g., its MD5.
+            cache (CacheLru, optional): The cache of the IDs of records
+                already upserted under their keys, which are then skipped,
+                and which is updated with the IDs of the upserted records.
+                Defaults to `None`.
+            **columns: The column lists passed to the method.
+
+        Returns:
+            List[int]: The IDs of all records in their original order.
+        """
+
+        if not keys:
+            return []
+
+        positions = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(key, position)
+
+        ids = {}
+        if cache is not None:
+            for key in positions:
+                _id = cache.get(key)
+                if _id is not None:
+                    ids[key] = _id
+
+        # Upsert the records in order of their key so that concurrent
+        # transactions, e.g., of other workers, lock shared records in the same
+        # order. Keys are compared through `repr` as they may hold `None`.
+        positions_upserted = sorted(
+            (
+                position
+                for key, position in positions.items()
+                if key not in ids
+            ),
+            key=lambda position: repr(keys[position]),
+        )
+        if positions_upserted:
+            if positions_upserted == list(range(len(keys))):
+                ids_upserted = method(**columns)
+            else:
+                ids_upserted = method(**{
+                    name: [values[position] for position in positions_upserted]
+                    for name, values in columns.items()
+                })
+
+            for position, _id in zip(positions_upserted, ids_upserted):
+                ids[keys[position]] = _id
+                if cache is not None:
+                    cache.put(keys[position], _id)
+
+        return [ids[key] for key in keys]
+
+    @staticmethod
+    def _split_ids(
+        ids: List[int],
+        counts: List[int],
+    ) -> List[List[int]]:
+        """Splits the IDs of records ingested in bulk back into consecutive
+        groups of the given sizes, e.g., one per article.
+
+        Args:
+            ids (List[int]): The IDs of the records.
+            counts (List[int]): The number of records in every group.
+
+        Returns:
+            List[List[int]]: The IDs of every group.
+        """
+
+        groups = []
+        start = 0
+        for count in counts:
+            groups.append(ids[start:start + count])
+            start += count
+
+        return groups
+
+    def _biodi_links(self, name: str, **kwargs):
+        """Calls a `biodi_*` DAL method upserting link rows or, while the
+        `ingest_many` method defers them, records its arguments so that the
+        link rows of all articles are inserted together through the
+        `insert_links` method.
+
+        Args:
+            name (str): The name of the `biodi_*` DAL method.
+            **kwargs: The arguments of the DAL method.
+        """
+
+        if self.links is None:
+            getattr(self.dal, name)(**kwargs)
+        else:
+            self.links[name].append(kwargs)
+
     def retrieve_chemicals(
         self,
         documents: List[Dict]
     ) -> List[int]:
 
-        descriptor_obj_ids = []
-        for document in documents:
-            ui = document["Chemical"]["NameOfSubstance"]["UI"]
-            descriptor = self.dal.get_by_attr(
-                orm_class=Descriptor,
-                attr_name="ui",
-                attr_value=ui,
-            )  # type: Descriptor
-
-            if descriptor:
-                descriptor_obj_ids.append(descriptor.descriptor_id)
+        descriptor_obj_ids = self.lookup_mesh.get_descriptor_ids(
+            dal=self.dal,
+            uis=[
+                document["Chemical"]["NameOfSubstance"]["UI"]
+                for document in documents
+            ],
+        )
 
-        return descriptor_obj_ids
+        return [_id for _id in descriptor_obj_ids if _id]
 
     @log_ingestion_of_document(document_name="JournalInfo")
     def ingest_journal_info(
@@ -98,12 +300,23 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
         document: Dict
     ) -> int:
 
+        key = (
+            document["NlmUniqueID"],
+            document["ISSNLinking"],
+            document["Country"],
+            document["MedlineTA"],
+        )
+        journal_info_id = self.caches["JournalInfo"].get(key)
+        if journal_info_id is not None:
+            return journal_info_id
+
         journal_info_id = self.dal.iodi_journal_info(
             nlmid=document["NlmUniqueID"],
             issn=document["ISSNLinking"],
             country=document["Country"],
             abbreviation=document["MedlineTA"],
         )
+        self.caches["JournalInfo"].put(key, journal_info_id)
 
         return journal_info_id
 
@@ -121,13 +334,19 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
         journal_obj.title = document["Title"]
         journal_obj.abbreviation = document["ISOAbbreviation"]
 
+        md5 = journal_obj.md5
+        journal_id = self.caches["Journal"].get(md5)
+        if journal_id is not None:
+            return journal_id
+
         journal_id = self.dal.iodi_journal(
             issn=journal_obj.issn,
             issn_type=journal_obj.issn_type,
             title=journal_obj.title,
             abbreviation=journal_obj.abbreviation,
-            md5=journal_obj.md5
+            md5=md5
         )
+        self.caches["Journal"].put(md5, journal_id)
 
         return journal_id
 
@@ -161,7 +380,9 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             texts.append(abstract_text.text)
             md5s.append(abstract_text.md5)
 
-        abstract_text_obj_ids = self.dal.biodi_abstract_texts(
+        abstract_text_obj_ids = self._biodi_unique(
+            method=self.dal.biodi_abstract_texts,
+            keys=md5s,
             labels=labels,
             categories=categories,
             texts=texts,
@@ -188,7 +409,8 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             ))
             identifiers.append(data["ArticleId"])
 
-        self.dal.biodi_citation_identifiers(
+        self._biodi_links(
+            "biodi_citation_identifiers",
             citation_id=citation_id,
             identifier_types=identifier_types,
             identifiers=identifiers
@@ -208,7 +430,12 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             uids.append(doc["UI"])
             publication_types.append(doc["PublicationType"])
 
-        publication_type_obj_ids = self.dal.biodi_publication_types(
+        # Publication types are upserted on their UID, which would leave the
+        # cached ones with a changed name unchanged if keyed on it alone.
+        publication_type_obj_ids = self._biodi_unique(
+            method=self.dal.biodi_publication_types,
+            keys=list(zip(uids, publication_types)),
+            cache=self.caches["PublicationType"],
             uids=uids,
             publication_types=publication_types
         )
@@ -290,38 +517,24 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
         documents: List[Dict]
     ) -> List[int]:
 
-        descriptor_obj_ids = []
-        for document in documents:
-            ui = document["UI"]
-            descriptor = self.dal.get_by_attr(
-                orm_class=Descriptor,
-                attr_name="ui",
-                attr_value=ui,
-            )  # type: Descriptor
-
-            if descriptor:
-                descriptor_obj_ids.append(descriptor.descriptor_id)
+        descriptor_obj_ids = self.lookup_mesh.get_descriptor_ids(
+            dal=self.dal,
+            uis=[document["UI"] for document in documents],
+        )
 
-        return descriptor_obj_ids
+        return [_id for _id in descriptor_obj_ids if _id]
 
     def retrieve_qualifiers(
         self,
         documents: List[Dict]
     ) -> List[int]:
 
-        qualifier_obj_ids = []
-        for document in documents:
-            ui = document["QualifierName"]["UI"]
-            qualifier = self.dal.get_by_attr(
-                orm_class=Qualifier,
-                attr_name="ui",
-                attr_value=ui,
-            )  # type: Qualifier
-
-            if qualifier:
-                qualifier_obj_ids.append(qualifier.qualifier_id)
+        qualifier_obj_ids = self.lookup_mesh.get_qualifier_ids(
+            dal=self.dal,
+            uis=[document["QualifierName"]["UI"] for document in documents],
+        )
 
-        return qualifier_obj_ids
+        return [_id for _id in qualifier_obj_ids if _id]
 
     @log_ingestion_of_documents(document_name="Keyword")
     def ingest_keywords(
@@ -340,7 +553,10 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             keywords.append(keyword.keyword)
             md5s.append(keyword.md5)
 
-        keyword_obj_ids = self.dal.biodi_keywords(
+        keyword_obj_ids = self._biodi_unique(
+            method=self.dal.biodi_keywords,
+            keys=md5s,
+            cache=self.caches["Keyword"],
             keywords=keywords,
             md5s=md5s
         )
@@ -431,7 +647,8 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
                 idx_qualifier += 1
                 are_qualifiers_major.append(doc["IsMajorTopic"])
 
-        self.dal.biodi_citation_descriptors_qualifiers(
+        self._biodi_links(
+            "biodi_citation_descriptors_qualifiers",
             citation_id=citation_id,
             descriptor_ids=descriptor_ids,
             are_descriptors_major=are_descriptors_major,
@@ -448,6 +665,29 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
 
         # Iterate over the documents, add the `Databank` records and retrieve
         # their IDs.
+        databank_ids = self.ingest_databank_names(documents=documents)
+
+        for databank_id, document in zip(databank_ids, documents):
+            data = document["DataBank"]
+            _docs = data["AccessionNumberList"]["AccessionNumbers"]
+
+            accession_number_ids = self.ingest_accession_numbers(
+                documents=_docs
+            )
+
+            self._biodi_links(
+                "biodi_article_databank_accession_numbers",
+                article_id=article_id,
+                databank_id=databank_id,
+                accession_number_ids=accession_number_ids
+            )
+
+    @log_ingestion_of_documents(document_name="DataBank")
+    def ingest_databank_names(
+        self,
+        documents: List[Dict]
+    ) -> List[int]:
+
         databanks = []
         databank_md5s = []
         for document in documents:
@@ -457,35 +697,41 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             databanks.append(databank_obj.databank)
             databank_md5s.append(databank_obj.md5)
 
-        databank_ids = self.dal.biodi_databanks(
+        databank_ids = self._biodi_unique(
+            method=self.dal.biodi_databanks,
+            keys=databank_md5s,
+            cache=self.caches["Databank"],
             databanks=databanks,
             md5s=databank_md5s
         )
 
-        for databank_id, document in zip(databank_ids, documents):
-            data = document["DataBank"]
-            _docs = data["AccessionNumberList"]["AccessionNumbers"]
-
-            accession_numbers = []
-            accession_number_md5s = []
-            for _doc in _docs:
-                accession_number_obj = AccessionNumber()
-                _num = _doc["AccessionNumber"]["AccessionNumber"]
-                accession_number_obj.accession_number = _num
+        return databank_ids
 
-                accession_numbers.append(accession_number_obj.accession_number)
-                accession_number_md5s.append(accession_number_obj.md5)
+    @log_ingestion_of_documents(document_name="AccessionNumber")
+    def ingest_accession_numbers(
+        self,
+        documents: List[Dict]
+    ) -> List[int]:
 
-            accession_number_ids = self.dal.biodi_accession_numbers(
-                accession_numbers=accession_numbers,
-                md5s=accession_number_md5s
-            )
+        accession_numbers = []
+        accession_number_md5s = []
+        for document in documents:
+            accession_number_obj = AccessionNumber()
+            _num = document["AccessionNumber"]["AccessionNumber"]
+            accession_number_obj.accession_number = _num
+
+            accession_numbers.append(accession_number_obj.accession_number)
+            accession_number_md5s.append(accession_number_obj.md5)
+
+        accession_number_ids = self._biodi_unique(
+            method=self.dal.biodi_accession_numbers,
+            keys=accession_number_md5s,
+            cache=self.caches["AccessionNumber"],
+            accession_numbers=accession_numbers,
+            md5s=accession_number_md5s
+        )
 
-            self.dal.biodi_article_databank_accession_numbers(
-                article_id=article_id,
-                databank_id=databank_id,
-                accession_number_ids=accession_number_ids
-            )
+        return accession_number_ids
 
     @log_ingestion_of_documents(document_name="Author")
     def ingest_authors(
@@ -529,7 +775,10 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             emails.append(author_obj.email)
             md5s.append(author_obj.md5)
 
-        author_obj_ids = self.dal.biodi_authors(
+        author_obj_ids = self._biodi_unique(
+            method=self.dal.biodi_authors,
+            keys=md5s,
+            cache=self.caches["Author"],
             author_identifiers=author_identifiers,
             author_identifier_sources=author_identifier_sources,
             names_first=names_first,
@@ -548,28 +797,52 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
         document: Dict,
     ) -> List[int]:
 
+        return self.ingest_affiliation_infos(documents=[document])[0]
+
+    @log_ingestion_of_documents(document_name="AffiliationInfo")
+    def ingest_affiliation_infos(
+        self,
+        documents: List[Dict],
+    ) -> List[List[int]]:
+        """Ingests the affiliations of multiple `AffiliationInfo` documents,
+        e.g., those of every author in a batch of articles, through a single
+        `biodi_affiliations` call.
+
+        Args:
+            documents (List[Dict]): The `AffiliationInfo` documents.
+
+        Returns:
+            List[List[int]]: The IDs of the affiliations of every document.
+        """
+
         affiliation_identifiers = []
         affiliation_identifier_sources = []
         affiliations = []
         affiliation_canonical_ids = []
         md5s = []
 
-        doc_ident = document["Identifier"]
-        for entry in document["Affiliations"]:
-            affiliation = Affiliation()
-            affiliation.affiliation_identifier = doc_ident["Identifier"]
-            affiliation.affiliation_identifier_source = doc_ident["Source"]
-            affiliation.affiliation = entry["Affiliation"]
-
-            affiliation_identifiers.append(affiliation.affiliation_identifier)
-            affiliation_identifier_sources.append(
-                affiliation.affiliation_identifier_source
-            )
-            affiliations.append(affiliation.affiliation)
-            affiliation_canonical_ids.append(None)
-            md5s.append(affiliation.md5)
-
-        affiliation_obj_ids = self.dal.biodi_affiliations(
+        for document in documents:
+            doc_ident = document["Identifier"]
+            for entry in document["Affiliations"]:
+                affiliation = Affiliation()
+                affiliation.affiliation_identifier = doc_ident["Identifier"]
+                affiliation.affiliation_identifier_source = doc_ident["Source"]
+                affiliation.affiliation = entry["Affiliation"]
+
+                affiliation_identifiers.append(
+                    affiliation.affiliation_identifier
+                )
+                affiliation_identifier_sources.append(
+                    affiliation.affiliation_identifier_source
+                )
+                affiliations.append(affiliation.affiliation)
+                affiliation_canonical_ids.append(None)
+                md5s.append(affiliation.md5)
+
+        affiliation_obj_ids = self._biodi_unique(
+            method=self.dal.biodi_affiliations,
+            keys=md5s,
+            cache=self.caches["Affiliation"],
             affiliation_identifiers=affiliation_identifiers,
             affiliation_identifier_sources=affiliation_identifier_sources,
             affiliations=affiliations,
@@ -577,15 +850,31 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             md5s=md5s
         )
 
-        return affiliation_obj_ids
+        return self._split_ids(
+            ids=affiliation_obj_ids,
+            counts=[len(document["Affiliations"]) for document in documents],
+        )
 
     @log_ingestion_of_document(document_name="Author")
     def ingest_article_author_affiliations(
         self,
         article_id,
         author_ids: List[int],
-        documents: List[Dict]
+        documents: List[Dict],
+        author_affiliation_ids: Optional[List[List[int]]] = None,
     ):
+        """Links the authors of an article to it along with their
+        affiliations.
+
+        Args:
+            article_id (int): The ID of the article.
+            author_ids (List[int]): The IDs of the authors.
+            documents (List[Dict]): The `Author` documents.
+            author_affiliation_ids (List[List[int]], optional): The IDs of the
+                already ingested affiliations of every author, e.g., through
+                the `ingest_affiliation_infos` method, in which case they're
+                not ingested per author. Defaults to `None`.
+        """
 
         _author_ids = []
         _affiliation_ids = []
@@ -599,12 +888,14 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             # Get the `AffiliationInfo` document and (if it exists) add the
             # affiliations for this author.
             document_affiliation_info = doc.get("AffiliationInfo")
-            if document_affiliation_info:
+            if not document_affiliation_info:
+                affiliation_ids = [None]
+            elif author_affiliation_ids is not None:
+                affiliation_ids = author_affiliation_ids[ordinance]
+            else:
                 affiliation_ids = self.ingest_author_affiliations(
                     document=document_affiliation_info
                 )
-            else:
-                affiliation_ids = [None]
 
             for _affiliation_id in affiliation_ids:
                 _author_ids.append(author_id)
@@ -612,7 +903,8 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
                 _ordinances.append(ordinance + 1)
                 _affiliation_canonical_ids.append(None)
 
-        self.dal.biodi_article_author_affiliations(
+        self._biodi_links(
+            "biodi_article_author_affiliations",
             article_id=article_id,
             author_ids=_author_ids,
             affiliation_ids=_affiliation_ids,
@@ -646,7 +938,10 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             countries.append(grant_obj.country)
             md5s.append(grant_obj.md5)
 
-        grant_ids = self.dal.biodi_grants(
+        grant_ids = self._biodi_unique(
+            method=self.dal.biodi_grants,
+            keys=md5s,
+            cache=self.caches["Grant"],
             uids=uids,
             acronyms=acronyms,
             agencies=agencies,
@@ -656,11 +951,23 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
 
         return grant_ids
 
-    @log_ingestion_of_document(document_name="PubmedArticle")
-    def ingest(
-        self,
-        document: Dict
-    ):
+    @staticmethod
+    def get_sections(document: Dict) -> Dict:
+        """Retrieves the header of a `PubmedArticle` document and shortcuts
+        into the sections ingested by the `ingest` and `ingest_many` methods.
+
+        Args:
+            document (Dict): The `PubmedArticle` document.
+
+        Returns:
+            Dict: The `header` of the article as expected by the
+                `is_ingestible` method, the `MedlineCitation`, `Journal`, and
+                `Article` documents, and the lists of `AbstractTexts`,
+                `Authors`, `Chemicals`, `PublicationTypes`, `Grants`,
+                `Keywords`, `ArticleIds`, `MeshHeadings`, and `DataBanks`
+                documents (`None` if unavailable).
+        """
+
         # Retrieve shortcuts into the document.
         pubmed_article = document
         medline_citation = pubmed_article["MedlineCitation"]
@@ -717,11 +1024,99 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
         else:
             databank_documents = None
 
-        # Skip documents where the `MedlineCitation` version of the `PMID` is
-        # not `1` to ensure unique records.
-        if medline_citation["PMID"]["Version"] != "1":
+        header = {
+            "PMID": medline_citation["PMID"]["PMID"],
+            "Version": medline_citation["PMID"]["Version"],
+            "Status": medline_citation["Status"],
+            "Owner": medline_citation["Owner"],
+            "DateRevised": medline_citation["DateRevised"]["Date"],
+        }
+
+        return {
+            "header": header,
+            "MedlineCitation": medline_citation,
+            "Journal": journal,
+            "Article": article,
+            "AbstractTexts": abstract_text_documents,
+            "Authors": author_documents,
+            "Chemicals": chemical_documents,
+            "PublicationTypes": publication_type_documents,
+            "Grants": grant_documents,
+            "Keywords": keyword_documents,
+            "ArticleIds": article_id_documents,
+            "MeshHeadings": mesh_heading_documents,
+            "DataBanks": databank_documents,
+        }
+
+    @log_ingestion_of_document(document_name="PubmedArticle")
+    def ingest(
+        self,
+        document: Union[Dict, PubmedArticle]
+    ) -> Optional[int]:
+        """Ingests a `PubmedArticle` document.
+
+        If the unit-of-work mode is enabled the article is ingested within a
+        savepoint and an article failing to be ingested is logged and rolled
+        back on its own.
+
+        Args:
+            document (Union[Dict, PubmedArticle]): The `PubmedArticle`
+                document or record.
+
+        Returns:
+            Optional[int]: The citation ID (`None` if the document wasn't
+                ingested).
+        """
+
+        if self.unit_of_work is None:
+            return self._ingest(document=document)
+
+        # Open the unit of work outside the `try` so that failing to do so
+        # isn't mistaken for a failing article.
+        self.unit_of_work.begin()
+        try:
+            with self.unit_of_work.savepoint():
+                citation_id = self._ingest(document=document)
+        except Exception:
+            # The cached IDs may refer to rows which were rolled back.
+            self.clear_caches()
+            msg = "Ingestion of article failed and was rolled back."
+            self.logger.exception(msg)
+            return None
+
+        if self.unit_of_work.is_full:
+            self.commit()
+
+        return citation_id
+
+    def _ingest(
+        self,
+        document: Union[Dict, PubmedArticle]
+    ) -> Optional[int]:
+        # Convert `PubmedArticle` records into the equivalent documents.
+        if isinstance(document, PubmedArticle):
+            document = to_document(record=document)
+
+        sections = self.get_sections(document=document)
+
+        # Skip documents which shouldn't be ingested.
+        if not self.is_ingestible(header=sections["header"]):
             return None
 
+        # Retrieve shortcuts into the document.
+        medline_citation = sections["MedlineCitation"]
+        journal = sections["Journal"]
+        article = sections["Article"]
+        abstract_text_documents = sections["AbstractTexts"]
+        author_documents = sections["Authors"]
+        chemical_documents = sections["Chemicals"]
+        publication_type_documents = sections["PublicationTypes"]
+        grant_documents = sections["Grants"]
+        keyword_documents = sections["Keywords"]
+        article_id_documents = sections["ArticleIds"]
+        mesh_heading_documents = sections["MeshHeadings"]
+        databank_documents = sections["DataBanks"]
+
         # Ingest the `MedlineJournalInfo` document.
         journal_info_id = self.ingest_journal_info(
             document=medline_citation["MedlineJournalInfo"]
@@ -823,3 +1218,604 @@ class IngesterDocumentPubmedArticle(IngesterDocumentBase):
             )
 
         return citation_id
+
+    def _ingest_in_bulk(
+        self,
+        method: Callable,
+        documents_articles: List[Optional[List[Dict]]],
+        counts: Optional[List[int]] = None,
+    ) -> List[List[int]]:
+        """Ingests the documents of every article in a batch through a single
+        call to an `ingest_*` method and splits the IDs back per article.
+
+        Args:
+            method (Callable): The `ingest_*` method taking a `documents`
+                list and returning the IDs of the ingested records.
+            documents_articles (List[Optional[List[Dict]]]): The documents of
+                every article (`None` if unavailable).
+            counts (List[int], optional): The number of IDs returned per
+                article if the method skips documents. Defaults to the number
+                of documents of every article.
+
+        Returns:
+            List[List[int]]: The IDs of the ingested records of every article.
+        """
+
+        documents = [
+            document
+            for documents_article in documents_articles
+            if documents_article
+            for document in documents_article
+        ]
+
+        if counts is None:
+            counts = [
+                len(documents_article) if documents_article else 0
+                for documents_article in documents_articles
+            ]
+
+        ids = method(documents=documents) if documents else []
+
+        return self._split_ids(ids=ids, counts=counts)
+
+    @log_ingestion_of_documents(document_name="PubmedArticle")
+    def ingest_many(
+        self,
+        documents: List[Union[Dict, PubmedArticle]]
+    ) -> List[Optional[int]]:
+        """Ingests a batch of `PubmedArticle` documents into the same records
+        as ingesting them one by one through the `ingest` method.
+
+        Rather than upserting the entities of every article separately, the
+        `MedlineJournalInfo` and `Journal` documents are ingested once per
+        distinct document in the batch while the abstract texts, authors,
+        affiliations, publication types, keywords, grants, databanks, and
+        accession numbers of all articles are upserted through a single
+        `biodi_*` call per entity type, and the MeSH UIs of all articles
+        unknown to the MeSH lookup are resolved at once. The link rows of all
+        articles, e.g., their keywords or MeSH headings, are inserted through
+        a single set-based statement per link table by the `insert_links`
+        method. Articles and citations are still upserted per article through
+        the `iodi_*` DAL methods.
+
+        If the unit-of-work mode is enabled the batch is ingested within a
+        savepoint and, should it fail, rolled back and ingested again one by
+        one through the `ingest` method so that only the failing articles are
+        skipped.
+
+        Args:
+            documents (List[Union[Dict, PubmedArticle]]): The `PubmedArticle`
+                documents or records.
+
+        Returns:
+            List[Optional[int]]: The citation ID of every document in order
+                (`None` for documents which weren't ingested).
+        """
+
+        if self.unit_of_work is None:
+            return self._ingest_many(documents=documents)
+
+        # Open the unit of work outside the `try` so that failing to do so
+        # isn't mistaken for a failing article.
+        self.unit_of_work.begin()
+        try:
+            with self.unit_of_work.savepoint(num_articles=len(documents)):
+                citation_ids = self._ingest_many(documents=documents)
+        except Exception:
+            # The cached IDs may refer to rows which were rolled back.
+            self.clear_caches()
+            msg = ("Ingestion of batch of {} articles failed and was rolled "
+                   "back. Ingesting the articles one by one.")
+            msg_fmt = msg.format(len(documents))
+            self.logger.warning(msg_fmt)
+            return [self.ingest(document=document) for document in documents]
+
+        if self.unit_of_work.is_full:
+            self.commit()
+
+        return citation_ids
+
+    def _ingest_many(
+        self,
+        documents: List[Union[Dict, PubmedArticle]]
+    ) -> List[Optional[int]]:
+
+        # Defer the link rows of the articles so that they're inserted
+        # together once their parent records are ingested.
+        self.links = collections.defaultdict(list)
+        try:
+            citation_ids = self._ingest_many_deferred(documents=documents)
+            self.insert_links(links=self.links)
+        finally:
+            self.links = None
+
+        return citation_ids
+
+    def _ingest_many_deferred(
+        self,
+        documents: List[Union[Dict, PubmedArticle]]
+    ) -> List[Optional[int]]:
+
+        citation_ids = [None] * len(documents)  # type: List[Optional[int]]
+
+        # Retrieve the sections of the documents which should be ingested.
+        positions = []
+        batch = []
+        for position, document in enumerate(documents):
+            # Convert `PubmedArticle` records into the equivalent documents.
+            if isinstance(document, PubmedArticle):
+                document = to_document(record=document)
+
+            sections = self.get_sections(document=document)
+            if self.is_ingestible(header=sections["header"]):
+                positions.append(position)
+                batch.append(sections)
+
+        if not batch:
+            return citation_ids
+
+        # Ingest the `MedlineJournalInfo`, `Journal`, `Article`, and
+        # `MedlineCitation` documents with journals ingested once per distinct
+        # document.
+        journal_info_ids = {}
+        journal_ids = {}
+        article_ids = []
+        for position, sections in zip(positions, batch):
+            medline_citation = sections["MedlineCitation"]
+
+            document_journal_info = medline_citation["MedlineJournalInfo"]
+            key = (
+                document_journal_info["NlmUniqueID"],
+                document_journal_info["ISSNLinking"],
+                document_journal_info["Country"],
+                document_journal_info["MedlineTA"],
+            )
+            if key not in journal_info_ids:
+                journal_info_ids[key] = self.ingest_journal_info(
+                    document=document_journal_info
+                )
+            journal_info_id = journal_info_ids[key]
+
+            document_journal = sections["Journal"]
+            key = (
+                document_journal["ISSN"]["ISSN"],
+                document_journal["ISSN"]["IssnType"],
+                document_journal["Title"],
+                document_journal["ISOAbbreviation"],
+            )
+            if key not in journal_ids:
+                journal_ids[key] = self.ingest_journal(
+                    document=document_journal
+                )
+            journal_id = journal_ids[key]
+
+            article_id = self.ingest_article(
+                journal_id=journal_id,
+                document=sections["Article"]
+            )
+            article_ids.append(article_id)
+
+            citation_ids[position] = self.ingest_citation(
+                article_id=article_id,
+                journal_info_id=journal_info_id,
+                document=medline_citation
+            )
+
+        # Ingest the `AbstractText` documents skipping empty entries.
+        documents_articles = [sections["AbstractTexts"] for sections in batch]
+        abstract_text_ids = self._ingest_in_bulk(
+            method=self.ingest_abstract_texts,
+            documents_articles=documents_articles,
+            counts=[
+                sum(1 for document in documents_article if document[
+                    "AbstractText"
+                ]) if documents_article else 0
+                for documents_article in documents_articles
+            ],
+        )
+        for article_id, documents_article, ids in zip(
+            article_ids, documents_articles, abstract_text_ids
+        ):
+            if documents_article:
+                self._biodi_links(
+                    "biodi_article_abstract_texts",
+                    article_id=article_id,
+                    abstract_text_ids=ids,
+                    ordinances=list(range(1, len(documents_article) + 1))
+                )
+
+        # Ingest the `Author` documents skipping invalid ones.
+        documents_articles = [sections["Authors"] for sections in batch]
+        author_ids = self._ingest_in_bulk(
+            method=self.ingest_authors,
+            documents_articles=documents_articles,
+            counts=[
+                sum(1 for document in documents_article if document[
+                    "Author"
+                ]["IsValid"]) if documents_article else 0
+                for documents_article in documents_articles
+            ],
+        )
+
+        # Ingest the affiliations of all authors linked to the articles, i.e.,
+        # those paired with an author ID.
+        documents_affiliation_info = []
+        for documents_article, ids in zip(documents_articles, author_ids):
+            if not documents_article:
+                continue
+            for document in documents_article[:len(ids)]:
+                document_affiliation_info = document["Author"]["Author"].get(
+                    "AffiliationInfo"
+                )
+                if document_affiliation_info:
+                    documents_affiliation_info.append(
+                        document_affiliation_info
+                    )
+        if documents_affiliation_info:
+            affiliation_ids = iter(self.ingest_affiliation_infos(
+                documents=documents_affiliation_info
+            ))
+        else:
+            affiliation_ids = iter([])
+
+        for article_id, documents_article, ids in zip(
+            article_ids, documents_articles, author_ids
+        ):
+            if not documents_article:
+                continue
+
+            author_affiliation_ids = []
+            for document in documents_article[:len(ids)]:
+                if document["Author"]["Author"].get("AffiliationInfo"):
+                    author_affiliation_ids.append(next(affiliation_ids))
+                else:
+                    author_affiliation_ids.append([])
+
+            self.ingest_article_author_affiliations(
+                article_id=article_id,
+                author_ids=ids,
+                documents=documents_article,
+                author_affiliation_ids=author_affiliation_ids,
+            )
+
+        # Ingest the `PublicationType` documents.
+        documents_articles = [
+            sections["PublicationTypes"] for sections in batch
+        ]
+        publication_type_ids = self._ingest_in_bulk(
+            method=self.ingest_publication_types,
+            documents_articles=documents_articles,
+        )
+        for article_id, documents_article, ids in zip(
+            article_ids, documents_articles, publication_type_ids
+        ):
+            if documents_article:
+                self._biodi_links(
+                    "biodi_article_publication_types",
+                    article_id=article_id,
+                    publication_type_ids=ids,
+                )
+
+        # Ingest the `Keyword` documents.
+        documents_articles = [sections["Keywords"] for sections in batch]
+        keyword_ids = self._ingest_in_bulk(
+            method=self.ingest_keywords,
+            documents_articles=documents_articles,
+        )
+        for position, documents_article, ids in zip(
+            positions, documents_articles, keyword_ids
+        ):
+            if documents_article:
+                self._biodi_links(
+                    "biodi_citation_keywords",
+                    citation_id=citation_ids[position],
+                    keyword_ids=ids
+                )
+
+        # Ingest the `Grant` documents.
+        documents_articles = [sections["Grants"] for sections in batch]
+        grant_ids = self._ingest_in_bulk(
+            method=self.ingest_grants,
+            documents_articles=documents_articles,
+        )
+        for article_id, documents_article, ids in zip(
+            article_ids, documents_articles, grant_ids
+        ):
+            if documents_article:
+                self._biodi_links(
+                    "biodi_article_grants",
+                    article_id=article_id,
+                    grant_ids=ids
+                )
+
+        # Ingest the `DataBank` documents and their accession numbers.
+        documents_articles = [sections["DataBanks"] for sections in batch]
+        databank_ids = self._ingest_in_bulk(
+            method=self.ingest_databank_names,
+            documents_articles=documents_articles,
+        )
+        documents_databanks = [
+            document["DataBank"]["AccessionNumberList"]["AccessionNumbers"]
+            for documents_article in documents_articles
+            if documents_article
+            for document in documents_article
+        ]
+        accession_number_ids = iter(self._ingest_in_bulk(
+            method=self.ingest_accession_numbers,
+            documents_articles=documents_databanks,
+        ))
+        for article_id, documents_article, ids in zip(
+            article_ids, documents_articles, databank_ids
+        ):
+            if not documents_article:
+                continue
+            for databank_id in ids:
+                self._biodi_links(
+                    "biodi_article_databank_accession_numbers",
+                    article_id=article_id,
+                    databank_id=databank_id,
+                    accession_number_ids=next(accession_number_ids)
+                )
+
+        # Resolve the MeSH UIs of all articles unknown to the lookup with a
+        # single query per table.
+        uis_descriptors = []
+        uis_qualifiers = []
+        for sections in batch:
+            for document in sections["Chemicals"] or []:
+                uis_descriptors.append(
+                    document["Chemical"]["NameOfSubstance"]["UI"]
+                )
+            for document in sections["MeshHeadings"] or []:
+                data = document["MeshHeading"]
+                if data.get("DescriptorName"):
+                    uis_descriptors.append(data["DescriptorName"]["UI"])
+                for document_qualifier in data["QualifierNames"]:
+                    uis_qualifiers.append(
+                        document_qualifier["QualifierName"]["UI"]
+                    )
+        self.lookup_mesh.get_descriptor_ids(dal=self.dal, uis=uis_descriptors)
+        self.lookup_mesh.get_qualifier_ids(dal=self.dal, uis=uis_qualifiers)
+
+        # Ingest the documents only linked to the citations.
+        for position, sections in zip(positions, batch):
+            citation_id = citation_ids[position]
+
+            if sections["Chemicals"]:
+                chemical_ids = self.retrieve_chemicals(
+                    documents=sections["Chemicals"]
+                )
+
+                if chemical_ids:
+                    self._biodi_links(
+                        "biodi_citation_chemicals",
+                        citation_id=citation_id,
+                        chemical_ids=chemical_ids
+                    )
+
+            if sections["ArticleIds"]:
+                self.ingest_article_ids(
+                    citation_id=citation_id,
+                    documents=sections["ArticleIds"]
+                )
+
+            if sections["MeshHeadings"]:
+                self.ingest_mesh_headings(
+                    citation_id=citation_id,
+                    documents=sections["MeshHeadings"]
+                )
+
+        return citation_ids
+
+    def insert_links(
+        self,
+        links: Dict[str, List[Dict]],
+        chunk_size: int = 10000,
+    ):
+        """Upserts the link rows of many parent records, e.g., the authors of
+        a batch of articles, through one multi-row
+        `INSERT ... ON CONFLICT DO UPDATE` statement per link table and chunk
+        of rows rather than one `biodi_*` DAL call per parent record. Rows
+        are upserted on the unique key of their table updating the other
+        columns, e.g., the `ordinance` of an author of a revised article, as
+        the DAL does.
+
+        Args:
+            links (Dict[str, List[Dict]]): The arguments of the `biodi_*` DAL
+                calls keyed by DAL method name as defined under the
+                `link_tables` attribute of the `tables` module.
+            chunk_size (int, optional): The maximum number of rows inserted
+                per statement. Defaults to 10000.
+        """
+
+        with self.dal.session_scope() as session:
+            for name, calls in links.items():
+                spec = link_tables[name]
+                table = spec.orm_class.__table__  # type: sqlalchemy.Table
+
+                columns_key = get_link_key(table=table)
+
+                rows = dedupe_link_rows(
+                    rows=[
+                        row
+                        for kwargs in calls
+                        for row in to_rows(spec, **kwargs)
+                    ],
+                    columns_key=columns_key,
+                )
+                for chunk in chunk_generator(iter(rows), chunk_size):
+                    chunk = list(chunk)
+                    statement = sqlalchemy.dialects.postgresql.insert(
+                        table
+                    ).values(chunk)
+                    updates = {
+                        column: statement.excluded[column]
+                        for column in chunk[0]
+                        if column not in columns_key
+                    }
+                    if updates:
+                        statement = statement.on_conflict_do_update(
+                            index_elements=columns_key,
+                            set_=updates,
+                        )
+                    else:
+                        statement = statement.on_conflict_do_nothing()
+                    session.execute(statement)
+
+                msg = "Upserted {} rows into table '{}'"
+                msg_fmt = msg.format(len(rows), table.name)
+                self.logger.debug(msg_fmt)
+
+    def clear_caches(self):
+        """Clears the caches of upserted entity IDs, e.g., after the rows
+        they refer to were rolled back."""
+
+        for cache in self.caches.values():
+            cache.clear()
+
+    def commit(self):
+        """Commits the articles ingested in the open unit of work, if any."""
+
+        if self.unit_of_work is None:
+            return
+
+        try:
+            self.unit_of_work.commit()
+        except Exception:
+            self.clear_caches()
+            raise
+
+    def rollback(self):
+        """Rolls back the articles ingested in the open unit of work, if
+        any."""
+
+        if self.unit_of_work is None:
+            return
+
+        self.clear_caches()
+        self.unit_of_work.rollback()
+
+    def log_cache_stats(self):
+        """Logs the size and hit ratio of the caches of upserted entity IDs."""
+
+        msg = "Identity cache stats: {}"
+        msg_fmt = msg.format(", ".join(
+            "{} {}".format(name, cache.summary())
+            for name, cache in self.caches.items()
+        ))
+        self.logger.info(msg_fmt)
+
+    @staticmethod
+    def get_link_columns(
+        table: sqlalchemy.Table,
+    ) -> List[Tuple[sqlalchemy.Table, sqlalchemy.Column]]:
+        """Finds the tables, and their foreign-key columns, referencing a
+        table within its schema, e.g., the `citation_keywords` table
+        referencing the `citations` table.
+
+        Args:
+            table (sqlalchemy.Table): The referenced table.
+
+        Returns:
+            List[Tuple[sqlalchemy.Table, sqlalchemy.Column]]: The referencing
+                tables and their foreign-key columns.
+        """
+
+        link_columns = []
+        for table_link in table.metadata.sorted_tables:
+            if table_link is table or table_link.schema != table.schema:
+                continue
+            for foreign_key in table_link.foreign_keys:
+                if foreign_key.column.table is table:
+                    link_columns.append((table_link, foreign_key.parent))
+
+        return link_columns
+
+    def delete_citations(
+        self,
+        pmids: Iterable[Union[int, str]],
+        batch_size: int = 1000,
+    ) -> int:
+        """Deletes the citations of the given PMIDs, e.g., those under the
+        `<DeleteCitation>` elements of update files, along with their link
+        rows (MeSH headings, keywords, chemicals, identifiers, etc) as well as
+        their articles and the link rows thereof (authors, grants, abstract
+        texts, etc) unless the articles are referenced by other citations.
+
+        Rows are deleted with one set-based `DELETE` statement per table and
+        batch of PMIDs with every batch deleted in its own transaction.
+        Shared entities, e.g., authors or keywords, are left in place.
+
+        Args:
+            pmids (Iterable[Union[int, str]]): The PMIDs of the citations to
+                delete. Unknown PMIDs are ignored.
+            batch_size (int, optional): The number of PMIDs deleted per
+                transaction. Defaults to 1000.
+
+        Returns:
+            int: The number of deleted citations.
+        """
+
+        table_citation = Citation.__table__  # type: sqlalchemy.Table
+        table_article = Article.__table__  # type: sqlalchemy.Table
+        link_columns_citation = self.get_link_columns(table=table_citation)
+        link_columns_article = [
+            (table, column)
+            for table, column in self.get_link_columns(table=table_article)
+            if table is not table_citation
+        ]
+
+        pmids = sorted(set(int(pmid) for pmid in pmids))
+
+        num_deleted = 0
+        for pmids_chunk in chunk_generator(iter(pmids), batch_size):
+            with self.dal.session_scope() as session:
+                query = sqlalchemy.select([
+                    table_citation.c.citation_id,
+                    table_citation.c.article_id,
+                ]).where(table_citation.c.pmid.in_(list(pmids_chunk)))
+                rows = session.execute(query).fetchall()
+                if not rows:
+                    continue
+
+                citation_ids = [row[0] for row in rows]
+                article_ids = set(row[1] for row in rows if row[1] is not None)
+
+                for table, column in link_columns_citation:
+                    session.execute(
+                        table.delete().where(column.in_(citation_ids))
+                    )
+                session.execute(
+                    table_citation.delete().where(
+                        table_citation.c.citation_id.in_(citation_ids)
+                    )
+                )
+
+                # Keep articles still referenced by other citations.
+                if article_ids:
+                    query = sqlalchemy.select([
+                        table_citation.c.article_id,
+                    ]).where(table_citation.c.article_id.in_(article_ids))
+                    article_ids -= set(
+                        row[0] for row in session.execute(query)
+                    )
+
+                if article_ids:
+                    article_ids = sorted(article_ids)
+                    for table, column in link_columns_article:
+                        session.execute(
+                            table.delete().where(column.in_(article_ids))
+                        )
+                    session.execute(
+                        table_article.delete().where(
+                            table_article.c.article_id.in_(article_ids)
+                        )
+                    )
+
+            num_deleted += len(citation_ids)
+
+        msg = "Deleted {} citations out of {} PMIDs"
+        msg_fmt = msg.format(num_deleted, len(pmids))
+        self.logger.info(msg_fmt)
+
+        return num_deleted
@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+
+""" PostgreSQL `COPY` bulk-loading of Pubmed articles.
+
+This module contains the `LoaderCopyPubmedArticle` class, a drop-in
+replacement of the `IngesterDocumentPubmedArticle` class for full baseline
+loads, which ingests batches of articles through `COPY FROM STDIN` and
+set-based statements rather than upserting rows through the DAL.
+
+Batches are ingested through the unchanged `ingest_many` method against a
+`StagerCopy` object standing in for the DAL. Rather than upserting rows, the
+`iodi_*` and `biodi_*` methods of the stager record them and return the key
+each row is merged on, e.g., its MD5, in place of its ID. The recorded rows
+are then flushed in a single transaction table by table, referenced tables
+first:
+- The rows are streamed into a temporary staging table through the
+    `copy_expert` method of `psycopg2` over an in-memory buffer.
+- The staging table is merged into the `fform` table with an
+    `INSERT ... ON CONFLICT DO UPDATE` statement on the key of entity tables,
+    e.g., `authors`, or on the unique constraint of link tables, e.g.,
+    `article_author_affiliations`.
+- The IDs of the merged entity rows are retrieved by key and substituted for
+    the keys held by the rows of the tables referencing them.
+
+Rows are merged in order of their key so that concurrent loads lock shared
+rows in the same order, and a load failing on a deadlock or a serialization
+failure regardless is retried.
+
+The staged tables are defined under the `entity_tables` and `link_tables`
+attributes of the `tables` module. Journal infos and journals are still
+upserted through the DAL as they're few and the MD5 of articles is computed
+over the ID of their journal.
+"""
+
+import io
+import collections
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+import sqlalchemy
+from fform.dals_pubmed import DalPubmed
+
+from pubmed_ingester.ingesters import IngesterDocumentPubmedArticle
+from pubmed_ingester.tables import SpecTable
+from pubmed_ingester.tables import dedupe_link_rows
+from pubmed_ingester.tables import entity_tables
+from pubmed_ingester.tables import get_link_key
+from pubmed_ingester.tables import link_tables
+from pubmed_ingester.tables import to_rows
+
+
+class StagerCopy(object):
+    def __init__(self, dal: DalPubmed):
+        """Constructor and initialization.
+
+        Args:
+            dal (DalPubmed): The DAL any methods other than the staged
+                `iodi_*` and `biodi_*` methods, e.g., `session_scope`, are
+                delegated to.
+        """
+
+        self.dal = dal
+
+        # The entity rows by key, with later rows replacing earlier ones as
+        # with successive upserts, and the link rows per table name.
+        self.entities = {
+            spec.name: collections.OrderedDict()
+            for spec in entity_tables.values()
+        }  # type: Dict[str, Dict[Hashable, Dict[str, Any]]]
+        self.links = {
+            spec.name: [] for spec in link_tables.values()
+        }  # type: Dict[str, List[Dict[str, Any]]]
+
+    def __getattr__(self, name: str):
+
+        # Avoid recursing before the DAL is set, e.g., when unpickling.
+        if name == "dal":
+            raise AttributeError(name)
+
+        if name in entity_tables:
+            spec = entity_tables[name]
+
+            def stage(**kwargs):
+                return self.stage_entities(spec=spec, **kwargs)
+
+            return stage
+        elif name in link_tables:
+            spec = link_tables[name]
+
+            def stage(**kwargs):
+                return self.stage_links(spec=spec, **kwargs)
+
+            return stage
+
+        return getattr(self.dal, name)
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.entities.values())
+
+    def clear(self):
+        """Removes all staged rows."""
+
+        for rows in self.entities.values():
+            rows.clear()
+        for rows in self.links.values():
+            rows.clear()
+
+    def stage_entities(self, spec: SpecTable, **kwargs):
+        """Stages the entity rows of an `iodi_*` or `biodi_*` method call.
+
+        Returns:
+            The key of the row for `iodi_*` methods or the keys of the rows
+                for `biodi_*` methods.
+        """
+
+        rows = to_rows(spec, **kwargs)
+
+        staged = self.entities[spec.name]
+        keys = []
+        for row in rows:
+            key = row[spec.key]
+            staged[key] = row
+            keys.append(key)
+
+        if any(isinstance(value, list) for value in kwargs.values()):
+            return keys
+
+        return keys[0]
+
+    def stage_links(self, spec: SpecTable, **kwargs):
+        """Stages the link rows of a `biodi_*` method call."""
+
+        self.links[spec.name].extend(to_rows(spec, **kwargs))
+
+
+class LoaderCopyPubmedArticle(IngesterDocumentPubmedArticle):
+
+    # The PostgreSQL error codes of deadlocks and serialization failures,
+    # under which a batch is reloaded.
+    pgcodes_retry = ("40P01", "40001")
+
+    def __init__(
+        self,
+        dal: DalPubmed,
+        batch_size: int = 10000,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            dal (DalPubmed): The DAL whose engine the batches are loaded
+                through. It must be a PostgreSQL engine using `psycopg2`.
+            batch_size (int, optional): The number of articles callers should
+                ingest together through the `ingest_many` method. Defaults to
+                10000.
+            max_attempts (int, optional): The number of times a batch is
+                loaded before a deadlock or a serialization failure with a
+                concurrent load is raised. Defaults to 3.
+            retry_delay (float, optional): The number of seconds to wait
+                before reloading a batch, multiplied by the number of failed
+                attempts. Defaults to 1.0.
+        """
+
+        super(LoaderCopyPubmedArticle, self).__init__(
+            dal=dal,
+            batch_size=batch_size,
+            **kwargs
+        )
+
+        self.dal_pubmed = dal
+        self.dal = StagerCopy(dal=dal)
+        # Every batch is loaded in its own transaction.
+        self.unit_of_work = None
+
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        """Formats a value processed by the bind processor of its column
+        under the text format of `COPY`."""
+
+        if value is None:
+            return "\\N"
+        elif isinstance(value, bool):
+            return "t" if value else "f"
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = "\\x" + bytes(value).hex()
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        else:
+            value = str(value)
+
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def _copy_rows(
+        self,
+        cursor,
+        table: sqlalchemy.Table,
+        table_staging: str,
+        columns: List[str],
+        rows: List[Dict[str, Any]],
+    ):
+        """Creates a temporary staging table with the columns of a table and
+        streams the rows into it through `COPY FROM STDIN`."""
+
+        dialect = self.dal_pubmed.engine.dialect
+        preparer = dialect.identifier_preparer
+        columns_quoted = ", ".join(preparer.quote(column) for column in columns)
+
+        sql = "CREATE TEMPORARY TABLE {} ON COMMIT DROP AS SELECT {} FROM {} "
+        sql += "WITH NO DATA"
+        cursor.execute(sql.format(
+            table_staging,
+            columns_quoted,
+            preparer.format_table(table),
+        ))
+
+        processors = [
+            table.c[column].type.bind_processor(dialect) for column in columns
+        ]
+
+        buffer = io.StringIO()
+        for row in rows:
+            values = []
+            for column, processor in zip(columns, processors):
+                value = row.get(column)
+                # Binary values are formatted as is rather than wrapped by
+                # the DBAPI.
+                if processor is not None and not isinstance(
+                    value, (type(None), bytes)
+                ):
+                    value = processor(value)
+                values.append(self._format_value(value))
+            buffer.write("\t".join(values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            "COPY {} ({}) FROM STDIN".format(table_staging, columns_quoted),
+            buffer,
+        )
+
+    @staticmethod
+    def _to_key(value: Any) -> Hashable:
+        """Converts a fetched key into the type it was staged as, i.e.,
+        `bytes` rather than `memoryview` for binary keys."""
+
+        if isinstance(value, memoryview):
+            return value.tobytes()
+
+        return value
+
+    @staticmethod
+    def _resolve_references(
+        spec: SpecTable,
+        rows: List[Dict[str, Any]],
+        ids: Dict[str, Dict[Hashable, int]],
+    ):
+        """Substitutes the IDs of the merged entity rows for the keys held by
+        the reference columns of rows. Values that aren't keys of rows merged
+        in this flush, e.g., IDs out of the identity caches, are kept."""
+
+        for column, name in spec.references.items():
+            ids_referenced = ids[name]
+            for row in rows:
+                value = row.get(column)
+                if value is not None:
+                    row[column] = ids_referenced.get(value, value)
+
+    @staticmethod
+    def _get_cache_key(spec: SpecTable, row: Dict[str, Any]) -> Hashable:
+        """Returns the key the ID of a staged entity row is cached under by
+        the `IngesterDocumentPubmedArticle` class, i.e., the key it's merged
+        on or, for publication types, their UID along with their name."""
+
+        if spec.name == "PublicationType":
+            return row["uid"], row["publication_type"]
+
+        return row[spec.key]
+
+    def _merge_rows(
+        self,
+        cursor,
+        rows_entities: Dict[str, List[Dict[str, Any]]],
+        rows_links: Dict[str, List[Dict[str, Any]]],
+    ) -> Dict[str, Dict[Hashable, int]]:
+        """Copies and merges the staged rows table by table through a cursor
+        without committing them.
+
+        Rows are merged in order of their key so that concurrent flushes
+        lock shared rows, e.g., authors, in the same order.
+
+        Returns:
+            Dict[str, Dict[Hashable, int]]: The IDs of the merged entity rows
+                by key per table name.
+        """
+
+        dialect = self.dal_pubmed.engine.dialect
+        preparer = dialect.identifier_preparer
+
+        ids = {}  # type: Dict[str, Dict[Hashable, int]]
+
+        for spec in entity_tables.values():
+            rows = rows_entities[spec.name]
+            ids[spec.name] = {}
+            if not rows:
+                continue
+
+            self._resolve_references(spec=spec, rows=rows, ids=ids)
+
+            table = spec.orm_class.__table__  # type: sqlalchemy.Table
+            table_staging = "staging_{}".format(table.name)
+            columns = list(rows[0].keys())
+            self._copy_rows(
+                cursor=cursor,
+                table=table,
+                table_staging=table_staging,
+                columns=columns,
+                rows=rows,
+            )
+
+            # Merge the staging table updating existing rows as the `iodi_*`
+            # and `biodi_*` methods do.
+            column_key = preparer.quote(spec.key)
+            columns_quoted = [preparer.quote(column) for column in columns]
+            sql = ("INSERT INTO {table} ({columns}) "
+                   "SELECT {columns} FROM {table_staging} ORDER BY {key} "
+                   "ON CONFLICT ({key}) DO UPDATE SET {updates}")
+            cursor.execute(sql.format(
+                table=preparer.format_table(table),
+                columns=", ".join(columns_quoted),
+                table_staging=table_staging,
+                key=column_key,
+                updates=", ".join(
+                    "{0} = EXCLUDED.{0}".format(column)
+                    for column in columns_quoted
+                    if column != column_key
+                ),
+            ))
+
+            column_pk = list(table.primary_key.columns)[0]
+            sql = ("SELECT t.{key}, t.{pk} FROM {table} AS t "
+                   "JOIN {table_staging} AS s ON t.{key} = s.{key}")
+            cursor.execute(sql.format(
+                key=column_key,
+                pk=preparer.quote(column_pk.name),
+                table=preparer.format_table(table),
+                table_staging=table_staging,
+            ))
+            ids[spec.name] = {
+                self._to_key(key): _id for key, _id in cursor.fetchall()
+            }
+
+        for spec in link_tables.values():
+            rows = rows_links[spec.name]
+            if not rows:
+                continue
+
+            self._resolve_references(spec=spec, rows=rows, ids=ids)
+
+            table = spec.orm_class.__table__  # type: sqlalchemy.Table
+            # Keep the last of the rows sharing a key as a single
+            # `ON CONFLICT DO UPDATE` statement can't affect a row twice.
+            columns_key = get_link_key(table=table)
+            rows = dedupe_link_rows(rows=rows, columns_key=columns_key)
+            table_staging = "staging_{}".format(table.name)
+            columns = list(rows[0].keys())
+            self._copy_rows(
+                cursor=cursor,
+                table=table,
+                table_staging=table_staging,
+                columns=columns,
+                rows=rows,
+            )
+
+            # Merge the staging table updating the other columns of existing
+            # rows, e.g., the `ordinance` of reordered authors, as the
+            # `biodi_*` methods do.
+            columns_key_quoted = ", ".join(
+                preparer.quote(column) for column in columns_key
+            )
+            updates = [
+                "{0} = EXCLUDED.{0}".format(preparer.quote(column))
+                for column in columns
+                if column not in columns_key
+            ]
+            if updates:
+                conflict = "ON CONFLICT ({}) DO UPDATE SET {}".format(
+                    columns_key_quoted,
+                    ", ".join(updates),
+                )
+            else:
+                conflict = "ON CONFLICT DO NOTHING"
+            sql = ("INSERT INTO {table} ({columns}) "
+                   "SELECT DISTINCT {columns} FROM {table_staging} "
+                   "ORDER BY {key} {conflict}")
+            cursor.execute(sql.format(
+                table=preparer.format_table(table),
+                columns=", ".join(
+                    preparer.quote(column) for column in columns
+                ),
+                table_staging=table_staging,
+                key=columns_key_quoted,
+                conflict=conflict,
+            ))
+
+        return ids
+
+    def flush(self) -> Dict[Hashable, int]:
+        """Loads all staged rows in a single transaction, which is retried
+        up to `max_attempts` times when it fails on a deadlock or a
+        serialization failure with a concurrent flush.
+
+        Returns:
+            Dict[Hashable, int]: The citation IDs by PMID.
+        """
+
+        num_rows = len(self.dal) + sum(
+            len(rows) for rows in self.dal.links.values()
+        )
+
+        connection = self.dal_pubmed.engine.raw_connection()
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                # Copy the staged rows as their references are resolved in
+                # place.
+                rows_entities = {
+                    name: [dict(row) for row in rows.values()]
+                    for name, rows in self.dal.entities.items()
+                }
+                rows_links = {
+                    name: [dict(row) for row in rows]
+                    for name, rows in self.dal.links.items()
+                }
+                try:
+                    ids = self._merge_rows(
+                        cursor=connection.cursor(),
+                        rows_entities=rows_entities,
+                        rows_links=rows_links,
+                    )
+                    connection.commit()
+                    break
+                except Exception as exc:
+                    connection.rollback()
+                    pgcode = getattr(exc, "pgcode", None)
+                    if (
+                        pgcode not in self.pgcodes_retry or
+                        attempt == self.max_attempts
+                    ):
+                        raise
+
+                    msg = "Retrying flush after attempt {} failed with {}: {}"
+                    msg_fmt = msg.format(attempt, pgcode, exc)
+                    self.logger.warning(msg_fmt)
+                    time.sleep(self.retry_delay * attempt)
+        except Exception:
+            # The identity caches hold the keys staged in place of IDs.
+            for cache in self.caches.values():
+                cache.clear()
+            raise
+        finally:
+            connection.close()
+            self.dal.clear()
+
+        # Replace the keys the identity caches were filled with while staging
+        # with the IDs of the merged entities.
+        for spec in entity_tables.values():
+            if spec.name not in self.caches:
+                continue
+            for row in rows_entities.get(spec.name, []):
+                self.caches[spec.name].put(
+                    self._get_cache_key(spec=spec, row=row),
+                    ids[spec.name][self._to_key(row[spec.key])],
+                )
+
+        msg = "Loaded {} staged rows"
+        msg_fmt = msg.format(num_rows)
+        self.logger.debug(msg_fmt)
+
+        return ids["Citation"]
+
+    def insert_links(self, links: Dict[str, List[Dict]], **kwargs):
+        """Stages the link rows deferred by the `ingest_many` method, which
+        still hold the keys of their parent rows, so that they're loaded
+        along with them by the `flush` method."""
+
+        for name, calls in links.items():
+            for call in calls:
+                self.dal.stage_links(spec=link_tables[name], **call)
+
+    def ingest(self, document: Dict) -> Optional[int]:
+
+        return self.ingest_many(documents=[document])[0]
+
+    def ingest_many(self, documents: List[Dict]) -> List[Optional[int]]:
+        """Stages a batch of `PubmedArticle` documents through the
+        `IngesterDocumentPubmedArticle.ingest_many` method and loads them.
+
+        Args:
+            documents (List[Dict]): The `PubmedArticle` documents or records.
+
+        Returns:
+            List[Optional[int]]: The citation ID of every document in order
+                (`None` for documents which weren't ingested).
+        """
+
+        pmids = super(LoaderCopyPubmedArticle, self).ingest_many(
+            documents=documents
+        )
+        citation_ids = self.flush()
+
+        return [
+            citation_ids.get(pmid) if pmid is not None else None
+            for pmid in pmids
+        ]
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+""" In-memory lookups of MeSH records.
+
+This module contains the `LookupMesh` class which maps the UIs of the MeSH
+descriptors and qualifiers in the `mesh` schema to their IDs so that the MeSH
+headings and chemicals of articles are resolved without a `SELECT` per UI.
+
+The maps are plain `dict` objects loaded once per process, e.g., in the parent
+process before any worker processes are forked so that they're shared
+copy-on-write, or lazily on the first lookup of a single process.
+UIs missing from the maps, e.g., records added after loading, are resolved
+with a single batched query per lookup and remembered until the maps are
+refreshed. UIs found missing from the database are remembered until the maps
+are refreshed or, if a `missing_ttl` is defined, for that many seconds so that
+records added while a long run ingests are eventually resolved.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import sqlalchemy
+from fform.dals_pubmed import DalPubmed
+from fform.orm_mt import Descriptor
+from fform.orm_mt import Qualifier
+
+from pubmed_ingester.loggers import create_logger
+
+
+class LookupMesh(object):
+    def __init__(
+        self,
+        do_load_lazily: bool = False,
+        missing_ttl: Optional[float] = None,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            do_load_lazily (bool, optional): Whether to load the lookup
+                through the `load_mesh` method on the first lookup of any UIs,
+                i.e., only once articles with MeSH headings or chemicals are
+                ingested. Defaults to `False` in which case UIs are resolved
+                one batch at a time unless the lookup is loaded explicitly.
+            missing_ttl (float, optional): The number of seconds after which
+                the UIs found missing from the database are forgotten and
+                looked up again. Defaults to `None` in which case they're
+                remembered until the lookup is reloaded.
+        """
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        self.descriptors = {}  # type: Dict[str, int]
+        self.qualifiers = {}  # type: Dict[str, int]
+        # UIs found missing from the database since the last load or expiry.
+        self.descriptors_missing = set()  # type: Set[str]
+        self.qualifiers_missing = set()  # type: Set[str]
+        self.missing_ttl = missing_ttl
+        self.time_missing_cleared = time.monotonic()
+
+        self.do_load_lazily = do_load_lazily
+        self.is_loaded = False
+
+    def __len__(self):
+        return len(self.descriptors) + len(self.qualifiers)
+
+    def load(
+        self,
+        descriptors: Iterable[Tuple[str, int]],
+        qualifiers: Iterable[Tuple[str, int]],
+    ):
+        """Loads the lookup from `(ui, id)` rows replacing any previous
+        contents.
+
+        Args:
+            descriptors (Iterable[Tuple[str, int]]): The UIs and IDs of the
+                descriptors.
+            qualifiers (Iterable[Tuple[str, int]]): The UIs and IDs of the
+                qualifiers.
+        """
+
+        self.descriptors = dict(descriptors)
+        self.qualifiers = dict(qualifiers)
+        self.clear_missing()
+        self.is_loaded = True
+
+        msg = "Loaded the IDs of {} descriptors and {} qualifiers"
+        msg_fmt = msg.format(len(self.descriptors), len(self.qualifiers))
+        self.logger.info(msg_fmt)
+
+    def load_mesh(self, dal: DalPubmed, batch_size: int = 100000):
+        """Loads the lookup from the `descriptors` and `qualifiers` tables
+        streaming the UIs and IDs in batches without creating any ORM objects.
+
+        Args:
+            dal (DalPubmed): The DAL used to query the MeSH tables.
+            batch_size (int, optional): The number of rows fetched at a time.
+                Defaults to 100000.
+        """
+
+        table_descriptor = Descriptor.__table__  # type: sqlalchemy.Table
+        table_qualifier = Qualifier.__table__  # type: sqlalchemy.Table
+
+        def generate_rows(query):
+            with dal.session_scope() as session:
+                result = session.execute(
+                    query.execution_options(stream_results=True)
+                )
+                while True:
+                    rows = result.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+
+        self.load(
+            descriptors=generate_rows(sqlalchemy.select([
+                table_descriptor.c.ui,
+                table_descriptor.c.descriptor_id,
+            ])),
+            qualifiers=generate_rows(sqlalchemy.select([
+                table_qualifier.c.ui,
+                table_qualifier.c.qualifier_id,
+            ])),
+        )
+
+    def refresh(self, dal: DalPubmed):
+        """Reloads the lookup, e.g., after the MeSH tables were updated,
+        forgetting any UIs previously found missing.
+
+        Args:
+            dal (DalPubmed): The DAL used to query the MeSH tables.
+        """
+
+        self.load_mesh(dal=dal)
+
+    def clear_missing(self):
+        """Forgets the UIs found missing from the database so that they're
+        looked up again, e.g., after MeSH records were added."""
+
+        self.descriptors_missing = set()
+        self.qualifiers_missing = set()
+        self.time_missing_cleared = time.monotonic()
+
+    def _expire_missing(self):
+        """Forgets the UIs found missing from the database once they've been
+        remembered for longer than `missing_ttl` seconds."""
+
+        if self.missing_ttl is None:
+            return
+
+        if time.monotonic() - self.time_missing_cleared >= self.missing_ttl:
+            msg = "Forgetting {} descriptors and {} qualifiers found missing"
+            msg_fmt = msg.format(
+                len(self.descriptors_missing),
+                len(self.qualifiers_missing),
+            )
+            self.logger.debug(msg_fmt)
+
+            self.clear_missing()
+
+    def _load_lazily(self, dal: DalPubmed, uis: List[str]):
+        """Loads the lookup through the `load_mesh` method if it's loaded
+        lazily, hasn't been loaded yet, and any UIs are looked up."""
+
+        if self.do_load_lazily and not self.is_loaded and uis:
+            self.load_mesh(dal=dal)
+
+    @staticmethod
+    def _get_ids(
+        dal: DalPubmed,
+        uis: List[str],
+        ids: Dict[str, int],
+        uis_missing: Set[str],
+        column_ui: sqlalchemy.Column,
+        column_id: sqlalchemy.Column,
+    ) -> List[Optional[int]]:
+        """Looks up the IDs of the given UIs resolving those unknown to the
+        lookup with a single query."""
+
+        uis_unknown = set(
+            ui for ui in uis if ui not in ids and ui not in uis_missing
+        )
+        if uis_unknown:
+            query = sqlalchemy.select([
+                column_ui,
+                column_id,
+            ]).where(column_ui.in_(sorted(uis_unknown)))
+            with dal.session_scope() as session:
+                for ui, _id in session.execute(query):
+                    ids[ui] = _id
+                    uis_unknown.discard(ui)
+            uis_missing.update(uis_unknown)
+
+        return [ids.get(ui) for ui in uis]
+
+    def get_descriptor_ids(
+        self,
+        dal: DalPubmed,
+        uis: List[str],
+    ) -> List[Optional[int]]:
+        """Looks up the IDs of the descriptors of the given UIs.
+
+        Args:
+            dal (DalPubmed): The DAL used to resolve UIs unknown to the
+                lookup.
+            uis (List[str]): The UIs of the descriptors.
+
+        Returns:
+            List[Optional[int]]: The ID of every descriptor in order (`None`
+                for descriptors that don't exist).
+        """
+
+        self._load_lazily(dal=dal, uis=uis)
+        self._expire_missing()
+
+        table_descriptor = Descriptor.__table__  # type: sqlalchemy.Table
+
+        return self._get_ids(
+            dal=dal,
+            uis=uis,
+            ids=self.descriptors,
+            uis_missing=self.descriptors_missing,
+            column_ui=table_descriptor.c.ui,
+            column_id=table_descriptor.c.descriptor_id,
+        )
+
+    def get_qualifier_ids(
+        self,
+        dal: DalPubmed,
+        uis: List[str],
+    ) -> List[Optional[int]]:
+        """Looks up the IDs of the qualifiers of the given UIs.
+
+        Args:
+            dal (DalPubmed): The DAL used to resolve UIs unknown to the
+                lookup.
+            uis (List[str]): The UIs of the qualifiers.
+
+        Returns:
+            List[Optional[int]]: The ID of every qualifier in order (`None`
+                for qualifiers that don't exist).
+        """
+
+        self._load_lazily(dal=dal, uis=uis)
+        self._expire_missing()
+
+        table_qualifier = Qualifier.__table__  # type: sqlalchemy.Table
+
+        return self._get_ids(
+            dal=dal,
+            uis=uis,
+            ids=self.qualifiers,
+            uis_missing=self.qualifiers_missing,
+            column_ui=table_qualifier.c.ui,
+            column_id=table_qualifier.c.qualifier_id,
+        )
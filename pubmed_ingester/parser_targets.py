@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+""" Parser-target engine for Pubmed XML files.
+
+This module contains an alternative engine to the `etree.iterparse` based
+`ParserXmlPubmedArticle.parse` method which drives an `lxml` parser target off
+the start, end, and data events of the XML tokenizer.
+
+Instead of full `lxml` element trees the target builds `ElementLite` objects
+which only support the subset of the element API the parse methods use, i.e.,
+`tag`, `text`, `get`, `find`, `findall`, and iteration over children. The
+subtrees of elements whose tag the parse methods never read, e.g.,
+`<ReferenceList>` or `<History>`, as well as the subtrees of sections left out
+of a projection are skipped without creating any objects.
+
+Attributes:
+    pubmed_article_tags (frozenset): The tags of all elements the
+        `ParserXmlPubmedArticle` parse methods read.
+"""
+
+from typing import Optional, Set, Callable, Dict, Tuple, Union
+
+from lxml import etree
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.parsers import pubmed_article_sections
+
+
+pubmed_article_tags = frozenset([
+    "Abstract",
+    "AbstractText",
+    "AccessionNumber",
+    "AccessionNumberList",
+    "Acronym",
+    "Affiliation",
+    "AffiliationInfo",
+    "Agency",
+    "Article",
+    "ArticleDate",
+    "ArticleId",
+    "ArticleIdList",
+    "ArticleTitle",
+    "Author",
+    "AuthorList",
+    "Chemical",
+    "ChemicalList",
+    "Country",
+    "DataBank",
+    "DataBankList",
+    "DataBankName",
+    "DateCompleted",
+    "DateCreated",
+    "DateRevised",
+    "Day",
+    "DescriptorName",
+    "ForeName",
+    "Grant",
+    "GrantID",
+    "GrantList",
+    "ISOAbbreviation",
+    "ISSN",
+    "ISSNLinking",
+    "Identifier",
+    "Initials",
+    "Issue",
+    "Journal",
+    "JournalIssue",
+    "Keyword",
+    "KeywordList",
+    "Language",
+    "LastName",
+    "MedlineCitation",
+    "MedlineDate",
+    "MedlineJournalInfo",
+    "MedlinePgn",
+    "MedlineTA",
+    "MeshHeading",
+    "MeshHeadingList",
+    "Month",
+    "NameOfSubstance",
+    "NlmUniqueID",
+    "NumberOfReferences",
+    "PMID",
+    "Pagination",
+    "PubDate",
+    "PublicationType",
+    "PublicationTypeList",
+    "PubmedArticle",
+    "PubmedData",
+    "QualifierName",
+    "RegistryNumber",
+    "Suffix",
+    "Title",
+    "VernacularTitle",
+    "Volume",
+    "Year",
+])
+
+
+class ElementLite(object):
+    """Lightweight stand-in for `lxml` elements built by `TargetXml`.
+
+    As with `lxml` elements, `text` only holds the text preceding the first
+    child element.
+    """
+
+    __slots__ = ("tag", "attrib", "text", "children")
+
+    def __init__(self, tag, attrib):
+        self.tag = tag
+        self.attrib = attrib
+        self.text = None
+        self.children = []
+
+    def get(self, key, default=None):
+        return self.attrib.get(key, default)
+
+    def find(self, tag):
+        for child in self.children:
+            if child.tag == tag:
+                return child
+
+        return None
+
+    def findall(self, tag):
+        return [child for child in self.children if child.tag == tag]
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __reversed__(self):
+        return reversed(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+
+class TargetXml(object):
+    """`lxml` parser target collecting the `element_tag` elements of an XML
+    document as `ElementLite` objects.
+
+    Completed elements are appended to the `elements` list which the consumer
+    is expected to drain between feeds. Elements outside the `element_tag`
+    elements are ignored while elements within them with tags outside `tags`
+    are skipped along with their subtrees. As with `etree.iterparse`,
+    `element_tag` may also be a tuple of sibling tags.
+    """
+
+    def __init__(
+        self,
+        element_tag: Union[str, Tuple[str, ...]],
+        tags: frozenset,
+    ):
+
+        if isinstance(element_tag, str):
+            element_tag = (element_tag,)
+
+        self.element_tags = frozenset(element_tag)
+        self.tags = tags
+
+        self.elements = []
+
+        self._stack = []
+        # The depth into a skipped subtree.
+        self._depth_skip = 0
+        # Whether the current element can still receive text, i.e., it hasn't
+        # had any child elements yet.
+        self._is_text_open = False
+
+    def start(self, tag, attrib):
+
+        if self._depth_skip:
+            self._depth_skip += 1
+            return
+
+        if self._stack:
+            # Any text after a child element is a tail and not element text.
+            self._is_text_open = False
+
+            if tag not in self.tags:
+                self._depth_skip = 1
+                return
+
+            element = ElementLite(tag, attrib)
+            self._stack[-1].children.append(element)
+        # Elements outside an `element_tag` element (e.g., the root) are
+        # ignored.
+        elif tag in self.element_tags:
+            element = ElementLite(tag, attrib)
+        else:
+            return
+
+        self._stack.append(element)
+        self._is_text_open = True
+
+    def end(self, tag):
+
+        if self._depth_skip:
+            self._depth_skip -= 1
+            return
+
+        self._is_text_open = False
+
+        if not self._stack:
+            return
+
+        element = self._stack.pop()
+        if not self._stack:
+            self.elements.append(element)
+
+    def data(self, data):
+
+        if self._is_text_open:
+            element = self._stack[-1]
+            if element.text is None:
+                element.text = data
+            else:
+                element.text += data
+
+    def close(self):
+        return None
+
+
+class ParserXmlPubmedArticleTarget(ParserXmlPubmedArticle):
+    """Parses Pubmed XML files through the `TargetXml` parser target yielding
+    the same documents as the `ParserXmlPubmedArticle` class."""
+
+    def __init__(self, read_size: int = 65536, **kwargs):
+        """Constructor and initialization.
+
+        Args:
+            read_size (int, optional): The number of bytes fed to the
+                tokenizer at a time. Defaults to 64KB.
+        """
+
+        super(ParserXmlPubmedArticleTarget, self).__init__(**kwargs)
+
+        self.read_size = read_size
+
+    def get_worker_kwargs(self) -> Dict:
+
+        kwargs = super(ParserXmlPubmedArticleTarget, self).get_worker_kwargs()
+        kwargs["read_size"] = self.read_size
+
+        return kwargs
+
+    def generate_xml_elements_lite(
+        self,
+        file_xml,
+        element_tag: Union[str, Tuple[str, ...]],
+        tags: frozenset,
+    ):
+        """Lazily generates the `element_tag` elements of an XML file as
+        `ElementLite` objects.
+
+        Args:
+            file_xml: The binary XML file-like object.
+            element_tag (Union[str, Tuple[str]]): The tag, or tuple of sibling
+                tags, of the elements to generate.
+            tags (frozenset): The tags of the elements to build. Subtrees of
+                other elements are skipped.
+
+        Yields:
+            ElementLite: The generated elements.
+        """
+
+        target = TargetXml(element_tag=element_tag, tags=tags)
+        parser = etree.XMLParser(target=target)
+
+        while True:
+            data = file_xml.read(self.read_size)
+            if not data:
+                break
+            parser.feed(data)
+
+            elements = target.elements
+            target.elements = []
+            yield from elements
+
+        parser.close()
+        yield from target.elements
+
+    def generate_pubmed_articles(
+        self,
+        filename_xml: str,
+        sections: Optional[Set[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+        do_yield_deletions: bool = False,
+    ):
+        """Lazily parses the `PubmedArticle` documents out of a Pubmed XML
+        file through the `TargetXml` parser target bypassing the cache.
+
+        Args:
+            filename_xml (str): The Pubmed XML file to parse.
+            sections (Set[str], optional): The sections to parse as validated
+                by `validate_sections`. The subtrees of other sections are
+                skipped during tokenization. Defaults to `None`.
+            article_filter (Callable[[Dict], bool], optional): The article
+                filter as in the `parse` method. Defaults to `None`.
+            do_yield_deletions (bool, optional): Whether to also yield
+                `DeleteCitation` documents as in the `parse` method. Defaults
+                to `False`.
+
+        Yields:
+            dict: The parsed `PubmedArticle` and `DeleteCitation` documents.
+        """
+
+        tags = pubmed_article_tags
+        if sections is not None:
+            tags = tags - (pubmed_article_sections - sections)
+
+        msg = "Parsing Pubmed XML file '{0}' through a parser target"
+        msg_fmt = msg.format(filename_xml)
+        self.logger.info(msg=msg_fmt)
+
+        file_xml = self.open_xml_file(filename_xml=filename_xml)
+
+        if do_yield_deletions:
+            element_tag = ("PubmedArticle", "DeleteCitation")
+        else:
+            element_tag = "PubmedArticle"
+
+        elements = self.generate_xml_elements_lite(
+            file_xml=file_xml,
+            element_tag=element_tag,
+            tags=tags,
+        )
+
+        try:
+            yield from self.parse_pubmed_articles(
+                elements=elements,
+                sections=sections,
+                article_filter=article_filter,
+            )
+        finally:
+            file_xml.close()
@@ -2,6 +2,7 @@
 
 import re
 import datetime
+import functools
 from typing import Tuple, Union
 
 from pubmed_ingester.loggers import create_logger
@@ -29,68 +30,138 @@ regex_year = re.compile("(\d{4})")
 regex_email = re.compile("([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)")
 
 
-def parse_date_element(date_element):
-
-    result = {
-        "Year": None,
-        "Month": None,
-        "Day": None,
-        "Date": None
-    }
-
-    if date_element is None:
-        return result
-
-    year_element = date_element.find("Year")
-    month_element = date_element.find("Month")
-    day_element = date_element.find("Day")
-
-    # Extract the year (if the element exists).
-    if year_element is not None:
-        # Extract the text out of the element.
-        year_element_text = year_element.text
+@functools.lru_cache(maxsize=16384)
+def normalize_date(
+    year_text: Union[str, None],
+    month_text: Union[str, None],
+    day_text: Union[str, None],
+    medline_date_text: Union[str, None] = None,
+) -> Tuple[
+    Union[str, int, None],
+    Union[str, None],
+    Union[str, None],
+    Union[datetime.date, None],
+]:
+    """Normalizes the raw text of the components of a date.
+
+    Results are memoized in a bounded LRU cache as the same dates repeat
+    heavily across articles. The hit-rate of the cache is available through
+    `normalize_date.cache_info()`.
+
+    Args:
+        year_text (str): The raw text of the `<Year>` element.
+        month_text (str): The raw text of the `<Month>` element which may be a
+            number or a month abbreviation.
+        day_text (str): The raw text of the `<Day>` element.
+        medline_date_text (str, optional): The raw text of the
+            `<MedlineDate>` element, e.g., `1998 Dec-1999 Jan`, the first year
+            of which is used when there's no valid year. Defaults to `None`.
+
+    Returns:
+        Tuple: The year, month, and day strings and the `datetime.date`
+            combining them (if all are valid). The year is an integer when
+            it's extracted from `medline_date_text`.
+    """
+
+    year = None
+    month = None
+    day = None
+    date = None
+
+    if year_text is not None:
         # Lowercase and strip any whitespace from the string.
-        year_element_text = year_element_text.lower().strip()
-        # If the string is a digit then convert it to an integer.
-        if year_element_text.isdigit():
-            result["Year"] = year_element_text
-
-    # Extract the month (if the element exists).
-    if month_element is not None:
-        # Extract the text out of the element.
-        month_element_text = month_element.text
+        year_text = year_text.lower().strip()
+        if year_text.isdigit():
+            year = year_text
+
+    if month_text is not None:
         # Lowercase and strip any whitespace from the string.
-        month_element_text = month_element_text.lower().strip()
-        # If the string is a digit then convert it to an integer.
-        if month_element_text.isdigit():
-            result["Month"] = month_element_text
+        month_text = month_text.lower().strip()
+        if month_text.isdigit():
+            month = month_text
         # If the string contains a recognized month abbreviation get the digit
         # from the `month_abbreviations` dictionary.
-        elif month_element_text.lower() in month_abbreviations:
-            result["Month"] = month_abbreviations[month_element_text.lower()]
+        else:
+            month = month_abbreviations.get(month_text)
 
-    if day_element is not None:
-        # Extract the text out of the element.
-        day_element_text = day_element.text
+    if day_text is not None:
         # Lowercase and strip any whitespace from the string.
-        day_element_text = day_element_text.lower().strip()
-        # If the string is a digit then convert it to an integer.
-        if day_element_text.isdigit():
-            result["Day"] = day_element_text
+        day_text = day_text.lower().strip()
+        if day_text.isdigit():
+            day = day_text
 
-    if result["Year"] and result["Month"] and result["Day"]:
+    if year and month and day:
         try:
-            result["Date"] = datetime.date(
-                year=int(result["Year"]),
-                month=int(result["Month"]),
-                day=int(result["Day"])
+            date = datetime.date(
+                year=int(year),
+                month=int(month),
+                day=int(day)
             )
         except ValueError:
             msg = "Date components {} cannot be combined into a date"
-            msg_fmt = msg.format(result)
+            msg_fmt = msg.format(
+                {"Year": year, "Month": month, "Day": day, "Date": None}
+            )
             logger.error(msg_fmt)
 
-    return result
+    # Fall back to the first year in the `<MedlineDate>` text.
+    if year is None and medline_date_text is not None:
+        match = regex_year.search(medline_date_text)
+        if match is not None:
+            year = int(match.group(0))
+
+    return year, month, day, date
+
+
+def parse_date_element(date_element):
+    """Parses a date element, e.g., `<DateRevised>` or `<PubDate>`, through
+    the memoized `normalize_date` function.
+
+    Args:
+        date_element (etree.Element): The date element.
+
+    Returns:
+        dict: A new dictionary with the `Year`, `Month`, `Day`, and `Date` of
+            the element.
+    """
+
+    if date_element is None:
+        return {
+            "Year": None,
+            "Month": None,
+            "Day": None,
+            "Date": None
+        }
+
+    # Retrieve the date components in a single pass over the children keeping
+    # the first element per tag.
+    year_element = None
+    month_element = None
+    day_element = None
+    medline_date_element = None
+    for element in date_element:
+        if element.tag == "Year" and year_element is None:
+            year_element = element
+        elif element.tag == "Month" and month_element is None:
+            month_element = element
+        elif element.tag == "Day" and day_element is None:
+            day_element = element
+        elif element.tag == "MedlineDate" and medline_date_element is None:
+            medline_date_element = element
+
+    year, month, day, date = normalize_date(
+        None if year_element is None else year_element.text,
+        None if month_element is None else month_element.text,
+        None if day_element is None else day_element.text,
+        None if medline_date_element is None else medline_date_element.text,
+    )
+
+    return {
+        "Year": year,
+        "Month": month,
+        "Day": day,
+        "Date": date
+    }
 
 
 def extract_year_from_medlinedate(pubdate_element):
@@ -100,35 +171,40 @@ def extract_year_from_medlinedate(pubdate_element):
 
     medlinedate_element = pubdate_element.find("MedlineDate")
 
-    if medlinedate_element is None:
+    if medlinedate_element is None or medlinedate_element.text is None:
         return None
 
-    medline_date_text = medlinedate_element.text
+    year, _, _, _ = normalize_date(None, None, None, medlinedate_element.text)
 
-    match = regex_year.search(medline_date_text)
+    return year
 
-    if match is None:
-        return None
 
-    year_max = -1
-    for group in match.groups():
-        if year_max < int(group):
-            year_max = int(group)
+@functools.lru_cache(maxsize=65536)
+def normalize_affiliation(
+    affiliation_text: str
+) -> Tuple[Union[str, None], Union[str, None]]:
+    """Splits an affiliation into its text without the email and the email in
+    a single scan.
 
-    return year_max
+    Results are memoized in a bounded LRU cache as affiliations repeat heavily
+    across articles. The hit-rate of the cache is available through
+    `normalize_affiliation.cache_info()`.
 
+    Args:
+        affiliation_text (str): The raw affiliation text.
 
-def clean_affiliation_email(
-    affiliation_text: str
-) -> Union[str, None]:
+    Returns:
+        Tuple[Union[str, None], Union[str, None]]: The affiliation text
+            without the email and the email (if any).
+    """
 
     if not affiliation_text:
-        return None
+        return None, None
 
     match = regex_email.search(affiliation_text)
 
     if match is None:
-        return affiliation_text
+        return affiliation_text, None
 
     email = match.group(0)
 
@@ -142,25 +218,23 @@ def clean_affiliation_email(
     if affiliation_clean.endswith(".."):
         affiliation_clean = affiliation_clean.replace("..", ".")
 
-    return affiliation_clean
+    return affiliation_clean, email
 
 
-def extract_affiliation_email(
+def clean_affiliation_email(
     affiliation_text: str
 ) -> Union[str, None]:
 
-    if not affiliation_text:
-        return None
+    affiliation_clean, _ = normalize_affiliation(affiliation_text)
 
-    match = regex_email.search(affiliation_text)
+    return affiliation_clean
 
-    if match is None:
-        return None
 
-    email = match.group(0)
+def extract_affiliation_email(
+    affiliation_text: str
+) -> Union[str, None]:
 
-    if email.endswith("."):
-        email = email[:-1]
+    _, email = normalize_affiliation(affiliation_text)
 
     return email
 
@@ -1,20 +1,90 @@
 # -*- coding: utf-8 -*-
 
 import abc
-import gzip
+import collections
+import multiprocessing
+from typing import List, Optional, Iterable, Set, Callable, Dict, Tuple, Type
+
 from lxml import etree
 
 from pubmed_ingester.loggers import create_logger
+from pubmed_ingester.excs import InvalidArguments
+from pubmed_ingester.batches import create_batch
+from pubmed_ingester.batches import append_pubmed_article
+from pubmed_ingester.utils import chunk_generator
+from pubmed_ingester.decompressors import open_gzip_file
+from pubmed_ingester.decompressors import ReaderReadAhead
+from pubmed_ingester.caches import CacheDocuments
+from pubmed_ingester.stats import StatsParser
 from pubmed_ingester.parser_utils import parse_date_element
-from pubmed_ingester.parser_utils import extract_year_from_medlinedate
 from pubmed_ingester.parser_utils import convert_yn_boolean
 from pubmed_ingester.parser_utils import clean_orcid_identifier
-from pubmed_ingester.parser_utils import clean_affiliation_email
-from pubmed_ingester.parser_utils import extract_affiliation_email
+from pubmed_ingester.parser_utils import normalize_affiliation
+
+
+# The version of the `PubmedArticle` documents produced by the
+# `ParserXmlPubmedArticle` class which keys the cached documents. It must be
+# bumped whenever the parsing changes the documents.
+parser_version = 2
+
+# The sections of a `PubmedArticle` document that can be projected through the
+# `sections` argument of the `ParserXmlPubmedArticle` parse methods. The PMID,
+# status, owner, dates, publication model, and title are always parsed.
+pubmed_article_sections = frozenset([
+    # `<MedlineCitation>` sections.
+    "MedlineJournalInfo",
+    "ChemicalList",
+    "MeshHeadingList",
+    "KeywordList",
+    "NumberOfReferences",
+    # `<Article>` sections.
+    "Journal",
+    "Pagination",
+    "Abstract",
+    "AuthorList",
+    "Language",
+    "DataBankList",
+    "GrantList",
+    "PublicationTypeList",
+    "VernacularTitle",
+    # `<PubmedData>` sections.
+    "ArticleIdList",
+])
 
 
 class ParserXmlBase(object):
-    def __init__(self, **kwargs):
+    def __init__(
+        self,
+        decompression_backend: str = "stdlib",
+        intern_max_size: int = 100000,
+        prefetch_max_size: int = 64 * 1024 * 1024,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            decompression_backend (str, optional): The backend used to
+                decompress gzipped XML files as defined under the
+                `decompressors` module. Defaults to `stdlib`.
+            intern_max_size (int, optional): The maximum number of values
+                kept in the intern table. Defaults to 100000. A size of 0
+                disables interning.
+            prefetch_max_size (int, optional): The maximum number of
+                (decompressed) bytes read ahead per file prefetched through
+                `prefetch_xml_file`. Defaults to 64MB.
+        """
+
+        self.decompression_backend = decompression_backend
+
+        # Readers of the files prefetched through `prefetch_xml_file` keyed
+        # by filename.
+        self.prefetch_max_size = prefetch_max_size
+        self.files_prefetched = {}  # type: Dict[str, ReaderReadAhead]
+
+        # Table of the values interned through `_intern` mapping each value
+        # to its canonical instance.
+        self.intern_table = {}
+        self.intern_max_size = intern_max_size
 
         self.logger = create_logger(
             logger_name=type(self).__name__,
@@ -47,8 +117,85 @@ class ParserXmlBase(object):
 
         return value
 
+    def _intern(self, value):
+        """Returns the canonical instance of a value out of the intern table
+        so that repeated values share a single object.
+
+        Values are added to the table until it reaches `intern_max_size` after
+        which only the values already in the table are interned. As
+        low-cardinality values repeat early on, the table fills with them
+        before any outliers.
+        """
+
+        if value is None:
+            return None
+
+        value_interned = self.intern_table.get(value)
+        if value_interned is not None:
+            return value_interned
+
+        if len(self.intern_table) < self.intern_max_size:
+            self.intern_table[value] = value
+
+        return value
+
+    def _eti(self, element):
+        """Extracts the element text interned (ETI)"""
+
+        return self._intern(self._et(element))
+
+    def _eavi(self, element, attribute):
+        """Extracts the element attribute value interned (EAVI)"""
+
+        return self._intern(self._eav(element, attribute))
+
+    @staticmethod
+    def _ic(element):
+        """Indexes the element children (IC) by tag in a single pass.
+
+        As with `element.find`, only the first child under each tag is kept
+        which allows the parse methods to look up all their children in O(1)
+        instead of performing a linear child-scan per `find` call.
+        """
+
+        return {child.tag: child for child in reversed(element)}
+
+    @staticmethod
+    def _ics(element, sections=None):
+        """Indexes the element children by tag like `_ic` but only keeps the
+        children whose tag is under `sections` (if defined).
+
+        Children that aren't kept are looked up as missing so that their
+        subtrees are never visited and they default to the same values as
+        elements absent from the XML.
+        """
+
+        if sections is None:
+            return {child.tag: child for child in reversed(element)}
+
+        return {
+            child.tag: child for child in reversed(element)
+            if child.tag in sections
+        }
+
     @staticmethod
     def generate_xml_elements(file_xml, element_tag=None):
+        """Lazily generates the `element_tag` elements of an XML file in
+        constant memory.
+
+        Once a yielded element has been consumed it is cleared and removed,
+        along with any preceding siblings, from its parent so that the root
+        element doesn't accumulate (empty) elements over the course of the
+        file.
+
+        Args:
+            file_xml: The XML file-like object or filename.
+            element_tag (Union[str, Tuple[str]], optional): The tag, or tuple
+                of sibling tags, of the elements to generate.
+
+        Yields:
+            etree.Element: The generated elements.
+        """
 
         document = etree.iterparse(
             file_xml,
@@ -63,29 +210,279 @@ class ParserXmlBase(object):
             if event == 'end' and element.tag == start_tag:
                 yield element
                 start_tag = None
-                element.clear()
+                element.clear(keep_tail=False)
+                # Drop the already processed siblings from the parent element
+                # as `clear` alone keeps the emptied elements referenced
+                # under the root.
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+        # Release the reference to the root element held by the iterator.
+        del document
+
+    @staticmethod
+    def generate_xml_chunks(
+        file_xml,
+        element_tag: str,
+        num_elements: int,
+        read_size: int = 1024 * 1024,
+    ):
+        """Lazily splits the raw bytes of an XML file into chunks of
+        consecutive complete `element_tag` elements without parsing them.
+
+        Elements are located by their literal opening and closing tags which
+        must therefore carry no attributes. Any content outside the
+        `element_tag` elements is skipped.
+
+        Args:
+            file_xml: The binary XML file-like object.
+            element_tag (str): The tag of the elements to split on.
+            num_elements (int): The maximum number of elements per chunk.
+            read_size (int, optional): The number of bytes read off
+                `file_xml` at a time. Defaults to 1MB.
+
+        Yields:
+            bytes: The concatenated raw bytes of up to `num_elements`
+                elements.
+        """
+
+        tag_open = "<{}>".format(element_tag).encode("utf-8")
+        tag_close = "</{}>".format(element_tag).encode("utf-8")
+
+        buffer = b""
+        elements = []
+        is_eof = False
+        while not is_eof:
+            data = file_xml.read(read_size)
+            is_eof = not data
+            buffer += data
+
+            position = 0
+            while True:
+                start = buffer.find(tag_open, position)
+                # Keep a possibly partial opening tag at the end of the buffer.
+                if start == -1:
+                    position = max(position, len(buffer) - len(tag_open) + 1)
+                    break
+
+                end = buffer.find(tag_close, start)
+                # Keep the incomplete element for the next read.
+                if end == -1:
+                    position = start
+                    break
+
+                end += len(tag_close)
+                elements.append(buffer[start:end])
+                position = end
+
+                if len(elements) == num_elements:
+                    yield b"".join(elements)
+                    elements = []
+
+            buffer = buffer[position:]
+
+        if elements:
+            yield b"".join(elements)
 
     def open_xml_file(self, filename_xml):
 
+        # Hand over the reader of a prefetched file along with whatever it
+        # has read ahead so far.
+        file_xml = self.files_prefetched.pop(filename_xml, None)
+        if file_xml is not None:
+            msg_fmt = "Opening prefetched XML file '{0}'".format(filename_xml)
+            self.logger.info(msg=msg_fmt)
+            return file_xml
+
         msg_fmt = "Opening XML file '{0}'".format(filename_xml)
         self.logger.info(msg=msg_fmt)
 
         if filename_xml.endswith(".gz"):
-            file_xml = gzip.GzipFile(filename=filename_xml, mode="rb")
+            file_xml = open_gzip_file(
+                filename=filename_xml,
+                backend=self.decompression_backend,
+            )
         else:
             file_xml = open(filename_xml, "rb")
 
         return file_xml
 
+    def prefetch_xml_file(self, filename_xml: str, chunk_size: int = 1048576):
+        """Starts reading, and decompressing, an XML file ahead on a
+        background thread, e.g., the next file while the current one is
+        ingested, until `prefetch_max_size` bytes are buffered. The reader is
+        picked up by the next `open_xml_file` call for the same file.
+
+        Failures to open the file are only logged so that they're raised when
+        the file is actually opened.
+
+        Args:
+            filename_xml (str): The XML file to prefetch.
+            chunk_size (int, optional): The size in bytes of the chunks read
+                ahead. Defaults to 1MB.
+        """
+
+        if filename_xml in self.files_prefetched:
+            return
+
+        max_chunks = max(1, self.prefetch_max_size // chunk_size)
+
+        msg_fmt = "Prefetching XML file '{0}'".format(filename_xml)
+        self.logger.info(msg=msg_fmt)
+
+        try:
+            if filename_xml.endswith(".gz"):
+                file_xml = open_gzip_file(
+                    filename=filename_xml,
+                    backend=self.decompression_backend,
+                    chunk_size=chunk_size,
+                    max_chunks=max_chunks,
+                )
+            else:
+                file_xml = ReaderReadAhead(
+                    file_obj=open(filename_xml, "rb"),
+                    chunk_size=chunk_size,
+                    max_chunks=max_chunks,
+                )
+        except OSError:
+            msg_fmt = "Prefetching of XML file '{0}' failed".format(
+                filename_xml
+            )
+            self.logger.warning(msg=msg_fmt)
+            return
+
+        self.files_prefetched[filename_xml] = file_xml
+
+    def discard_prefetched_xml_file(self, filename_xml: str):
+        """Closes the reader of a prefetched XML file that was never opened,
+        e.g., when its documents were served off the cache.
+
+        Args:
+            filename_xml (str): The prefetched XML file.
+        """
+
+        file_xml = self.files_prefetched.pop(filename_xml, None)
+        if file_xml is not None:
+            file_xml.close()
+
     @abc.abstractmethod
     def parse(self, filename_xml):
         raise NotImplementedError
 
 
+# Per-process parser of the `parse_parallel` worker processes.
+parser_worker = None
+
+
+# Per-process article filter of the `parse_parallel` worker processes.
+article_filter_worker = None
+
+
+def init_parser_worker(
+    parser_class: Type["ParserXmlPubmedArticle"],
+    parser_kwargs: Dict,
+    article_filter: Optional[Callable[[Dict], bool]] = None,
+):
+    """Initializes a `parse_parallel` worker process with a parser of its own,
+    created out of the class and constructor arguments of the parent's parser,
+    and the article filter it applies."""
+
+    global parser_worker
+    global article_filter_worker
+
+    parser_worker = parser_class(**parser_kwargs)
+    article_filter_worker = article_filter
+
+
+def parse_xml_chunk_worker(
+    chunk: bytes,
+    sections: Optional[Set[str]] = None,
+) -> Tuple[List[dict], int, Optional[Dict[str, Dict]]]:
+    """Parses a chunk of raw `<PubmedArticle>` elements in a `parse_parallel`
+    worker process returning the documents, the number of articles rejected
+    by the article filter, and the parser statistics of the chunk, if
+    collected."""
+
+    root = etree.fromstring(
+        b"<PubmedArticleSet>" + chunk + b"</PubmedArticleSet>"
+    )
+
+    pubmed_articles = list(
+        parser_worker.parse_pubmed_articles(
+            elements=root.iterchildren("PubmedArticle"),
+            sections=sections,
+            article_filter=article_filter_worker,
+        )
+    )
+
+    stats = None
+    if parser_worker.stats is not None:
+        stats = parser_worker.stats.as_dict()
+
+    return pubmed_articles, parser_worker.num_articles_skipped, stats
+
+
 class ParserXmlPubmedArticle(ParserXmlBase):
-    def __init__(self, **kwargs):
+    # Exposed as a method so that it can be instrumented along with the
+    # `parse_*` methods.
+    parse_date_element = staticmethod(parse_date_element)
 
-        super(ParserXmlPubmedArticle, self).__init__(kwargs=kwargs)
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        do_collect_stats: bool = False,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            cache_dir (str, optional): The directory parsed documents are
+                cached under through the `CacheDocuments` class. Defaults to
+                `None` in which case no caching takes place.
+            do_collect_stats (bool, optional): Whether to record the call
+                counts and cumulative durations of the `parse_*` methods under
+                a `StatsParser` object at `stats` and log a summary at the end
+                of every file. Defaults to `False` in which case the methods
+                are left untouched.
+        """
+
+        super(ParserXmlPubmedArticle, self).__init__(**kwargs)
+
+        # The number of articles rejected by the article filter in the last
+        # parsed file.
+        self.num_articles_skipped = 0
+
+        self.cache = None
+        if cache_dir:
+            self.cache = CacheDocuments(
+                cache_dir=cache_dir,
+                version=parser_version,
+                logger_level=kwargs.get("logger_level", "DEBUG"),
+            )
+
+        self.stats = None
+        if do_collect_stats:
+            self.stats = StatsParser()
+            self._install_stats()
+
+    def _install_stats(self):
+        """Shadows the `parse_*` methods with instance attributes recording
+        their calls under `stats` so that the class itself and instances
+        without instrumentation are unaffected."""
+
+        # The generator methods only create generators when called.
+        names_excluded = {
+            "parse_pubmed_articles",
+            "parse_batches",
+            "parse_parallel",
+        }
+
+        for name in dir(type(self)):
+            if not name.startswith("parse_") or name in names_excluded:
+                continue
+            setattr(self, name, self.stats.wrap(name, getattr(self, name)))
 
     def parse_medline_journal_info(self, element):
 
@@ -93,11 +490,13 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+
         medline_journal_info = {
-            "Country": self._et(element.find("Country")),
-            "MedlineTA": self._et(element.find("MedlineTA")),
-            "NlmUniqueID": self._et(element.find("NlmUniqueID")),
-            "ISSNLinking": self._et(element.find("ISSNLinking")),
+            "Country": self._eti(children.get("Country")),
+            "MedlineTA": self._eti(children.get("MedlineTA")),
+            "NlmUniqueID": self._eti(children.get("NlmUniqueID")),
+            "ISSNLinking": self._eti(children.get("ISSNLinking")),
         }
 
         return medline_journal_info
@@ -107,11 +506,14 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+        name_of_substance = children.get("NameOfSubstance")
+
         chemical = {
-            "RegistryNumber": self._et(element.find("RegistryNumber")),
+            "RegistryNumber": self._eti(children.get("RegistryNumber")),
             "NameOfSubstance": {
-                "UI": self._eav(element.find("NameOfSubstance"), "UI"),
-                "NameOfSubstance": self._et(element.find("NameOfSubstance")),
+                "UI": self._eavi(name_of_substance, "UI"),
+                "NameOfSubstance": self._eti(name_of_substance),
             },
         }
 
@@ -136,9 +538,9 @@ class ParserXmlPubmedArticle(ParserXmlBase):
             return {}
 
         mesh_entry = {
-            entry_name: self._et(element),
-            "UI": self._eav(element, "UI"),
-            "MajorTopicYN": self._eav(element, "MajorTopicYN"),
+            entry_name: self._eti(element),
+            "UI": self._eavi(element, "UI"),
+            "MajorTopicYN": self._eavi(element, "MajorTopicYN"),
         }
 
         mesh_entry["IsMajorTopic"] = convert_yn_boolean(
@@ -164,13 +566,19 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        descriptor_name = None
+        qualifier_names = []
+        for _element in element:
+            if _element.tag == "QualifierName":
+                qualifier_names.append({
+                    "QualifierName": self.parse_mesh_qualifier(_element)
+                })
+            elif _element.tag == "DescriptorName" and descriptor_name is None:
+                descriptor_name = _element
+
         mesh_heading = {
-            "DescriptorName": self.parse_mesh_descriptor(
-                element.find("DescriptorName")
-            ),
-            "QualifierNames": [{
-                "QualifierName": self.parse_mesh_qualifier(_element)
-            } for _element in element.findall("QualifierName")]
+            "DescriptorName": self.parse_mesh_descriptor(descriptor_name),
+            "QualifierNames": qualifier_names,
         }
 
         return mesh_heading
@@ -195,7 +603,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         keyword = {
             "Keyword": self._et(element),
-            "MajorTopicYN": self._eav(element, "MajorTopicYN"),
+            "MajorTopicYN": self._eavi(element, "MajorTopicYN"),
         }
 
         keyword["IsMajorTopic"] = convert_yn_boolean(
@@ -222,21 +630,17 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+
         journal_issue = {
-            "CitedMedium": self._eav(element, "CitedMedium"),
+            "CitedMedium": self._eavi(element, "CitedMedium"),
             "JournalIssue": {
-                "Volume": self._et(element.find("Volume")),
-                "Issue": self._et(element.find("Issue")),
-                "PubDate": parse_date_element(element.find("PubDate")),
+                "Volume": self._et(children.get("Volume")),
+                "Issue": self._et(children.get("Issue")),
+                "PubDate": self.parse_date_element(children.get("PubDate")),
             }
         }
 
-        if journal_issue["JournalIssue"]["PubDate"]["Year"] is None:
-            year = extract_year_from_medlinedate(
-                pubdate_element=element.find("PubDate")
-            )
-            journal_issue["JournalIssue"]["PubDate"]["Year"] = year
-
         return journal_issue
 
     def parse_journal(self, element):
@@ -244,41 +648,58 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+        issn = children.get("ISSN")
+
         journal = {
             "ISSN": {
-                "ISSN": self._et(element.find("ISSN")),
-                "IssnType": self._eav(element.find("ISSN"), "IssnType"),
+                "ISSN": self._eti(issn),
+                "IssnType": self._eavi(issn, "IssnType"),
             },
             "JournalIssue": self.parse_journal_issue(
-                element.find("JournalIssue")
+                children.get("JournalIssue")
             ),
-            "Title": self._et(element.find("Title")),
-            "ISOAbbreviation": self._et(element.find("ISOAbbreviation")),
+            "Title": self._eti(children.get("Title")),
+            "ISOAbbreviation": self._eti(children.get("ISOAbbreviation")),
         }
 
         return journal
 
-    def parse_affiliation_info(self, element):
+    def _parse_affiliation_info(self, element):
+        """Parses an `<AffiliationInfo>` element into an `AffiliationInfo`
+        document with the emails removed from the affiliations and the list of
+        said emails in a single pass."""
 
-        if element is None:
-            return {}
+        identifier = None
+        affiliations = []
+        emails = []
+        for _element in element:
+            if _element.tag == "Affiliation":
+                affiliation_clean, email = normalize_affiliation(
+                    self._et(_element)
+                )
+                affiliations.append({"Affiliation": affiliation_clean})
+                if email:
+                    emails.append(email)
+            elif _element.tag == "Identifier" and identifier is None:
+                identifier = _element
 
         affiliation_info = {
             "Identifier": {
-                "Source": self._eav(element.find("Identifier"), "Source"),
-                "Identifier": self._et(element.find("Identifier"))
+                "Source": self._eavi(identifier, "Source"),
+                "Identifier": self._et(identifier)
             },
-            "Affiliations": [{
-                "Affiliation": self._et(_element)
-            } for _element in element.findall("Affiliation")]
+            "Affiliations": affiliations,
         }
 
-        # Remove any email entries from the affiliations.
-        for doc in affiliation_info["Affiliations"]:
-            if doc["Affiliation"]:
-                doc["Affiliation"] = clean_affiliation_email(
-                    affiliation_text=doc["Affiliation"]
-                )
+        return affiliation_info, emails
+
+    def parse_affiliation_info(self, element):
+
+        if element is None:
+            return {}
+
+        affiliation_info, _ = self._parse_affiliation_info(element)
 
         return affiliation_info
 
@@ -287,12 +708,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
-        emails = []
-        for _element in element.findall("Affiliation"):
-            affiliation_text = self._et(_element)
-            email = extract_affiliation_email(affiliation_text=affiliation_text)
-            if email:
-                emails.append(email)
+        _, emails = self._parse_affiliation_info(element)
 
         return emails
 
@@ -301,28 +717,35 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+        identifier = children.get("Identifier")
+
+        element_affiliation_info = children.get("AffiliationInfo")
+
+        # Parse the affiliations and extract their emails in a single pass.
+        affiliation_info = {}
+        emails = []
+        if element_affiliation_info is not None:
+            affiliation_info, emails = self._parse_affiliation_info(
+                element_affiliation_info
+            )
+
         author = {
-            "ValidYN": self._eav(element, "ValidYN"),
+            "ValidYN": self._eavi(element, "ValidYN"),
             "Author": {
-                "LastName": self._et(element.find("LastName")),
-                "ForeName": self._et(element.find("ForeName")),
-                "Initials": self._et(element.find("Initials")),
-                "Suffix": self._et(element.find("Suffix")),
+                "LastName": self._et(children.get("LastName")),
+                "ForeName": self._et(children.get("ForeName")),
+                "Initials": self._et(children.get("Initials")),
+                "Suffix": self._et(children.get("Suffix")),
                 "Identifier": {
-                    "Source": self._eav(element.find("Identifier"), "Source"),
-                    "Identifier": self._et(element.find("Identifier"))
+                    "Source": self._eavi(identifier, "Source"),
+                    "Identifier": self._et(identifier)
                 },
-                "AffiliationInfo": self.parse_affiliation_info(
-                    element.find("AffiliationInfo")
-                ),
+                "AffiliationInfo": affiliation_info,
                 "Email": None,
             }
         }
 
-        emails = self.extract_affiliation_info_emails(
-            element.find("AffiliationInfo")
-        )
-
         # TODO:
         # This is not necesserily correct as the author may have multiple
         # affiliations with emails but we only keep the first.
@@ -345,7 +768,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
             return {}
 
         author_list = {
-            "CompleteYN": self._eav(element, "CompleteYN"),
+            "CompleteYN": self._eavi(element, "CompleteYN"),
             "Authors": [{
                 "Author": self.parse_author(_element)
             } for _element in element.findall("Author")]
@@ -364,8 +787,8 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         abstract_text = {
             "AbstractText": self._et(element),
-            "Label": self._eav(element, "Label"),
-            "NlmCategory": self._eav(element, "NlmCategory"),
+            "Label": self._eavi(element, "Label"),
+            "NlmCategory": self._eavi(element, "NlmCategory"),
         }
 
         # Guard to ensure entries without any abstract text don't return dud
@@ -415,8 +838,8 @@ class ParserXmlPubmedArticle(ParserXmlBase):
             return {}
 
         publication_type = {
-            "PublicationType": self._et(element),
-            "UI": self._eav(element, "UI"),
+            "PublicationType": self._eti(element),
+            "UI": self._eavi(element, "UI"),
         }
 
         # Guard against elements with an empty `UI` attribute.
@@ -474,10 +897,12 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+
         databank = {
-            "DataBankName": self._et(element.find("DataBankName")),
+            "DataBankName": self._eti(children.get("DataBankName")),
             "AccessionNumberList": self.parse_accession_number_list(
-                element.find("AccessionNumberList")
+                children.get("AccessionNumberList")
             ),
         }
 
@@ -489,7 +914,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
             return {}
 
         databank_list = {
-            "CompleteYN": self._eav(element, "CompleteYN"),
+            "CompleteYN": self._eavi(element, "CompleteYN"),
             "DataBanks": [{
                 "DataBank": self.parse_databank(_element)
             } for _element in element.findall("DataBank")]
@@ -509,11 +934,13 @@ class ParserXmlPubmedArticle(ParserXmlBase):
         if element is None:
             return {}
 
+        children = self._ic(element)
+
         grant = {
-            "GrantID": self._et(element.find("GrantID")),
-            "Acronym": self._et(element.find("Acronym")),
-            "Agency": self._et(element.find("Agency")),
-            "Country": self._et(element.find("Country")),
+            "GrantID": self._et(children.get("GrantID")),
+            "Acronym": self._eti(children.get("Acronym")),
+            "Agency": self._eti(children.get("Agency")),
+            "Country": self._eti(children.get("Country")),
         }
 
         if grant["Acronym"] == "NULL":
@@ -530,7 +957,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
             return {}
 
         grant_list = {
-            "CompleteYN": self._eav(element, "CompleteYN"),
+            "CompleteYN": self._eavi(element, "CompleteYN"),
             "Grants": [{
                 "Grant": self.parse_grant(_element)
             } for _element in element.findall("Grant")]
@@ -542,32 +969,45 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         return grant_list
 
-    def parse_article(self, element):
+    def parse_article(self, element, sections=None):
 
         if element is None:
             return {}
 
+        children = self._ics(
+            element=element,
+            sections=(
+                None if sections is None
+                else sections | {"ArticleTitle", "ArticleDate"}
+            ),
+        )
+
         article = {
-            "PubModel": self._eav(element, "PubModel"),
+            "PubModel": self._eavi(element, "PubModel"),
             "Article": {
-                "Journal": self.parse_journal(element.find("Journal")),
-                "ArticleTitle": self._et(element.find("ArticleTitle")),
-                "Pagination": self.parse_pagination(element.find("Pagination")),
-                "Abstract": self.parse_abstract(element.find("Abstract")),
+                "Journal": self.parse_journal(children.get("Journal")),
+                "ArticleTitle": self._et(children.get("ArticleTitle")),
+                "Pagination": self.parse_pagination(
+                    children.get("Pagination")
+                ),
+                "Abstract": self.parse_abstract(children.get("Abstract")),
                 "AuthorList": self.parse_author_list(
-                    element.find("AuthorList")),
-                "Language": self._et(element.find("Language")),
+                    children.get("AuthorList")
+                ),
+                "Language": self._eti(children.get("Language")),
                 "DataBankList": self.parse_databank_list(
-                    element.find("DataBankList")
+                    children.get("DataBankList")
                 ),
                 "GrantList": self.parse_grant_list(
-                    element.find("GrantList")
+                    children.get("GrantList")
                 ),
                 "PublicationTypeList": self.parse_publication_type_list(
-                    element.find("PublicationTypeList")
+                    children.get("PublicationTypeList")
+                ),
+                "ArticleDate": self.parse_date_element(
+                    children.get("ArticleDate")
                 ),
-                "ArticleDate": parse_date_element(element.find("ArticleDate")),
-                "VernacularTitle": self._et(element.find("VernacularTitle")),
+                "VernacularTitle": self._et(children.get("VernacularTitle")),
             }
         }
 
@@ -577,39 +1017,59 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         return article
 
-    def parse_medline_citation(self, element):
+    def parse_medline_citation(self, element, sections=None):
+
+        children = self._ics(
+            element=element,
+            sections=(
+                None if sections is None
+                else sections | {
+                    "PMID",
+                    "DateCreated",
+                    "DateCompleted",
+                    "DateRevised",
+                    "Article",
+                }
+            ),
+        )
+        pmid = children.get("PMID")
 
         medline_citation = {
-            "Status": self._eav(element, "Status"),
-            "Owner": self._eav(element, "Owner"),
+            "Status": self._eavi(element, "Status"),
+            "Owner": self._eavi(element, "Owner"),
             "PMID": {
-                "PMID": self._et(element.find("PMID")),
-                "Version": self._eav(element.find("PMID"), "Version")
+                "PMID": self._et(pmid),
+                "Version": self._eavi(pmid, "Version")
             },
-            "DateCreated": parse_date_element(
-                date_element=element.find("DateCreated")
+            "DateCreated": self.parse_date_element(
+                date_element=children.get("DateCreated")
+            ),
+            "DateCompleted": self.parse_date_element(
+                date_element=children.get("DateCompleted")
             ),
-            "DateCompleted": parse_date_element(
-                date_element=element.find("DateCompleted")
+            "DateRevised": self.parse_date_element(
+                date_element=children.get("DateRevised")
             ),
-            "DateRevised": parse_date_element(
-                date_element=element.find("DateRevised")
+            "Article": self.parse_article(
+                element=children.get("Article"),
+                sections=sections,
             ),
-            "Article": self.parse_article(element.find("Article")),
             "MedlineJournalInfo": self.parse_medline_journal_info(
-                element.find("MedlineJournalInfo")
+                children.get("MedlineJournalInfo")
             ),
             "ChemicalList": self.parse_chemical_list(
-                element.find("ChemicalList")
+                children.get("ChemicalList")
             ),
             # The `<CitationSubset>` element is skipped.
             "MeshHeadingList": self.parse_mesh_heading_list(
-                element.find("MeshHeadingList")
+                children.get("MeshHeadingList")
             ),
             "KeywordList": self.parse_keyword_list(
-                element.find("KeywordList")
+                children.get("KeywordList")
             ),
-            "NumberOfReferences": self._et(element.find("NumberOfReferences"))
+            "NumberOfReferences": self._et(
+                children.get("NumberOfReferences")
+            )
         }
 
         # Guard against empty `Article` documents.
@@ -625,7 +1085,7 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         article_id = {
             "ArticleId": self._et(element),
-            "IdType": self._eav(element, "IdType"),
+            "IdType": self._eavi(element, "IdType"),
         }
 
         return article_id
@@ -643,32 +1103,160 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         return article_id_list
 
-    def parse_pubmed_data(self, element):
+    def parse_pubmed_data(self, element, sections=None):
 
         if element is None:
             return {}
 
+        if sections is None or "ArticleIdList" in sections:
+            article_id_list = element.find("ArticleIdList")
+        else:
+            article_id_list = None
+
         pubmed_data = {
             # The `<History>` element is skipped.
             # The `<PublicationStatus>` element is skipped.
-            "ArticleIdList": self.parse_article_id_list(
-                element.find("ArticleIdList")
-            )
+            "ArticleIdList": self.parse_article_id_list(article_id_list)
         }
 
         return pubmed_data
 
-    def parse_pubmed_article(self, element):
+    @staticmethod
+    def validate_sections(sections: Optional[Iterable[str]]):
+        """Validates the sections of a projection.
+
+        Args:
+            sections (Iterable[str]): The names of the `PubmedArticle` sections
+                to be parsed or `None` for all sections.
+
+        Returns:
+            Set[str]: The sections as a set or `None` for all sections.
+
+        Raises:
+            InvalidArguments: Raised when any of the sections isn't defined
+                under `pubmed_article_sections`.
+        """
+
+        if sections is None:
+            return None
+
+        sections = set(sections)
+        sections_unknown = sections - pubmed_article_sections
+        if sections_unknown:
+            msg = "Invalid sections {}. Expected any of {}."
+            msg_fmt = msg.format(
+                sorted(sections_unknown),
+                sorted(pubmed_article_sections),
+            )
+            raise InvalidArguments(msg_fmt)
+
+        return sections
+
+    def parse_header(self, element) -> Dict:
+        """Parses the cheap header fields of a `<PubmedArticle>` element,
+        i.e., the attributes of `<MedlineCitation>`, the `<PMID>`, and the
+        `<DateRevised>`, without touching any other subtrees.
+
+        Args:
+            element (etree.Element): The `<PubmedArticle>` element.
+
+        Returns:
+            dict: The header with the `PMID`, `Version`, `Status`, `Owner`, and
+                `DateRevised` date of the article.
+        """
+
+        medline_citation = element.find("MedlineCitation")
+        pmid = None
+        date_revised = None
+        if medline_citation is not None:
+            pmid = medline_citation.find("PMID")
+            date_revised = medline_citation.find("DateRevised")
+
+        header = {
+            "PMID": self._et(pmid),
+            "Version": self._eavi(pmid, "Version"),
+            "Status": self._eavi(medline_citation, "Status"),
+            "Owner": self._eavi(medline_citation, "Owner"),
+            "DateRevised": self.parse_date_element(date_revised)["Date"],
+        }
+
+        return header
+
+    @staticmethod
+    def get_header(pubmed_article: Dict) -> Dict:
+        """Retrieves the header of a parsed `PubmedArticle` document, i.e.,
+        the same fields the `parse_header` method parses out of the element.
+
+        Args:
+            pubmed_article (dict): The `PubmedArticle` document.
+
+        Returns:
+            dict: The header with the `PMID`, `Version`, `Status`, `Owner`, and
+                `DateRevised` date of the article.
+        """
+
+        medline_citation = pubmed_article["MedlineCitation"]
+
+        header = {
+            "PMID": medline_citation["PMID"]["PMID"],
+            "Version": medline_citation["PMID"]["Version"],
+            "Status": medline_citation["Status"],
+            "Owner": medline_citation["Owner"],
+            "DateRevised": medline_citation["DateRevised"]["Date"],
+        }
+
+        return header
+
+    def parse_delete_citation(self, element) -> Dict:
+        """Parses a `<DeleteCitation>` element into a `DeleteCitation`
+        document.
+
+        Args:
+            element (etree.Element): The `<DeleteCitation>` element.
+
+        Returns:
+            dict: The `DeleteCitation` document with the PMIDs of the
+                citations to delete.
+        """
+
+        delete_citation = {
+            "DeleteCitation": {
+                "PMIDs": [
+                    self._et(pmid) for pmid in element.findall("PMID")
+                ],
+            },
+        }
+
+        return delete_citation
+
+    def parse_pubmed_article(self, element, sections=None):
+        """Parses a `<PubmedArticle>` element into a `PubmedArticle` document.
+
+        Args:
+            element (etree.Element): The `<PubmedArticle>` element.
+            sections (Set[str], optional): The sections to parse as validated
+                by `validate_sections`. Sections that aren't requested are
+                skipped and get the values of missing elements. Defaults to
+                `None` in which case all sections are parsed.
+
+        Returns:
+            dict: The `PubmedArticle` document or an empty dictionary if the
+                article lacks a citation or title.
+        """
 
         if element is None:
             return {}
 
+        children = self._ic(element)
+
         pubmed_article = {
             "MedlineCitation": self.parse_medline_citation(
-                element.find("MedlineCitation")
+                element=children.get("MedlineCitation"),
+                sections=sections,
             ),
             "PubmedData": self.parse_pubmed_data(
-                element.find("PubmedData")
+                element=children.get("PubmedData"),
+                sections=sections,
             )
         }
 
@@ -678,23 +1266,392 @@ class ParserXmlPubmedArticle(ParserXmlBase):
 
         return pubmed_article
 
-    def parse(self, filename_xml):
+    def parse_pubmed_articles(
+        self,
+        elements: Iterable,
+        sections: Optional[Set[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+    ):
+        """Lazily parses `<PubmedArticle>` elements into `PubmedArticle`
+        documents skipping those rejected by the article filter.
+
+        The number of rejected articles is kept under `num_articles_skipped`.
+        Any `<DeleteCitation>` elements are parsed into `DeleteCitation`
+        documents through the `parse_delete_citation` method.
+
+        Args:
+            elements (Iterable): The `<PubmedArticle>` and `<DeleteCitation>`
+                elements.
+            sections (Set[str], optional): The sections to parse as validated
+                by `validate_sections`. Defaults to `None`.
+            article_filter (Callable[[Dict], bool], optional): A predicate
+                evaluated over the header of each article, as returned by the
+                `parse_header` method, before the article is parsed. Articles
+                for which it returns `False` are skipped. Defaults to `None`.
+
+        Yields:
+            dict: The parsed `PubmedArticle` and `DeleteCitation` documents.
+        """
+
+        self.num_articles_skipped = 0
+        if self.stats is not None:
+            self.stats.reset()
+
+        for element in elements:
+            if element.tag == "DeleteCitation":
+                yield self.parse_delete_citation(element=element)
+                continue
+
+            if article_filter is not None:
+                if not article_filter(self.parse_header(element)):
+                    self.num_articles_skipped += 1
+                    continue
+
+            pubmed_article = self.parse_pubmed_article(
+                element=element,
+                sections=sections,
+            )
+
+            # Guard against empty documents.
+            if not pubmed_article:
+                continue
+
+            yield pubmed_article
+
+        if article_filter is not None:
+            msg = "Skipped {} articles rejected by the article filter"
+            msg_fmt = msg.format(self.num_articles_skipped)
+            self.logger.info(msg_fmt)
+
+        if self.stats is not None:
+            msg = "Parser stats: {}"
+            msg_fmt = msg.format(self.stats.summary())
+            self.logger.info(msg_fmt)
+
+    def parse(
+        self,
+        filename_xml: str,
+        sections: Optional[Iterable[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+        do_yield_deletions: bool = False,
+    ):
+        """Parses a Pubmed XML file yielding `PubmedArticle` documents.
+
+        If caching is enabled, unprojected parses are served from the cache.
+        Entries hold the full unfiltered stream of the file, including any
+        `DeleteCitation` documents, so that the article filter and deletions
+        are applied as the documents are read back and any later parse, e.g.,
+        an incremental run, is served by the same entry.
+
+        Args:
+            filename_xml (str): The Pubmed XML file to parse.
+            sections (Iterable[str], optional): The sections to parse out of
+                those defined under `pubmed_article_sections`, e.g.,
+                `{"MeshHeadingList"}`. The subtrees of other sections are
+                skipped. Defaults to `None` in which case all sections are
+                parsed.
+            article_filter (Callable[[Dict], bool], optional): A predicate
+                evaluated over the header of each article, as returned by the
+                `parse_header` method, before the article is parsed, e.g.,
+                `IngesterDocumentPubmedArticle.is_ingestible`. Articles for
+                which it returns `False` are skipped and counted under
+                `num_articles_skipped`. Defaults to `None`.
+            do_yield_deletions (bool, optional): Whether to also yield a
+                `DeleteCitation` document, i.e.,
+                `{"DeleteCitation": {"PMIDs": [...]}}`, for every
+                `<DeleteCitation>` element of update files in the same pass
+                and in file order. Defaults to `False`.
+
+        Yields:
+            dict: The parsed `PubmedArticle` documents and, if requested, the
+                `DeleteCitation` documents.
+
+        Raises:
+            InvalidArguments: Raised when an unknown section is requested.
+        """
+
+        sections = self.validate_sections(sections=sections)
+
+        try:
+            # Projected parses aren't cached.
+            if self.cache is None or sections is not None:
+                yield from self.generate_pubmed_articles(
+                    filename_xml=filename_xml,
+                    sections=sections,
+                    article_filter=article_filter,
+                    do_yield_deletions=do_yield_deletions,
+                )
+            else:
+                pubmed_articles = self.cache.cached(
+                    filename_xml=filename_xml,
+                    documents=self.generate_pubmed_articles(
+                        filename_xml=filename_xml,
+                        do_yield_deletions=True,
+                    ),
+                )
+                yield from self.filter_pubmed_articles(
+                    pubmed_articles=pubmed_articles,
+                    article_filter=article_filter,
+                    do_yield_deletions=do_yield_deletions,
+                )
+        finally:
+            # Release the file if it was prefetched but never opened.
+            self.discard_prefetched_xml_file(filename_xml=filename_xml)
+
+    def filter_pubmed_articles(
+        self,
+        pubmed_articles: Iterable[Dict],
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+        do_yield_deletions: bool = False,
+    ):
+        """Lazily filters a stream of parsed `PubmedArticle` and
+        `DeleteCitation` documents, e.g., read back from the cache, as the
+        `parse_pubmed_articles` method filters elements.
+
+        The number of rejected articles is kept under `num_articles_skipped`.
+
+        Args:
+            pubmed_articles (Iterable[Dict]): The `PubmedArticle` and
+                `DeleteCitation` documents.
+            article_filter (Callable[[Dict], bool], optional): The article
+                filter as in the `parse` method evaluated over the header
+                returned by the `get_header` method. Defaults to `None`.
+            do_yield_deletions (bool, optional): Whether to yield the
+                `DeleteCitation` documents. Defaults to `False`.
+
+        Yields:
+            dict: The `PubmedArticle` documents accepted by the article filter
+                and, if requested, the `DeleteCitation` documents.
+        """
+
+        self.num_articles_skipped = 0
+
+        for pubmed_article in pubmed_articles:
+            if "DeleteCitation" in pubmed_article:
+                if do_yield_deletions:
+                    yield pubmed_article
+                continue
+
+            if article_filter is not None:
+                if not article_filter(self.get_header(pubmed_article)):
+                    self.num_articles_skipped += 1
+                    continue
+
+            yield pubmed_article
+
+        if article_filter is not None:
+            msg = "Skipped {} articles rejected by the article filter"
+            msg_fmt = msg.format(self.num_articles_skipped)
+            self.logger.info(msg_fmt)
+
+    def generate_pubmed_articles(
+        self,
+        filename_xml: str,
+        sections: Optional[Set[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+        do_yield_deletions: bool = False,
+    ):
+        """Lazily parses the `PubmedArticle` documents out of a Pubmed XML
+        file bypassing the cache.
+
+        Args:
+            filename_xml (str): The Pubmed XML file to parse.
+            sections (Set[str], optional): The sections to parse as validated
+                by `validate_sections`. Defaults to `None`.
+            article_filter (Callable[[Dict], bool], optional): The article
+                filter as in the `parse` method. Defaults to `None`.
+            do_yield_deletions (bool, optional): Whether to also yield
+                `DeleteCitation` documents as in the `parse` method. Defaults
+                to `False`.
+
+        Yields:
+            dict: The parsed `PubmedArticle` and `DeleteCitation` documents.
+        """
 
         msg_fmt = "Parsing Pubmed XML file '{0}'".format(filename_xml)
         self.logger.info(msg=msg_fmt)
 
         file_xml = self.open_xml_file(filename_xml=filename_xml)
 
+        if do_yield_deletions:
+            element_tag = ("PubmedArticle", "DeleteCitation")
+        else:
+            element_tag = "PubmedArticle"
+
         elements = self.generate_xml_elements(
             file_xml=file_xml,
-            element_tag="PubmedArticle"
+            element_tag=element_tag,
         )
 
-        for element in elements:
-            pubmed_article = self.parse_pubmed_article(element)
+        try:
+            yield from self.parse_pubmed_articles(
+                elements=elements,
+                sections=sections,
+                article_filter=article_filter,
+            )
+        finally:
+            file_xml.close()
 
-            # Guard against empty documents.
-            if not pubmed_article:
-                continue
+    def parse_batches(
+        self,
+        filename_xml: str,
+        batch_size: int = 1000,
+        sections: Optional[Iterable[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+    ):
+        """Parses a Pubmed XML file yielding column-oriented batches instead of
+        individual documents.
+
+        Args:
+            filename_xml (str): The Pubmed XML file to parse.
+            batch_size (int, optional): The maximum number of articles per
+                batch. Defaults to 1000.
+            sections (Iterable[str], optional): The sections to parse as in
+                the `parse` method. Defaults to `None`.
+            article_filter (Callable[[Dict], bool], optional): The article
+                filter as in the `parse` method. Defaults to `None`.
+
+        Yields:
+            Dict[str, Dict[str, List]]: The batches with one list per field per
+                entity type as defined under `batches.batch_columns`.
+        """
+
+        pubmed_articles = self.parse(
+            filename_xml=filename_xml,
+            sections=sections,
+            article_filter=article_filter,
+        )
+        for chunk in chunk_generator(pubmed_articles, chunk_size=batch_size):
+            batch = create_batch()
+            for pubmed_article in chunk:
+                append_pubmed_article(
+                    batch=batch,
+                    pubmed_article=pubmed_article,
+                )
 
-            yield pubmed_article
+            yield batch
+
+    def _merge_chunk_result(
+        self,
+        result: Tuple[List[dict], int, Optional[Dict[str, Dict]]],
+    ) -> List[dict]:
+        """Adds the skipped articles and parser statistics of a chunk parsed
+        in a `parse_parallel` worker process to those of this parser and
+        returns the chunk's documents."""
+
+        pubmed_articles, num_articles_skipped, stats = result
+
+        self.num_articles_skipped += num_articles_skipped
+        if self.stats is not None and stats is not None:
+            self.stats.update(stats)
+
+        return pubmed_articles
+
+    def get_worker_kwargs(self) -> Dict:
+        """Returns the constructor arguments worker processes create a parser
+        of their own out of, i.e., those of this parser without its cache or
+        prefetching.
+
+        Returns:
+            Dict: The constructor arguments of the parser class.
+        """
+
+        return {
+            "decompression_backend": self.decompression_backend,
+            "intern_max_size": self.intern_max_size,
+            "prefetch_max_size": 0,
+            "do_collect_stats": self.stats is not None,
+            "logger_level": self.logger.level,
+        }
+
+    def parse_parallel(
+        self,
+        filename_xml: str,
+        num_processes: Optional[int] = None,
+        chunk_size: int = 250,
+        sections: Optional[Iterable[str]] = None,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+    ):
+        """Parses a Pubmed XML file across multiple processes yielding the
+        same documents, in the same order, as the `parse` method.
+
+        The decompressed bytes are split at `<PubmedArticle>` boundaries into
+        chunks of `chunk_size` articles which are parsed by a pool of worker
+        processes. Only a bounded number of chunks is in flight at any time.
+
+        Args:
+            filename_xml (str): The Pubmed XML file to parse.
+            num_processes (int, optional): The number of worker processes.
+                Defaults to `None` in which case the number of CPUs is used.
+            chunk_size (int, optional): The number of articles per chunk.
+                Defaults to 250.
+            sections (Iterable[str], optional): The sections to parse as in
+                the `parse` method. Defaults to `None`.
+            article_filter (Callable[[Dict], bool], optional): The article
+                filter as in the `parse` method which must be picklable.
+                Defaults to `None`.
+
+        Yields:
+            dict: The parsed `PubmedArticle` documents.
+        """
+
+        sections = self.validate_sections(sections=sections)
+
+        msg_fmt = "Parsing Pubmed XML file '{0}' in parallel".format(
+            filename_xml
+        )
+        self.logger.info(msg=msg_fmt)
+
+        num_processes = num_processes or multiprocessing.cpu_count()
+
+        file_xml = self.open_xml_file(filename_xml=filename_xml)
+
+        chunks = self.generate_xml_chunks(
+            file_xml=file_xml,
+            element_tag="PubmedArticle",
+            num_elements=chunk_size,
+        )
+
+        # Workers create their own parser rather than receiving a copy of
+        # this one along with its cache and prefetched files.
+        pool = multiprocessing.Pool(
+            processes=num_processes,
+            initializer=init_parser_worker,
+            initargs=(type(self), self.get_worker_kwargs(), article_filter),
+        )
+
+        self.num_articles_skipped = 0
+        if self.stats is not None:
+            self.stats.reset()
+
+        try:
+            # Keep a bounded window of pending chunks and yield their results
+            # in submission order.
+            results_pending = collections.deque()
+            for chunk in chunks:
+                results_pending.append(
+                    pool.apply_async(parse_xml_chunk_worker, (chunk, sections))
+                )
+                if len(results_pending) >= 2 * num_processes:
+                    yield from self._merge_chunk_result(
+                        result=results_pending.popleft().get()
+                    )
+
+            while results_pending:
+                yield from self._merge_chunk_result(
+                    result=results_pending.popleft().get()
+                )
+
+            if article_filter is not None:
+                msg = "Skipped {} articles rejected by the article filter"
+                msg_fmt = msg.format(self.num_articles_skipped)
+                self.logger.info(msg_fmt)
+
+            if self.stats is not None:
+                msg = "Parser stats: {}"
+                msg_fmt = msg.format(self.stats.summary())
+                self.logger.info(msg_fmt)
+        finally:
+            pool.terminate()
+            pool.join()
+            file_xml.close()
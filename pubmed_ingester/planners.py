@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+""" Ingestion planning over sets of Pubmed XML files.
+
+This module contains the `PlannerLastWriter` class which performs a pre-pass
+over an ordered set of Pubmed XML files, e.g., the baseline followed by the
+update files, scanning only the article headers and `<DeleteCitation>`
+elements to work out which file holds the final version of every PMID. The
+main pass then ingests every PMID once out of that file instead of once per
+file it appears in.
+
+The plan is kept in a dense `array.array` indexed by PMID holding the index
+of the planning file, or `-1` for PMIDs without one, i.e., unknown PMIDs or
+PMIDs whose last occurrence is a deletion.
+"""
+
+import array
+import multiprocessing
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pubmed_ingester.loggers import create_logger
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+
+
+# Per-process parser and article filter of the pool processes created in
+# `PlannerLastWriter.plan`.
+scanner_parser = None  # type: ParserXmlPubmedArticle
+scanner_article_filter = None  # type: Optional[Callable[[Dict], bool]]
+
+
+def scan_file(
+    parser: ParserXmlPubmedArticle,
+    filename_xml: str,
+    article_filter: Optional[Callable[[Dict], bool]] = None,
+) -> Tuple[array.array, array.array]:
+    """Scans the article headers and `<DeleteCitation>` elements of a Pubmed
+    XML file without parsing the articles themselves or going through the
+    cache of the parser.
+
+    Args:
+        parser (ParserXmlPubmedArticle): The parser used to scan the file.
+        filename_xml (str): The Pubmed XML file to scan.
+        article_filter (Callable[[Dict], bool], optional): A predicate
+            evaluated over the article headers as in the
+            `ParserXmlPubmedArticle.parse` method. Articles for which it
+            returns `False` are left out. Defaults to `None`.
+
+    Returns:
+        Tuple[array.array, array.array]: The PMIDs of the articles and the
+            deleted PMIDs in file order.
+    """
+
+    pmids = array.array("I")
+    pmids_deleted = array.array("I")
+
+    def record_header(header: Dict) -> bool:
+        if header["PMID"] is not None:
+            if article_filter is None or article_filter(header):
+                pmids.append(int(header["PMID"]))
+
+        # Reject every article so that none of them is parsed.
+        return False
+
+    # Scan the file through `generate_pubmed_articles` rather than `parse` as
+    # the latter fully parses and caches every article when caching is
+    # enabled.
+    documents = parser.generate_pubmed_articles(
+        filename_xml=filename_xml,
+        article_filter=record_header,
+        do_yield_deletions=True,
+    )
+    # Only `DeleteCitation` documents make it through the filter.
+    for document in documents:
+        pmids_deleted.extend(
+            int(pmid) for pmid in document["DeleteCitation"]["PMIDs"]
+        )
+
+    return pmids, pmids_deleted
+
+
+def init_scanner_worker(
+    parser_class: Type[ParserXmlPubmedArticle],
+    parser_kwargs: Dict,
+    article_filter: Optional[Callable[[Dict], bool]] = None,
+):
+    """Initializes a pool process with a parser of its own, created out of the
+    class and constructor arguments of the planning parser, and the article
+    filter used to scan files."""
+
+    global scanner_parser
+    global scanner_article_filter
+
+    scanner_parser = parser_class(**parser_kwargs)
+    scanner_article_filter = article_filter
+
+
+def scan_file_worker(filename_xml: str) -> Tuple[array.array, array.array]:
+    """Scans a file in a pool process through the `scan_file` function."""
+
+    return scan_file(
+        parser=scanner_parser,
+        filename_xml=filename_xml,
+        article_filter=scanner_article_filter,
+    )
+
+
+class PlannerLastWriter(object):
+    # File index of PMIDs without a planning file.
+    file_index_none = -1
+
+    def __init__(self, filenames: List[str], **kwargs):
+        """Constructor and initialization.
+
+        Args:
+            filenames (List[str]): The Pubmed XML files in the order they're
+                published, i.e., where later files supersede earlier ones.
+        """
+
+        self.filenames = list(filenames)
+        self.file_indices = {
+            filename: file_index
+            for file_index, filename in enumerate(self.filenames)
+        }
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        # Use 2-byte file indices unless there are too many files.
+        typecode = "h" if len(self.filenames) < 2 ** 15 else "i"
+        self.plan_file_indices = array.array(typecode)
+
+    def _ensure_size(self, pmid: int):
+
+        size = len(self.plan_file_indices)
+        if pmid < size:
+            return
+
+        # Grow geometrically to keep the number of reallocations low.
+        size_new = max(pmid + 1, 2 * size, 1024)
+        self.plan_file_indices.extend(
+            array.array(
+                self.plan_file_indices.typecode,
+                [self.file_index_none],
+            ) * (size_new - size)
+        )
+
+    def record(
+        self,
+        file_index: int,
+        pmids: Iterable[int],
+        pmids_deleted: Iterable[int],
+    ):
+        """Records the articles and deletions of a file superseding those of
+        any previously recorded files.
+
+        Args:
+            file_index (int): The index of the file under `filenames`.
+            pmids (Iterable[int]): The PMIDs of the articles in the file.
+            pmids_deleted (Iterable[int]): The PMIDs deleted in the file which
+                per the Pubmed DTD follow all articles of the file.
+        """
+
+        plan_file_indices = self.plan_file_indices
+        for pmid in pmids:
+            self._ensure_size(pmid=pmid)
+            plan_file_indices[pmid] = file_index
+
+        for pmid in pmids_deleted:
+            if pmid < len(plan_file_indices):
+                plan_file_indices[pmid] = self.file_index_none
+
+    def plan(
+        self,
+        parser: ParserXmlPubmedArticle,
+        article_filter: Optional[Callable[[Dict], bool]] = None,
+        num_processes: int = 1,
+    ):
+        """Scans the files and records which file holds the final version of
+        every PMID.
+
+        Args:
+            parser (ParserXmlPubmedArticle): The parser used to scan the
+                files. Pool processes scan files with parsers of their own
+                created out of its class and `get_worker_kwargs` method.
+            article_filter (Callable[[Dict], bool], optional): A predicate
+                evaluated over the article headers, e.g.,
+                `IngesterDocumentPubmedArticle.is_ingestible`, so that only
+                articles that would be ingested are planned. Defaults to
+                `None`.
+            num_processes (int, optional): The number of processes scanning
+                files in parallel. Defaults to 1.
+        """
+
+        msg = "Planning the ingestion of {} files"
+        msg_fmt = msg.format(len(self.filenames))
+        self.logger.info(msg_fmt)
+
+        if num_processes <= 1:
+            scans = (
+                scan_file(
+                    parser=parser,
+                    filename_xml=filename,
+                    article_filter=article_filter,
+                )
+                for filename in self.filenames
+            )
+            self._record_scans(scans=scans)
+        else:
+            # The scans are recorded in file order as they complete.
+            with multiprocessing.Pool(
+                processes=num_processes,
+                initializer=init_scanner_worker,
+                initargs=(
+                    type(parser),
+                    parser.get_worker_kwargs(),
+                    article_filter,
+                ),
+            ) as pool:
+                self._record_scans(
+                    scans=pool.imap(scan_file_worker, self.filenames),
+                )
+
+    def _record_scans(self, scans: Iterable[Tuple[array.array, array.array]]):
+
+        num_articles = 0
+        for file_index, (pmids, pmids_deleted) in enumerate(scans):
+            num_articles += len(pmids)
+            self.record(
+                file_index=file_index,
+                pmids=pmids,
+                pmids_deleted=pmids_deleted,
+            )
+
+        msg = "Planned {} citations out of {} articles across {} files"
+        msg_fmt = msg.format(
+            len(self.plan_file_indices) -
+            self.plan_file_indices.count(self.file_index_none),
+            num_articles,
+            len(self.filenames),
+        )
+        self.logger.info(msg_fmt)
+
+    def get_file_index(self, pmid: int) -> Optional[int]:
+        """Retrieves the index of the file holding the final version of a
+        PMID.
+
+        Args:
+            pmid (int): The PMID.
+
+        Returns:
+            int: The index of the file under `filenames` or `None` if the PMID
+                has no planning file.
+        """
+
+        if pmid >= len(self.plan_file_indices):
+            return None
+
+        file_index = self.plan_file_indices[pmid]
+        if file_index == self.file_index_none:
+            return None
+
+        return file_index
+
+    def is_planned(self, header: Dict, filename: str) -> bool:
+        """Decides whether an article is the final version of its PMID so
+        that it can be combined with other predicates into the article filter
+        of the `ParserXmlPubmedArticle.parse` method.
+
+        Args:
+            header (Dict): The article header with the `PMID` as returned by
+                the `ParserXmlPubmedArticle.parse_header` method.
+            filename (str): The file the article is parsed from.
+
+        Returns:
+            bool: Whether the article is planned to be ingested out of
+                `filename`.
+        """
+
+        if header["PMID"] is None:
+            return False
+
+        file_index = self.get_file_index(pmid=int(header["PMID"]))
+
+        return file_index == self.file_indices[filename]
+
+    def filter_deletions(
+        self,
+        pmids: Iterable[str],
+        filename: str,
+    ) -> List[str]:
+        """Drops the deleted PMIDs re-added in later files so that files can
+        be ingested in any order.
+
+        Args:
+            pmids (Iterable[str]): The PMIDs deleted in `filename`.
+            filename (str): The file the deletions are parsed from.
+
+        Returns:
+            List[str]: The PMIDs whose deletion should be applied.
+        """
+
+        file_index_deletions = self.file_indices[filename]
+
+        pmids_filtered = []
+        for pmid in pmids:
+            file_index = self.get_file_index(pmid=int(pmid))
+            if file_index is None or file_index < file_index_deletions:
+                pmids_filtered.append(pmid)
+
+        return pmids_filtered
@@ -3,14 +3,34 @@
 
 """Main module."""
 
+import gc
 import os
+import time
 import argparse
+import multiprocessing
+from typing import Callable, Dict, List, Optional
 
 from fform.dals_pubmed import DalPubmed
 
+from pubmed_ingester.indices import IndexRevisions
 from pubmed_ingester.ingesters import IngesterDocumentPubmedArticle
+from pubmed_ingester.loaders import LoaderCopyPubmedArticle
+from pubmed_ingester.lookups import LookupMesh
 from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.parser_targets import ParserXmlPubmedArticleTarget
+from pubmed_ingester.planners import PlannerLastWriter
 from pubmed_ingester.config import import_config
+from pubmed_ingester.loggers import create_logger
+
+
+logger = create_logger(logger_name=__name__)
+
+# Per-process parser and ingester of the worker processes created in
+# `init_worker`.
+worker_parser = None  # type: ParserXmlPubmedArticle
+worker_ingester = None  # type: IngesterDocumentPubmedArticle
+worker_index_revisions = None  # type: Optional[IndexRevisions]
+worker_planner = None  # type: Optional[PlannerLastWriter]
 
 
 def load_config(args):
@@ -26,8 +46,8 @@ def load_config(args):
     return cfg
 
 
-def main(args):
-    cfg = load_config(args=args)
+def create_dal(cfg) -> DalPubmed:
+    """Creates a DAL with its own engine."""
 
     dal = DalPubmed(
         sql_username=cfg.sql_username,
@@ -36,14 +56,440 @@ def main(args):
         sql_port=cfg.sql_port,
         sql_db=cfg.sql_db,
     )
-    ingester = IngesterDocumentPubmedArticle(dal=dal)
 
-    parser = ParserXmlPubmedArticle()
-    for filename in args.filenames:
-        pubmed_articles = parser.parse(filename_xml=filename)
+    return dal
+
+
+def create_parser(cfg) -> ParserXmlPubmedArticle:
+    """Creates a parser of the configured engine."""
+
+    if cfg.get("parser_engine", "iterparse") == "target":
+        parser_class = ParserXmlPubmedArticleTarget
+    else:
+        parser_class = ParserXmlPubmedArticle
+
+    parser = parser_class(
+        decompression_backend=cfg.get("decompression_backend", "stdlib"),
+        cache_dir=cfg.get("cache_dir"),
+        do_collect_stats=cfg.get("parser_stats", False),
+        prefetch_max_size=cfg.get("prefetch_max_size") or 0,
+    )
+
+    return parser
+
+
+def create_lookup_mesh(cfg) -> LookupMesh:
+    """Creates a MeSH lookup loaded lazily which looks up the UIs found
+    missing from the database again after the configured TTL."""
+
+    return LookupMesh(
+        do_load_lazily=True,
+        missing_ttl=cfg.get("mesh_missing_ttl", 3600) or None,
+    )
+
+
+def create_parser_ingester(cfg, lookup_mesh: Optional[LookupMesh] = None):
+    """Creates a parser and an ingester with its own DAL (and engine) sharing
+    the MeSH lookup, if any, or with its own lookup loaded lazily on the first
+    batch of articles with MeSH headings or chemicals."""
+
+    dal = create_dal(cfg=cfg)
+    if lookup_mesh is None:
+        lookup_mesh = create_lookup_mesh(cfg=cfg)
+    if cfg.get("ingest_loader", "dal") == "copy":
+        ingester = LoaderCopyPubmedArticle(
+            dal=dal,
+            batch_size=cfg.get("ingest_batch_size") or 10000,
+            lookup_mesh=lookup_mesh,
+            identity_cache_size=cfg.get("identity_cache_size", 100000),
+        )
+    else:
+        ingester = IngesterDocumentPubmedArticle(
+            dal=dal,
+            batch_size=cfg.get("ingest_batch_size") or 1,
+            lookup_mesh=lookup_mesh,
+            identity_cache_size=cfg.get("identity_cache_size", 100000),
+            unit_of_work_size=cfg.get("unit_of_work_size") or 0,
+        )
+
+    parser = create_parser(cfg=cfg)
+
+    return parser, ingester
+
+
+def load_index_revisions(cfg) -> IndexRevisions:
+    """Loads the revision dates of the ingested citations through a
+    short-lived DAL whose engine is disposed of before any worker processes
+    are forked."""
+
+    dal = create_dal(cfg=cfg)
+    index_revisions = IndexRevisions()
+    try:
+        index_revisions.load_citations(dal=dal)
+    finally:
+        dal.engine.dispose()
+
+    return index_revisions
+
+
+def load_lookup_mesh(cfg) -> LookupMesh:
+    """Loads the IDs of the MeSH descriptors and qualifiers through a
+    short-lived DAL whose engine is disposed of before any worker processes
+    are forked."""
+
+    dal = create_dal(cfg=cfg)
+    lookup_mesh = create_lookup_mesh(cfg=cfg)
+    try:
+        lookup_mesh.load_mesh(dal=dal)
+    finally:
+        dal.engine.dispose()
+
+    return lookup_mesh
+
+
+def create_planner(cfg, filenames: List[str], workers: int):
+    """Plans which file the final version of every PMID is ingested out of
+    by scanning the article headers of all files."""
+
+    planner = PlannerLastWriter(filenames=filenames)
+    planner.plan(
+        parser=create_parser(cfg=cfg),
+        article_filter=IngesterDocumentPubmedArticle.is_ingestible,
+        num_processes=workers,
+    )
+
+    return planner
+
+
+def create_article_filter(
+    filename: str,
+    ingester: IngesterDocumentPubmedArticle,
+    index_revisions: Optional[IndexRevisions] = None,
+    planner: Optional[PlannerLastWriter] = None,
+) -> Callable[[Dict], bool]:
+    """Creates the article filter skipping articles that won't be ingested
+    and, in incremental mode, unchanged articles and, in dedupe mode,
+    articles superseded in other files."""
+
+    if index_revisions is None and planner is None:
+        return ingester.is_ingestible
+
+    def article_filter(header: Dict) -> bool:
+        if not ingester.is_ingestible(header=header):
+            return False
+        if planner is not None:
+            if not planner.is_planned(header=header, filename=filename):
+                return False
+        if index_revisions is not None:
+            if not index_revisions.is_revised(header=header):
+                return False
+
+        return True
+
+    return article_filter
+
+
+def ingest_documents(
+    documents: List[Dict],
+    ingester: IngesterDocumentPubmedArticle,
+    index_revisions: Optional[IndexRevisions] = None,
+) -> int:
+    """Ingests a batch of parsed articles, one by one through the `ingest`
+    method if the batch holds a single article and through the `ingest_many`
+    method otherwise, and returns the number of ingested articles. The index
+    of revision dates, if any, is kept up to date with the ingested
+    citations."""
+
+    if not documents:
+        return 0
+
+    if len(documents) == 1:
+        citation_ids = [ingester.ingest(document=documents[0])]
+    else:
+        citation_ids = ingester.ingest_many(documents=documents)
+
+    num_ingested = 0
+    for document, citation_id in zip(documents, citation_ids):
+        if citation_id is None:
+            continue
+
+        num_ingested += 1
+        if index_revisions is not None:
+            medline_citation = document["MedlineCitation"]
+            index_revisions.update(
+                pmid=int(medline_citation["PMID"]["PMID"]),
+                date_revised=medline_citation["DateRevised"]["Date"],
+            )
+
+    return num_ingested
+
+
+def ingest_file(
+    filename: str,
+    parser: ParserXmlPubmedArticle,
+    ingester: IngesterDocumentPubmedArticle,
+    index_revisions: Optional[IndexRevisions] = None,
+    planner: Optional[PlannerLastWriter] = None,
+) -> Dict:
+    """Parses and ingests a single Pubmed XML file.
+
+    Articles are ingested in batches of the ingester's `batch_size`. The
+    citations under any `<DeleteCitation>` elements of update files are
+    deleted in file order, i.e., after any preceding articles are ingested.
+
+    Args:
+        filename (str): The Pubmed XML file to ingest.
+        parser (ParserXmlPubmedArticle): The parser used to parse the file.
+        ingester (IngesterDocumentPubmedArticle): The ingester used to ingest
+            the parsed articles.
+        index_revisions (IndexRevisions, optional): The revision dates of the
+            ingested citations under which unchanged articles are skipped
+            before being parsed, i.e., incremental mode, and which is kept up
+            to date with the ingested and deleted citations. Defaults to
+            `None`.
+        planner (PlannerLastWriter, optional): The plan under which only the
+            final version of every PMID is ingested, i.e., dedupe mode, and
+            deletions of PMIDs re-added in later files are skipped. Defaults
+            to `None`.
+
+    Returns:
+        Dict: The per-file result with the number of parsed, skipped, and
+            ingested articles, the number of deleted citations, and the
+            duration in seconds.
+    """
+
+    start = time.time()
+
+    num_articles = 0
+    num_ingested = 0
+    num_deleted = 0
+    documents = []
+    # Skip articles that won't be ingested before they're parsed.
+    pubmed_articles = parser.parse(
+        filename_xml=filename,
+        article_filter=create_article_filter(
+            filename=filename,
+            ingester=ingester,
+            index_revisions=index_revisions,
+            planner=planner,
+        ),
+        do_yield_deletions=True,
+    )
+    for pubmed_article in pubmed_articles:
+        if "DeleteCitation" in pubmed_article:
+            # Ingest any pending articles first to keep the file order.
+            num_ingested += ingest_documents(
+                documents=documents,
+                ingester=ingester,
+                index_revisions=index_revisions,
+            )
+            documents = []
+
+            pmids = pubmed_article["DeleteCitation"]["PMIDs"]
+            if planner is not None:
+                pmids = planner.filter_deletions(pmids=pmids, filename=filename)
+            num_deleted += ingester.delete_citations(pmids=pmids)
+            if index_revisions is not None:
+                for pmid in pmids:
+                    index_revisions.remove(pmid=int(pmid))
+            continue
+
+        num_articles += 1
+        documents.append(pubmed_article)
+        if len(documents) >= ingester.batch_size:
+            num_ingested += ingest_documents(
+                documents=documents,
+                ingester=ingester,
+                index_revisions=index_revisions,
+            )
+            documents = []
+
+    num_ingested += ingest_documents(
+        documents=documents,
+        ingester=ingester,
+        index_revisions=index_revisions,
+    )
+
+    # Commit the articles of the last unit of work, if any.
+    ingester.commit()
+
+    ingester.log_cache_stats()
+
+    result = {
+        "filename": filename,
+        "num_articles": num_articles,
+        "num_skipped": parser.num_articles_skipped,
+        "num_ingested": num_ingested,
+        "num_deleted": num_deleted,
+        "duration": time.time() - start,
+        "error": None,
+    }
 
-        for pubmed_article in pubmed_articles:
-            ingester.ingest(document=pubmed_article)
+    return result
+
+
+def init_worker(
+    cfg,
+    index_revisions: Optional[IndexRevisions] = None,
+    planner: Optional[PlannerLastWriter] = None,
+    lookup_mesh: Optional[LookupMesh] = None,
+):
+    """Initializes a worker process with its own parser, DAL, and ingester.
+    The index of revision dates, the plan, and the MeSH lookup, if any, are
+    inherited from the parent process when forked."""
+
+    global worker_parser
+    global worker_ingester
+    global worker_index_revisions
+    global worker_planner
+
+    worker_parser, worker_ingester = create_parser_ingester(
+        cfg=cfg,
+        lookup_mesh=lookup_mesh,
+    )
+    worker_index_revisions = index_revisions
+    worker_planner = planner
+
+
+def ingest_file_worker(filename: str) -> Dict:
+    """Ingests a single file in a worker process reporting rather than raising
+    any errors so that a failing file doesn't bring down the pool."""
+
+    try:
+        result = ingest_file(
+            filename=filename,
+            parser=worker_parser,
+            ingester=worker_ingester,
+            index_revisions=worker_index_revisions,
+            planner=worker_planner,
+        )
+    except Exception as exc:
+        msg = "Ingestion of file '{}' failed."
+        msg_fmt = msg.format(filename)
+        logger.exception(msg_fmt)
+
+        # Discard the uncommitted articles of the file, if any, so that the
+        # ingester can be reused for the next file.
+        worker_ingester.rollback()
+
+        result = {
+            "filename": filename,
+            "num_articles": None,
+            "num_skipped": None,
+            "num_ingested": None,
+            "num_deleted": None,
+            "duration": None,
+            "error": repr(exc),
+        }
+
+    return result
+
+
+def log_result(result: Dict):
+
+    if result["error"]:
+        msg = "File '{}' failed with error {}."
+        msg_fmt = msg.format(result["filename"], result["error"])
+        logger.error(msg_fmt)
+    else:
+        msg = ("File '{}' done: {} articles parsed, {} skipped, {} ingested, "
+               "{} citations deleted in {:.1f}s.")
+        msg_fmt = msg.format(
+            result["filename"],
+            result["num_articles"],
+            result["num_skipped"],
+            result["num_ingested"],
+            result["num_deleted"],
+            result["duration"],
+        )
+        logger.info(msg_fmt)
+
+
+def main(args):
+    # Workers ingest files in no particular order so an article revised in a
+    # later update file could be overwritten by an older version. Without a
+    # plan every file would have to be ingested in order.
+    if args.workers > 1 and not args.dedupe:
+        msg_fmt = "Ingesting with more than one worker requires '--dedupe'."
+        raise ValueError(msg_fmt)
+
+    cfg = load_config(args=args)
+
+    # Units of work hold the locks on shared records, e.g., authors, upserted
+    # by many articles in no particular order until they're committed so the
+    # units of several workers could deadlock.
+    if args.workers > 1 and cfg.get("unit_of_work_size"):
+        msg_fmt = "Ingesting in units of work requires a single worker."
+        raise ValueError(msg_fmt)
+
+    # Load the revision dates of the ingested citations once so that
+    # unchanged articles can be skipped.
+    index_revisions = None
+    if args.incremental:
+        index_revisions = load_index_revisions(cfg=cfg)
+
+    # Plan the file each PMID is ingested out of so that it's ingested once.
+    planner = None
+    if args.dedupe:
+        planner = create_planner(
+            cfg=cfg,
+            filenames=args.filenames,
+            workers=args.workers,
+        )
+
+    results = []
+
+    # Ingest the files sequentially in this process.
+    if args.workers <= 1:
+        parser, ingester = create_parser_ingester(cfg=cfg)
+        for idx, filename in enumerate(args.filenames):
+            # Read the next file ahead while this one is ingested.
+            if parser.prefetch_max_size and idx + 1 < len(args.filenames):
+                parser.prefetch_xml_file(filename_xml=args.filenames[idx + 1])
+
+            result = ingest_file(
+                filename=filename,
+                parser=parser,
+                ingester=ingester,
+                index_revisions=index_revisions,
+                planner=planner,
+            )
+            log_result(result=result)
+            results.append(result)
+
+        return results
+
+    # Load the IDs of the MeSH descriptors and qualifiers once so that they're
+    # shared by all workers, and move all objects out of reach of the garbage
+    # collector so that its bookkeeping doesn't copy the pages holding them.
+    lookup_mesh = load_lookup_mesh(cfg=cfg)
+    gc.freeze()
+
+    # Ingest the files in a pool of worker processes each owning its own DAL
+    # and engine. Files are handed out one at a time off the pool's task queue
+    # so that workers are kept busy regardless of file sizes.
+    try:
+        with multiprocessing.Pool(
+            processes=args.workers,
+            initializer=init_worker,
+            initargs=(cfg, index_revisions, planner, lookup_mesh),
+        ) as pool:
+            for result in pool.imap_unordered(
+                ingest_file_worker,
+                args.filenames,
+                chunksize=1,
+            ):
+                log_result(result=result)
+                results.append(result)
+    finally:
+        gc.unfreeze()
+
+    num_failed = len([result for result in results if result["error"]])
+    msg = "Ingested {} files with {} workers ({} failed)."
+    msg_fmt = msg.format(len(results), args.workers, num_failed)
+    logger.info(msg_fmt)
+
+    return results
 
 
 # main sentinel
@@ -64,6 +510,31 @@ if __name__ == "__main__":
         help="configuration file",
         required=False
     )
+    argument_parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=1,
+        help=("number of worker processes ingesting files in parallel, "
+              "requires '--dedupe' when greater than 1"),
+        required=False
+    )
+    argument_parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help=("skip articles whose revision date matches the one of the "
+              "ingested citation"),
+        required=False
+    )
+    argument_parser.add_argument(
+        "--dedupe",
+        dest="dedupe",
+        action="store_true",
+        help=("scan all files up front and ingest every PMID only out of the "
+              "last file it appears in"),
+        required=False
+    )
     arguments = argument_parser.parse_args()
 
     main(args=arguments)
@@ -0,0 +1,770 @@
+# -*- coding: utf-8 -*-
+
+""" Compact record types for parsed Pubmed articles.
+
+This module contains an alternative document model for the `PubmedArticle`
+documents produced by the `ParserXmlPubmedArticle` class based on named-tuples
+instead of nested dictionaries, as well as the `from_document` and
+`to_document` functions converting between the two.
+
+The records drop the wrapper dictionaries and repeated keys of the documents
+and store the `Y`/`N` flags only in their raw form. Sections that are empty
+dictionaries in the documents are `None` in the records so that conversions
+are lossless in both directions.
+"""
+
+from typing import NamedTuple, Optional, Tuple, Union, Dict
+
+from pubmed_ingester.parser_utils import convert_yn_boolean
+
+
+class DateParts(NamedTuple):
+    year: Optional[Union[str, int]]
+    month: Optional[str]
+    day: Optional[str]
+    date: Optional[object]
+
+
+class ArticleId(NamedTuple):
+    article_id: Optional[str]
+    id_type: Optional[str]
+
+
+class PubmedData(NamedTuple):
+    article_ids: Optional[Tuple[ArticleId, ...]]
+
+
+class JournalInfo(NamedTuple):
+    country: Optional[str]
+    medline_ta: Optional[str]
+    nlm_unique_id: Optional[str]
+    issn_linking: Optional[str]
+
+
+class Chemical(NamedTuple):
+    registry_number: Optional[str]
+    ui: Optional[str]
+    name: Optional[str]
+
+
+class MeshEntry(NamedTuple):
+    name: Optional[str]
+    ui: Optional[str]
+    major_topic_yn: Optional[str]
+
+
+class MeshHeading(NamedTuple):
+    descriptor: Optional[MeshEntry]
+    qualifiers: Tuple[MeshEntry, ...]
+
+
+class Keyword(NamedTuple):
+    keyword: Optional[str]
+    major_topic_yn: Optional[str]
+
+
+class JournalIssue(NamedTuple):
+    cited_medium: Optional[str]
+    volume: Optional[str]
+    issue: Optional[str]
+    pub_date: DateParts
+
+
+class Journal(NamedTuple):
+    issn: Optional[str]
+    issn_type: Optional[str]
+    journal_issue: Optional[JournalIssue]
+    title: Optional[str]
+    iso_abbreviation: Optional[str]
+
+
+class Pagination(NamedTuple):
+    medline_pgn: Optional[str]
+
+
+class AbstractText(NamedTuple):
+    text: Optional[str]
+    label: Optional[str]
+    nlm_category: Optional[str]
+
+
+class AffiliationInfo(NamedTuple):
+    identifier: Optional[str]
+    identifier_source: Optional[str]
+    affiliations: Tuple[Optional[str], ...]
+
+
+class Author(NamedTuple):
+    valid_yn: Optional[str]
+    last_name: Optional[str]
+    fore_name: Optional[str]
+    initials: Optional[str]
+    suffix: Optional[str]
+    identifier: Optional[str]
+    identifier_source: Optional[str]
+    affiliation_info: Optional[AffiliationInfo]
+    email: Optional[str]
+
+
+class AuthorList(NamedTuple):
+    is_complete: Optional[bool]
+    authors: Tuple[Author, ...]
+
+
+class Databank(NamedTuple):
+    name: Optional[str]
+    accession_numbers: Optional[Tuple[Optional[str], ...]]
+
+
+class DatabankList(NamedTuple):
+    complete_yn: Optional[str]
+    databanks: Tuple[Databank, ...]
+
+
+class Grant(NamedTuple):
+    grant_id: Optional[str]
+    acronym: Optional[str]
+    agency: Optional[str]
+    country: Optional[str]
+
+
+class GrantList(NamedTuple):
+    complete_yn: Optional[str]
+    grants: Tuple[Grant, ...]
+
+
+class PublicationType(NamedTuple):
+    publication_type: Optional[str]
+    ui: Optional[str]
+
+
+class Article(NamedTuple):
+    pub_model: Optional[str]
+    journal: Optional[Journal]
+    title: Optional[str]
+    pagination: Optional[Pagination]
+    abstract: Optional[Tuple[Optional[AbstractText], ...]]
+    author_list: Optional[AuthorList]
+    language: Optional[str]
+    databank_list: Optional[DatabankList]
+    grant_list: Optional[GrantList]
+    publication_types: Optional[Tuple[PublicationType, ...]]
+    article_date: DateParts
+    title_vernacular: Optional[str]
+
+
+class Citation(NamedTuple):
+    status: Optional[str]
+    owner: Optional[str]
+    pmid: Optional[str]
+    version: Optional[str]
+    date_created: DateParts
+    date_completed: DateParts
+    date_revised: DateParts
+    article: Article
+    journal_info: Optional[JournalInfo]
+    chemicals: Optional[Tuple[Chemical, ...]]
+    mesh_headings: Optional[Tuple[MeshHeading, ...]]
+    keywords: Optional[Tuple[Keyword, ...]]
+    num_references: Optional[str]
+
+
+class PubmedArticle(NamedTuple):
+    citation: Citation
+    pubmed_data: Optional[PubmedData]
+
+
+def _date_from_document(document: Dict) -> DateParts:
+    return DateParts(
+        document["Year"],
+        document["Month"],
+        document["Day"],
+        document["Date"],
+    )
+
+
+def _date_to_document(record: DateParts) -> Dict:
+    return {
+        "Year": record.year,
+        "Month": record.month,
+        "Day": record.day,
+        "Date": record.date,
+    }
+
+
+def _mesh_entry_from_document(document: Dict, entry_name: str):
+    if not document:
+        return None
+
+    return MeshEntry(
+        document[entry_name],
+        document["UI"],
+        document["MajorTopicYN"],
+    )
+
+
+def _mesh_entry_to_document(record: MeshEntry, entry_name: str) -> Dict:
+    if record is None:
+        return {}
+
+    return {
+        entry_name: record.name,
+        "UI": record.ui,
+        "MajorTopicYN": record.major_topic_yn,
+        "IsMajorTopic": convert_yn_boolean(record.major_topic_yn),
+    }
+
+
+def _journal_from_document(document: Dict) -> Optional[Journal]:
+    if not document:
+        return None
+
+    document_issue = document["JournalIssue"]
+    if document_issue:
+        journal_issue = JournalIssue(
+            document_issue["CitedMedium"],
+            document_issue["JournalIssue"]["Volume"],
+            document_issue["JournalIssue"]["Issue"],
+            _date_from_document(document_issue["JournalIssue"]["PubDate"]),
+        )
+    else:
+        journal_issue = None
+
+    return Journal(
+        document["ISSN"]["ISSN"],
+        document["ISSN"]["IssnType"],
+        journal_issue,
+        document["Title"],
+        document["ISOAbbreviation"],
+    )
+
+
+def _journal_to_document(record: Optional[Journal]) -> Dict:
+    if record is None:
+        return {}
+
+    record_issue = record.journal_issue
+    if record_issue is not None:
+        journal_issue = {
+            "CitedMedium": record_issue.cited_medium,
+            "JournalIssue": {
+                "Volume": record_issue.volume,
+                "Issue": record_issue.issue,
+                "PubDate": _date_to_document(record_issue.pub_date),
+            }
+        }
+    else:
+        journal_issue = {}
+
+    return {
+        "ISSN": {
+            "ISSN": record.issn,
+            "IssnType": record.issn_type,
+        },
+        "JournalIssue": journal_issue,
+        "Title": record.title,
+        "ISOAbbreviation": record.iso_abbreviation,
+    }
+
+
+def _author_from_document(document: Dict) -> Author:
+    data = document["Author"]
+    document_affiliation_info = data["AffiliationInfo"]
+    if document_affiliation_info:
+        affiliation_info = AffiliationInfo(
+            document_affiliation_info["Identifier"]["Identifier"],
+            document_affiliation_info["Identifier"]["Source"],
+            tuple(
+                entry["Affiliation"]
+                for entry in document_affiliation_info["Affiliations"]
+            ),
+        )
+    else:
+        affiliation_info = None
+
+    return Author(
+        document["ValidYN"],
+        data["LastName"],
+        data["ForeName"],
+        data["Initials"],
+        data["Suffix"],
+        data["Identifier"]["Identifier"],
+        data["Identifier"]["Source"],
+        affiliation_info,
+        data["Email"],
+    )
+
+
+def _author_to_document(record: Author) -> Dict:
+    if record.affiliation_info is not None:
+        affiliation_info = {
+            "Identifier": {
+                "Source": record.affiliation_info.identifier_source,
+                "Identifier": record.affiliation_info.identifier,
+            },
+            "Affiliations": [
+                {"Affiliation": affiliation}
+                for affiliation in record.affiliation_info.affiliations
+            ],
+        }
+    else:
+        affiliation_info = {}
+
+    return {
+        "ValidYN": record.valid_yn,
+        "Author": {
+            "LastName": record.last_name,
+            "ForeName": record.fore_name,
+            "Initials": record.initials,
+            "Suffix": record.suffix,
+            "Identifier": {
+                "Source": record.identifier_source,
+                "Identifier": record.identifier,
+            },
+            "AffiliationInfo": affiliation_info,
+            "Email": record.email,
+        },
+        "IsValid": convert_yn_boolean(record.valid_yn),
+    }
+
+
+def _article_from_document(document: Dict) -> Article:
+    data = document["Article"]
+
+    document_abstract = data["Abstract"]
+    if document_abstract:
+        abstract = tuple(
+            AbstractText(
+                entry["AbstractText"]["AbstractText"],
+                entry["AbstractText"]["Label"],
+                entry["AbstractText"]["NlmCategory"],
+            ) if entry["AbstractText"] else None
+            for entry in document_abstract["AbstractTexts"]
+        )
+    else:
+        abstract = None
+
+    document_author_list = data["AuthorList"]
+    if document_author_list:
+        author_list = AuthorList(
+            document_author_list["CompleteYN"],
+            tuple(
+                _author_from_document(entry["Author"])
+                for entry in document_author_list["Authors"]
+            ),
+        )
+    else:
+        author_list = None
+
+    document_databank_list = data["DataBankList"]
+    if document_databank_list:
+        databank_list = DatabankList(
+            document_databank_list["CompleteYN"],
+            tuple(
+                Databank(
+                    entry["DataBank"]["DataBankName"],
+                    tuple(
+                        _entry["AccessionNumber"]["AccessionNumber"]
+                        for _entry in entry["DataBank"][
+                            "AccessionNumberList"
+                        ]["AccessionNumbers"]
+                    ) if entry["DataBank"]["AccessionNumberList"] else None,
+                )
+                for entry in document_databank_list["DataBanks"]
+            ),
+        )
+    else:
+        databank_list = None
+
+    document_grant_list = data["GrantList"]
+    if document_grant_list:
+        grant_list = GrantList(
+            document_grant_list["CompleteYN"],
+            tuple(
+                Grant(
+                    entry["Grant"]["GrantID"],
+                    entry["Grant"]["Acronym"],
+                    entry["Grant"]["Agency"],
+                    entry["Grant"]["Country"],
+                )
+                for entry in document_grant_list["Grants"]
+            ),
+        )
+    else:
+        grant_list = None
+
+    document_publication_type_list = data["PublicationTypeList"]
+    if document_publication_type_list:
+        publication_types = tuple(
+            PublicationType(
+                entry["PublicationType"]["PublicationType"],
+                entry["PublicationType"]["UI"],
+            )
+            for entry in document_publication_type_list["PublicationTypes"]
+        )
+    else:
+        publication_types = None
+
+    return Article(
+        document["PubModel"],
+        _journal_from_document(data["Journal"]),
+        data["ArticleTitle"],
+        (
+            Pagination(data["Pagination"]["MedlinePgn"])
+            if data["Pagination"] else None
+        ),
+        abstract,
+        author_list,
+        data["Language"],
+        databank_list,
+        grant_list,
+        publication_types,
+        _date_from_document(data["ArticleDate"]),
+        data["VernacularTitle"],
+    )
+
+
+def _article_to_document(record: Article) -> Dict:
+    if record.abstract is not None:
+        abstract = {
+            "AbstractTexts": [
+                {
+                    "AbstractText": {
+                        "AbstractText": entry.text,
+                        "Label": entry.label,
+                        "NlmCategory": entry.nlm_category,
+                    } if entry is not None else {}
+                }
+                for entry in record.abstract
+            ]
+        }
+    else:
+        abstract = {}
+
+    if record.author_list is not None:
+        author_list = {
+            "CompleteYN": record.author_list.is_complete,
+            "Authors": [
+                {"Author": _author_to_document(entry)}
+                for entry in record.author_list.authors
+            ],
+        }
+    else:
+        author_list = {}
+
+    if record.databank_list is not None:
+        databank_list = {
+            "CompleteYN": record.databank_list.complete_yn,
+            "DataBanks": [
+                {
+                    "DataBank": {
+                        "DataBankName": entry.name,
+                        "AccessionNumberList": {
+                            "AccessionNumbers": [
+                                {
+                                    "AccessionNumber": {
+                                        "AccessionNumber": accession_number
+                                    }
+                                }
+                                for accession_number in entry.accession_numbers
+                            ]
+                        } if entry.accession_numbers is not None else {},
+                    }
+                }
+                for entry in record.databank_list.databanks
+            ],
+            "IsComplete": convert_yn_boolean(record.databank_list.complete_yn),
+        }
+    else:
+        databank_list = {}
+
+    if record.grant_list is not None:
+        grant_list = {
+            "CompleteYN": record.grant_list.complete_yn,
+            "Grants": [
+                {
+                    "Grant": {
+                        "GrantID": entry.grant_id,
+                        "Acronym": entry.acronym,
+                        "Agency": entry.agency,
+                        "Country": entry.country,
+                    }
+                }
+                for entry in record.grant_list.grants
+            ],
+            "IsComplete": convert_yn_boolean(record.grant_list.complete_yn),
+        }
+    else:
+        grant_list = {}
+
+    if record.publication_types is not None:
+        publication_type_list = {
+            "PublicationTypes": [
+                {
+                    "PublicationType": {
+                        "PublicationType": entry.publication_type,
+                        "UI": entry.ui,
+                    }
+                }
+                for entry in record.publication_types
+            ]
+        }
+    else:
+        publication_type_list = {}
+
+    return {
+        "PubModel": record.pub_model,
+        "Article": {
+            "Journal": _journal_to_document(record.journal),
+            "ArticleTitle": record.title,
+            "Pagination": (
+                {"MedlinePgn": record.pagination.medline_pgn}
+                if record.pagination is not None else {}
+            ),
+            "Abstract": abstract,
+            "AuthorList": author_list,
+            "Language": record.language,
+            "DataBankList": databank_list,
+            "GrantList": grant_list,
+            "PublicationTypeList": publication_type_list,
+            "ArticleDate": _date_to_document(record.article_date),
+            "VernacularTitle": record.title_vernacular,
+        }
+    }
+
+
+def _citation_from_document(document: Dict) -> Citation:
+    document_journal_info = document["MedlineJournalInfo"]
+    if document_journal_info:
+        journal_info = JournalInfo(
+            document_journal_info["Country"],
+            document_journal_info["MedlineTA"],
+            document_journal_info["NlmUniqueID"],
+            document_journal_info["ISSNLinking"],
+        )
+    else:
+        journal_info = None
+
+    document_chemical_list = document["ChemicalList"]
+    if document_chemical_list:
+        chemicals = tuple(
+            Chemical(
+                entry["Chemical"]["RegistryNumber"],
+                entry["Chemical"]["NameOfSubstance"]["UI"],
+                entry["Chemical"]["NameOfSubstance"]["NameOfSubstance"],
+            )
+            for entry in document_chemical_list["Chemicals"]
+        )
+    else:
+        chemicals = None
+
+    document_mesh_heading_list = document["MeshHeadingList"]
+    if document_mesh_heading_list:
+        mesh_headings = tuple(
+            MeshHeading(
+                _mesh_entry_from_document(
+                    entry["MeshHeading"]["DescriptorName"], "DescriptorName"
+                ),
+                tuple(
+                    _mesh_entry_from_document(
+                        _entry["QualifierName"], "QualifierName"
+                    )
+                    for _entry in entry["MeshHeading"]["QualifierNames"]
+                ),
+            )
+            for entry in document_mesh_heading_list["MeshHeadings"]
+        )
+    else:
+        mesh_headings = None
+
+    document_keyword_list = document["KeywordList"]
+    if document_keyword_list:
+        keywords = tuple(
+            Keyword(
+                entry["Keyword"]["Keyword"],
+                entry["Keyword"]["MajorTopicYN"],
+            )
+            for entry in document_keyword_list["Keywords"]
+        )
+    else:
+        keywords = None
+
+    return Citation(
+        document["Status"],
+        document["Owner"],
+        document["PMID"]["PMID"],
+        document["PMID"]["Version"],
+        _date_from_document(document["DateCreated"]),
+        _date_from_document(document["DateCompleted"]),
+        _date_from_document(document["DateRevised"]),
+        _article_from_document(document["Article"]),
+        journal_info,
+        chemicals,
+        mesh_headings,
+        keywords,
+        document["NumberOfReferences"],
+    )
+
+
+def _citation_to_document(record: Citation) -> Dict:
+    if record.journal_info is not None:
+        journal_info = {
+            "Country": record.journal_info.country,
+            "MedlineTA": record.journal_info.medline_ta,
+            "NlmUniqueID": record.journal_info.nlm_unique_id,
+            "ISSNLinking": record.journal_info.issn_linking,
+        }
+    else:
+        journal_info = {}
+
+    if record.chemicals is not None:
+        chemical_list = {
+            "Chemicals": [
+                {
+                    "Chemical": {
+                        "RegistryNumber": entry.registry_number,
+                        "NameOfSubstance": {
+                            "UI": entry.ui,
+                            "NameOfSubstance": entry.name,
+                        },
+                    }
+                }
+                for entry in record.chemicals
+            ]
+        }
+    else:
+        chemical_list = {}
+
+    if record.mesh_headings is not None:
+        mesh_heading_list = {
+            "MeshHeadings": [
+                {
+                    "MeshHeading": {
+                        "DescriptorName": _mesh_entry_to_document(
+                            entry.descriptor, "DescriptorName"
+                        ),
+                        "QualifierNames": [
+                            {
+                                "QualifierName": _mesh_entry_to_document(
+                                    qualifier, "QualifierName"
+                                )
+                            }
+                            for qualifier in entry.qualifiers
+                        ]
+                    }
+                }
+                for entry in record.mesh_headings
+            ]
+        }
+    else:
+        mesh_heading_list = {}
+
+    if record.keywords is not None:
+        keyword_list = {
+            "Keywords": [
+                {
+                    "Keyword": {
+                        "Keyword": entry.keyword,
+                        "MajorTopicYN": entry.major_topic_yn,
+                        "IsMajorTopic": convert_yn_boolean(
+                            entry.major_topic_yn
+                        ),
+                    }
+                }
+                for entry in record.keywords
+            ]
+        }
+    else:
+        keyword_list = {}
+
+    return {
+        "Status": record.status,
+        "Owner": record.owner,
+        "PMID": {
+            "PMID": record.pmid,
+            "Version": record.version,
+        },
+        "DateCreated": _date_to_document(record.date_created),
+        "DateCompleted": _date_to_document(record.date_completed),
+        "DateRevised": _date_to_document(record.date_revised),
+        "Article": _article_to_document(record.article),
+        "MedlineJournalInfo": journal_info,
+        "ChemicalList": chemical_list,
+        "MeshHeadingList": mesh_heading_list,
+        "KeywordList": keyword_list,
+        "NumberOfReferences": record.num_references,
+    }
+
+
+def from_document(document: Dict) -> PubmedArticle:
+    """Converts a `PubmedArticle` document into a `PubmedArticle` record.
+
+    Args:
+        document (Dict): The `PubmedArticle` document as produced by the
+            `ParserXmlPubmedArticle` class.
+
+    Returns:
+        PubmedArticle: The equivalent record.
+    """
+
+    document_pubmed_data = document["PubmedData"]
+    if document_pubmed_data:
+        document_article_id_list = document_pubmed_data["ArticleIdList"]
+        if document_article_id_list:
+            article_ids = tuple(
+                ArticleId(
+                    entry["ArticleId"]["ArticleId"],
+                    entry["ArticleId"]["IdType"],
+                )
+                for entry in document_article_id_list["ArticleIds"]
+            )
+        else:
+            article_ids = None
+        pubmed_data = PubmedData(article_ids)
+    else:
+        pubmed_data = None
+
+    record = PubmedArticle(
+        _citation_from_document(document["MedlineCitation"]),
+        pubmed_data,
+    )
+
+    return record
+
+
+def to_document(record: PubmedArticle) -> Dict:
+    """Converts a `PubmedArticle` record into a `PubmedArticle` document.
+
+    Args:
+        record (PubmedArticle): The `PubmedArticle` record.
+
+    Returns:
+        Dict: The equivalent document as produced by the
+            `ParserXmlPubmedArticle` class.
+    """
+
+    if record.pubmed_data is not None:
+        if record.pubmed_data.article_ids is not None:
+            article_id_list = {
+                "ArticleIds": [
+                    {
+                        "ArticleId": {
+                            "ArticleId": entry.article_id,
+                            "IdType": entry.id_type,
+                        }
+                    }
+                    for entry in record.pubmed_data.article_ids
+                ]
+            }
+        else:
+            article_id_list = {}
+        pubmed_data = {"ArticleIdList": article_id_list}
+    else:
+        pubmed_data = {}
+
+    document = {
+        "MedlineCitation": _citation_to_document(record.citation),
+        "PubmedData": pubmed_data,
+    }
+
+    return document
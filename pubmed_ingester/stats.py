@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+""" Low-overhead timing statistics.
+
+This module contains the `StatsParser` class which accumulates the call counts
+and cumulative durations of the `parse_*` methods of the
+`ParserXmlPubmedArticle` class when instrumentation is enabled through its
+`do_collect_stats` argument.
+
+Durations are cumulative, i.e., as with the `cumtime` of `cProfile` the
+duration of a method includes the duration of the methods it calls, e.g.,
+`parse_author_list` includes `parse_author`.
+"""
+
+import time
+import collections
+from typing import Callable, Dict
+
+
+class StatsParser(object):
+    def __init__(self):
+        """Constructor and initialization."""
+
+        self.counts = collections.Counter()  # type: Dict[str, int]
+        self.durations = collections.Counter()  # type: Dict[str, float]
+
+    def reset(self):
+        """Clears the recorded statistics."""
+
+        self.counts.clear()
+        self.durations.clear()
+
+    def update(self, stats: Dict[str, Dict]):
+        """Adds statistics recorded elsewhere, e.g., in another process, to
+        the recorded statistics.
+
+        Args:
+            stats (Dict[str, Dict]): The statistics as returned by the
+                `as_dict` method.
+        """
+
+        for name, entry in stats.items():
+            self.counts[name] += entry["count"]
+            self.durations[name] += entry["duration"]
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Wraps a callable so that its calls are recorded under `name`.
+
+        Args:
+            name (str): The name the calls are recorded under.
+            func (Callable): The callable to wrap.
+
+        Returns:
+            Callable: The wrapped callable.
+        """
+
+        counts = self.counts
+        durations = self.durations
+        perf_counter = time.perf_counter
+
+        def wrapped(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                durations[name] += perf_counter() - start
+                counts[name] += 1
+
+        return wrapped
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Returns the recorded statistics.
+
+        Returns:
+            Dict[str, Dict]: The `count` and cumulative `duration` in seconds
+                of every recorded name.
+        """
+
+        return {
+            name: {
+                "count": self.counts[name],
+                "duration": self.durations[name],
+            }
+            for name in self.counts
+        }
+
+    def summary(self) -> str:
+        """Summarizes the recorded statistics in a single line ordered by
+        descending cumulative duration.
+
+        Returns:
+            str: The summary.
+        """
+
+        entries = []
+        for name, duration in self.durations.most_common():
+            count = self.counts[name]
+            entries.append("{} {} calls {:.3f}s ({:.1f}us/call)".format(
+                name, count, duration, 1e6 * duration / count
+            ))
+
+        return ", ".join(entries)
@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+
+""" Synthetic Pubmed XML files.
+
+This module contains the `GeneratorPubmedArticleSet` class which generates
+realistic `<PubmedArticleSet>` files of any size for benchmarking and testing
+without access to the Pubmed FTP server.
+
+Generation is deterministic, i.e., every article is generated off a random
+number generator seeded with the generator seed and the PMID, so that the same
+arguments always produce the same file. Low-cardinality values, e.g., journals,
+MeSH descriptors and qualifiers, grant agencies, and affiliations, are drawn
+out of fixed-size pools so that they recur across articles as they do in the
+Pubmed baseline.
+"""
+
+import gzip
+import random
+from typing import Iterable, Iterator, Optional
+
+from lxml import etree
+
+from pubmed_ingester.loggers import create_logger
+
+
+syllables = [
+    "ab", "ac", "al", "an", "ar", "ba", "be", "ca", "ce", "ci", "co", "da",
+    "de", "di", "do", "el", "en", "er", "es", "fa", "fe", "ga", "ge", "ha",
+    "he", "hi", "in", "io", "is", "ka", "la", "le", "li", "lo", "ma", "me",
+    "mi", "mo", "na", "ne", "ni", "no", "or", "os", "pa", "pe", "pi", "po",
+    "ra", "re", "ri", "ro", "sa", "se", "si", "so", "ta", "te", "ti", "to",
+    "tu", "ul", "um", "un", "ur", "va", "ve", "vi", "za", "ze",
+]
+
+countries = [
+    "United States", "United Kingdom", "Germany", "France", "Japan", "China",
+    "Italy", "Canada", "Australia", "Netherlands", "Spain", "Switzerland",
+]
+
+months = [
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct",
+    "Nov", "Dec",
+]
+
+publication_types = [
+    ("D016428", "Journal Article"),
+    ("D016454", "Review"),
+    ("D013485", "Research Support, Non-U.S. Gov't"),
+    ("D052061", "Research Support, N.I.H., Extramural"),
+    ("D003160", "Comparative Study"),
+    ("D016449", "Randomized Controlled Trial"),
+    ("D002363", "Case Reports"),
+]
+
+abstract_labels = [
+    ("BACKGROUND", "BACKGROUND"),
+    ("METHODS", "METHODS"),
+    ("RESULTS", "RESULTS"),
+    ("CONCLUSIONS", "CONCLUSIONS"),
+]
+
+
+class GeneratorPubmedArticleSet(object):
+    def __init__(
+        self,
+        seed: int = 0,
+        num_authors_max: int = 12,
+        num_affiliations_max: int = 2,
+        num_mesh_headings_mean: float = 10.0,
+        abstract_ratio: float = 0.8,
+        email_ratio: float = 0.2,
+        **kwargs
+    ):
+        """Constructor and initialization.
+
+        Args:
+            seed (int, optional): The seed of the generated articles. Defaults
+                to 0.
+            num_authors_max (int, optional): The maximum number of authors per
+                article with the number drawn uniformly from 1 up to it.
+                Defaults to 12.
+            num_affiliations_max (int, optional): The maximum number of
+                affiliations per author with the number drawn uniformly from 0
+                up to it. Defaults to 2.
+            num_mesh_headings_mean (float, optional): The mean number of MeSH
+                headings per article, i.e., the MeSH density. Defaults to 10.
+            abstract_ratio (float, optional): The ratio of articles with an
+                abstract. Defaults to 0.8.
+            email_ratio (float, optional): The ratio of affiliations ending in
+                an email address. Defaults to 0.2.
+        """
+
+        self.seed = seed
+        self.num_authors_max = num_authors_max
+        self.num_affiliations_max = num_affiliations_max
+        self.num_mesh_headings_mean = num_mesh_headings_mean
+        self.abstract_ratio = abstract_ratio
+        self.email_ratio = email_ratio
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        # Generate the value pools off their own generator so that they don't
+        # depend on the articles generated.
+        rng = random.Random(seed)
+        self.words = sorted(set(
+            self._generate_word(rng=rng) for _ in range(5000)
+        ))
+        self.journals = [
+            (
+                self._generate_title(rng=rng, num_words=rng.randint(1, 4)),
+                "{:04d}-{:04d}".format(rng.randint(0, 9999), idx),
+                "{:07d}".format(rng.randint(0, 9999999)),
+                rng.choice(countries),
+            )
+            for idx in range(2000)
+        ]
+        self.descriptors = [
+            (
+                "D{:06d}".format(idx),
+                self._generate_title(rng=rng, num_words=rng.randint(1, 3)),
+            )
+            for idx in range(1, 5001)
+        ]
+        self.qualifiers = [
+            ("Q{:06d}".format(idx), self._generate_word(rng=rng))
+            for idx in range(1, 81)
+        ]
+        self.affiliations = [
+            "{} of {}, {} University, {}.".format(
+                rng.choice(["Department", "Institute", "Laboratory"]),
+                self._generate_title(rng=rng, num_words=2),
+                self._generate_title(rng=rng, num_words=1),
+                rng.choice(countries),
+            )
+            for _ in range(3000)
+        ]
+        self.agencies = [
+            (
+                self._generate_title(rng=rng, num_words=2),
+                rng.choice(["NH", "CA", "GM", "AI", None]),
+                rng.choice(countries),
+            )
+            for _ in range(200)
+        ]
+        self.last_names = [
+            self._generate_word(rng=rng).title() for _ in range(20000)
+        ]
+        self.fore_names = [
+            self._generate_word(rng=rng).title() for _ in range(2000)
+        ]
+
+    @staticmethod
+    def _generate_word(rng: random.Random) -> str:
+        return "".join(
+            rng.choice(syllables) for _ in range(rng.randint(2, 4))
+        )
+
+    def _generate_title(self, rng: random.Random, num_words: int) -> str:
+        words = [rng.choice(self.words) for _ in range(num_words)]
+
+        return " ".join(words).title()
+
+    def _generate_sentence(self, rng: random.Random) -> str:
+        words = [rng.choice(self.words) for _ in range(rng.randint(8, 25))]
+
+        return " ".join(words).capitalize() + "."
+
+    @staticmethod
+    def _add_date(
+        parent: etree.Element,
+        tag: str,
+        rng: random.Random,
+        month_names: bool = False,
+    ) -> etree.Element:
+
+        element = etree.SubElement(parent, tag)
+        month = rng.randint(1, 12)
+        etree.SubElement(element, "Year").text = str(rng.randint(1975, 2019))
+        etree.SubElement(element, "Month").text = (
+            months[month - 1] if month_names else "{:02d}".format(month)
+        )
+        etree.SubElement(element, "Day").text = "{:02d}".format(
+            rng.randint(1, 28)
+        )
+
+        return element
+
+    def _add_author_list(self, parent: etree.Element, rng: random.Random):
+
+        author_list = etree.SubElement(parent, "AuthorList", CompleteYN="Y")
+        for _ in range(rng.randint(1, self.num_authors_max)):
+            author = etree.SubElement(author_list, "Author", ValidYN="Y")
+            fore_name = rng.choice(self.fore_names)
+            etree.SubElement(author, "LastName").text = rng.choice(
+                self.last_names
+            )
+            etree.SubElement(author, "ForeName").text = fore_name
+            etree.SubElement(author, "Initials").text = fore_name[0]
+            if rng.random() < 0.1:
+                etree.SubElement(
+                    author,
+                    "Identifier",
+                    Source="ORCID",
+                ).text = "https://orcid.org/0000-000{}-{:04d}-{:04d}".format(
+                    rng.randint(1, 3),
+                    rng.randint(0, 9999),
+                    rng.randint(0, 9999),
+                )
+            for _ in range(rng.randint(0, self.num_affiliations_max)):
+                affiliation = rng.choice(self.affiliations)
+                if rng.random() < self.email_ratio:
+                    affiliation = "{} Electronic address: {}@{}.edu.".format(
+                        affiliation[:-1],
+                        fore_name.lower(),
+                        rng.choice(self.words),
+                    )
+                affiliation_info = etree.SubElement(author, "AffiliationInfo")
+                etree.SubElement(
+                    affiliation_info,
+                    "Affiliation",
+                ).text = affiliation
+
+    def _add_abstract(self, parent: etree.Element, rng: random.Random):
+
+        abstract = etree.SubElement(parent, "Abstract")
+        # Structured abstracts have one labeled section per category.
+        if rng.random() < 0.5:
+            for label, category in abstract_labels:
+                abstract_text = etree.SubElement(
+                    abstract,
+                    "AbstractText",
+                    Label=label,
+                    NlmCategory=category,
+                )
+                abstract_text.text = " ".join(
+                    self._generate_sentence(rng=rng)
+                    for _ in range(rng.randint(1, 3))
+                )
+        else:
+            etree.SubElement(abstract, "AbstractText").text = " ".join(
+                self._generate_sentence(rng=rng)
+                for _ in range(rng.randint(4, 10))
+            )
+
+    def _add_mesh_heading_list(
+        self,
+        parent: etree.Element,
+        rng: random.Random,
+    ):
+
+        num_mesh_headings = min(
+            int(rng.expovariate(1.0 / self.num_mesh_headings_mean)),
+            4 * int(self.num_mesh_headings_mean) + 1,
+        )
+        if not num_mesh_headings:
+            return
+
+        mesh_heading_list = etree.SubElement(parent, "MeshHeadingList")
+        for ui, name in rng.sample(self.descriptors, num_mesh_headings):
+            mesh_heading = etree.SubElement(mesh_heading_list, "MeshHeading")
+            etree.SubElement(
+                mesh_heading,
+                "DescriptorName",
+                UI=ui,
+                MajorTopicYN=rng.choice("NNNY"),
+            ).text = name
+            for ui_qualifier, name_qualifier in rng.sample(
+                self.qualifiers,
+                rng.choice([0, 0, 1, 1, 2]),
+            ):
+                etree.SubElement(
+                    mesh_heading,
+                    "QualifierName",
+                    UI=ui_qualifier,
+                    MajorTopicYN=rng.choice("NNNY"),
+                ).text = name_qualifier
+
+    def generate_article(self, pmid: int) -> etree.Element:
+        """Generates a `<PubmedArticle>` element.
+
+        Args:
+            pmid (int): The PMID of the article which, along with the seed,
+                defines its contents.
+
+        Returns:
+            etree.Element: The `<PubmedArticle>` element.
+        """
+
+        rng = random.Random(self.seed * 1000003 + pmid)
+
+        pubmed_article = etree.Element("PubmedArticle")
+        medline_citation = etree.SubElement(
+            pubmed_article,
+            "MedlineCitation",
+            Status=rng.choice(["MEDLINE", "MEDLINE", "PubMed-not-MEDLINE"]),
+            Owner="NLM",
+        )
+        etree.SubElement(medline_citation, "PMID", Version="1").text = str(
+            pmid
+        )
+        self._add_date(medline_citation, "DateCompleted", rng=rng)
+        self._add_date(medline_citation, "DateRevised", rng=rng)
+
+        title, issn, nlm_unique_id, country = rng.choice(self.journals)
+        article = etree.SubElement(
+            medline_citation,
+            "Article",
+            PubModel=rng.choice(["Print", "Print-Electronic", "Electronic"]),
+        )
+        journal = etree.SubElement(article, "Journal")
+        etree.SubElement(journal, "ISSN", IssnType="Print").text = issn
+        journal_issue = etree.SubElement(
+            journal,
+            "JournalIssue",
+            CitedMedium="Print",
+        )
+        etree.SubElement(journal_issue, "Volume").text = str(
+            rng.randint(1, 300)
+        )
+        etree.SubElement(journal_issue, "Issue").text = str(rng.randint(1, 12))
+        if rng.random() < 0.05:
+            pub_date = etree.SubElement(journal_issue, "PubDate")
+            year = rng.randint(1975, 2018)
+            etree.SubElement(pub_date, "MedlineDate").text = "{}-{}".format(
+                year, year + 1
+            )
+        else:
+            self._add_date(journal_issue, "PubDate", rng=rng, month_names=True)
+        etree.SubElement(journal, "Title").text = title
+        etree.SubElement(journal, "ISOAbbreviation").text = title
+
+        etree.SubElement(article, "ArticleTitle").text = (
+            self._generate_sentence(rng=rng)
+        )
+        pagination = etree.SubElement(article, "Pagination")
+        page = rng.randint(1, 2000)
+        etree.SubElement(pagination, "MedlinePgn").text = "{}-{}".format(
+            page, page + rng.randint(1, 20)
+        )
+        if rng.random() < self.abstract_ratio:
+            self._add_abstract(article, rng=rng)
+        self._add_author_list(article, rng=rng)
+        etree.SubElement(article, "Language").text = "eng"
+        if rng.random() < 0.3:
+            grant_list = etree.SubElement(article, "GrantList", CompleteYN="Y")
+            for _ in range(rng.randint(1, 4)):
+                agency, acronym, country_grant = rng.choice(self.agencies)
+                grant = etree.SubElement(grant_list, "Grant")
+                etree.SubElement(grant, "GrantID").text = "{}{:06d}".format(
+                    acronym or "G", rng.randint(0, 999999)
+                )
+                if acronym:
+                    etree.SubElement(grant, "Acronym").text = acronym
+                etree.SubElement(grant, "Agency").text = agency
+                etree.SubElement(grant, "Country").text = country_grant
+        publication_type_list = etree.SubElement(
+            article,
+            "PublicationTypeList",
+        )
+        for ui, name in rng.sample(publication_types, rng.randint(1, 3)):
+            etree.SubElement(
+                publication_type_list,
+                "PublicationType",
+                UI=ui,
+            ).text = name
+
+        medline_journal_info = etree.SubElement(
+            medline_citation,
+            "MedlineJournalInfo",
+        )
+        etree.SubElement(medline_journal_info, "Country").text = country
+        etree.SubElement(medline_journal_info, "MedlineTA").text = title
+        etree.SubElement(
+            medline_journal_info,
+            "NlmUniqueID",
+        ).text = nlm_unique_id
+        etree.SubElement(medline_journal_info, "ISSNLinking").text = issn
+
+        if rng.random() < 0.3:
+            chemical_list = etree.SubElement(medline_citation, "ChemicalList")
+            for ui, name in rng.sample(self.descriptors, rng.randint(1, 5)):
+                chemical = etree.SubElement(chemical_list, "Chemical")
+                etree.SubElement(chemical, "RegistryNumber").text = "0"
+                etree.SubElement(
+                    chemical,
+                    "NameOfSubstance",
+                    UI=ui,
+                ).text = name
+
+        self._add_mesh_heading_list(medline_citation, rng=rng)
+
+        if rng.random() < 0.4:
+            keyword_list = etree.SubElement(
+                medline_citation,
+                "KeywordList",
+                Owner="NOTNLM",
+            )
+            for _ in range(rng.randint(1, 8)):
+                etree.SubElement(
+                    keyword_list,
+                    "Keyword",
+                    MajorTopicYN="N",
+                ).text = self._generate_title(rng=rng, num_words=2)
+
+        pubmed_data = etree.SubElement(pubmed_article, "PubmedData")
+        etree.SubElement(pubmed_data, "PublicationStatus").text = "ppublish"
+        article_id_list = etree.SubElement(pubmed_data, "ArticleIdList")
+        etree.SubElement(
+            article_id_list,
+            "ArticleId",
+            IdType="pubmed",
+        ).text = str(pmid)
+        etree.SubElement(
+            article_id_list,
+            "ArticleId",
+            IdType="doi",
+        ).text = "10.{}/{}.{}".format(
+            rng.randint(1000, 9999),
+            rng.choice(self.words),
+            pmid,
+        )
+
+        return pubmed_article
+
+    def generate_articles(
+        self,
+        num_articles: int,
+        pmid_start: int = 1,
+    ) -> Iterator[etree.Element]:
+        """Lazily generates `<PubmedArticle>` elements with consecutive
+        PMIDs.
+
+        Args:
+            num_articles (int): The number of articles to generate.
+            pmid_start (int, optional): The PMID of the first article.
+                Defaults to 1.
+
+        Yields:
+            etree.Element: The `<PubmedArticle>` elements.
+        """
+
+        for pmid in range(pmid_start, pmid_start + num_articles):
+            yield self.generate_article(pmid=pmid)
+
+    def write(
+        self,
+        filename: str,
+        num_articles: int,
+        pmid_start: int = 1,
+        pmids_deleted: Optional[Iterable[int]] = None,
+    ) -> str:
+        """Writes out a `<PubmedArticleSet>` file gzipping it if `filename`
+        ends in `.gz`.
+
+        Args:
+            filename (str): The file to write.
+            num_articles (int): The number of articles to generate.
+            pmid_start (int, optional): The PMID of the first article.
+                Defaults to 1.
+            pmids_deleted (Iterable[int], optional): The PMIDs listed under a
+                trailing `<DeleteCitation>` element as in update files.
+                Defaults to `None` in which case the element is omitted.
+
+        Returns:
+            str: The written filename.
+        """
+
+        msg = "Writing {} synthetic articles to '{}'"
+        msg_fmt = msg.format(num_articles, filename)
+        self.logger.info(msg_fmt)
+
+        if filename.endswith(".gz"):
+            # Favour speed over size as the files are only read back locally.
+            fout = gzip.open(filename, "wb", compresslevel=1)
+        else:
+            fout = open(filename, "wb")
+
+        with fout:
+            fout.write(b'<?xml version="1.0" encoding="utf-8"?>\n')
+            fout.write(b"<PubmedArticleSet>\n")
+            for element in self.generate_articles(
+                num_articles=num_articles,
+                pmid_start=pmid_start,
+            ):
+                fout.write(etree.tostring(element, encoding="utf-8"))
+                fout.write(b"\n")
+
+            if pmids_deleted:
+                delete_citation = etree.Element("DeleteCitation")
+                for pmid in pmids_deleted:
+                    etree.SubElement(
+                        delete_citation,
+                        "PMID",
+                        Version="1",
+                    ).text = str(pmid)
+                fout.write(etree.tostring(delete_citation, encoding="utf-8"))
+                fout.write(b"\n")
+
+            fout.write(b"</PubmedArticleSet>\n")
+
+        return filename
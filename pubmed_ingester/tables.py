@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+
+""" Specifications of the `fform` tables upserted through the DAL.
+
+This module maps the `iodi_*` and `biodi_*` methods of the `DalPubmed` class
+onto the tables they upsert and the columns their keyword arguments are
+stored under so that their rows can be written through set-based statements
+rather than one DAL call per record or parent record, e.g., by the
+`LoaderCopyPubmedArticle` class and the `ingest_many` method of the
+`IngesterDocumentPubmedArticle` class.
+
+Attributes:
+    entity_tables (Dict[str, SpecTable]): The entity tables by the DAL method
+        upserting them, in merge order.
+    link_tables (Dict[str, SpecTable]): The link tables by the DAL method
+        upserting them.
+"""
+
+import collections
+from typing import Any, Dict, List
+
+import sqlalchemy
+from fform.orm_pubmed import AbstractText
+from fform.orm_pubmed import AccessionNumber
+from fform.orm_pubmed import Affiliation
+from fform.orm_pubmed import Article
+from fform.orm_pubmed import ArticleAbstractText
+from fform.orm_pubmed import ArticleAuthorAffiliation
+from fform.orm_pubmed import ArticleDatabankAccessionNumber
+from fform.orm_pubmed import ArticleGrant
+from fform.orm_pubmed import ArticlePublicationType
+from fform.orm_pubmed import Author
+from fform.orm_pubmed import Citation
+from fform.orm_pubmed import CitationChemical
+from fform.orm_pubmed import CitationDescriptorQualifier
+from fform.orm_pubmed import CitationIdentifier
+from fform.orm_pubmed import CitationKeyword
+from fform.orm_pubmed import Databank
+from fform.orm_pubmed import Grant
+from fform.orm_pubmed import PmKeyword
+from fform.orm_pubmed import PublicationType
+
+
+# The specification of a table: the `name` of the table matching the
+# cache names of the `IngesterDocumentPubmedArticle` class, its ORM class, the
+# `key` column entity rows are merged on (`None` for link tables), the
+# `columns` the keyword arguments of the DAL method are stored under where
+# they're named differently, and the entity tables referenced by the
+# `references` columns.
+SpecTable = collections.namedtuple(
+    "SpecTable",
+    ["name", "orm_class", "key", "columns", "references"],
+)
+
+entity_tables = {
+    "iodi_article": SpecTable(
+        name="Article",
+        orm_class=Article,
+        key="md5",
+        columns={},
+        references={},
+    ),
+    "iodi_citation": SpecTable(
+        name="Citation",
+        orm_class=Citation,
+        key="pmid",
+        columns={},
+        references={"article_id": "Article"},
+    ),
+    "biodi_abstract_texts": SpecTable(
+        name="AbstractText",
+        orm_class=AbstractText,
+        key="md5",
+        columns={
+            "labels": "label",
+            "categories": "category",
+            "texts": "text",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_publication_types": SpecTable(
+        name="PublicationType",
+        orm_class=PublicationType,
+        key="uid",
+        columns={
+            "uids": "uid",
+            "publication_types": "publication_type",
+        },
+        references={},
+    ),
+    "biodi_keywords": SpecTable(
+        name="Keyword",
+        orm_class=PmKeyword,
+        key="md5",
+        columns={
+            "keywords": "keyword",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_grants": SpecTable(
+        name="Grant",
+        orm_class=Grant,
+        key="md5",
+        columns={
+            "uids": "uid",
+            "acronyms": "acronym",
+            "agencies": "agency",
+            "countries": "country",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_databanks": SpecTable(
+        name="Databank",
+        orm_class=Databank,
+        key="md5",
+        columns={
+            "databanks": "databank",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_accession_numbers": SpecTable(
+        name="AccessionNumber",
+        orm_class=AccessionNumber,
+        key="md5",
+        columns={
+            "accession_numbers": "accession_number",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_authors": SpecTable(
+        name="Author",
+        orm_class=Author,
+        key="md5",
+        columns={
+            "author_identifiers": "author_identifier",
+            "author_identifier_sources": "author_identifier_source",
+            "names_first": "name_first",
+            "names_last": "name_last",
+            "names_initials": "name_initials",
+            "names_suffix": "name_suffix",
+            "emails": "email",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+    "biodi_affiliations": SpecTable(
+        name="Affiliation",
+        orm_class=Affiliation,
+        key="md5",
+        columns={
+            "affiliation_identifiers": "affiliation_identifier",
+            "affiliation_identifier_sources": "affiliation_identifier_source",
+            "affiliations": "affiliation",
+            "affiliation_canonical_ids": "affiliation_canonical_id",
+            "md5s": "md5",
+        },
+        references={},
+    ),
+}
+
+link_tables = {
+    "biodi_article_abstract_texts": SpecTable(
+        name="ArticleAbstractText",
+        orm_class=ArticleAbstractText,
+        key=None,
+        columns={
+            "abstract_text_ids": "abstract_text_id",
+            "ordinances": "ordinance",
+        },
+        references={
+            "article_id": "Article",
+            "abstract_text_id": "AbstractText",
+        },
+    ),
+    "biodi_citation_chemicals": SpecTable(
+        name="CitationChemical",
+        orm_class=CitationChemical,
+        key=None,
+        columns={"chemical_ids": "chemical_id"},
+        references={"citation_id": "Citation"},
+    ),
+    "biodi_article_author_affiliations": SpecTable(
+        name="ArticleAuthorAffiliation",
+        orm_class=ArticleAuthorAffiliation,
+        key=None,
+        columns={
+            "author_ids": "author_id",
+            "affiliation_ids": "affiliation_id",
+            "affiliation_canonical_ids": "affiliation_canonical_id",
+            "ordinances": "ordinance",
+        },
+        references={
+            "article_id": "Article",
+            "author_id": "Author",
+            "affiliation_id": "Affiliation",
+        },
+    ),
+    "biodi_article_publication_types": SpecTable(
+        name="ArticlePublicationType",
+        orm_class=ArticlePublicationType,
+        key=None,
+        columns={"publication_type_ids": "publication_type_id"},
+        references={
+            "article_id": "Article",
+            "publication_type_id": "PublicationType",
+        },
+    ),
+    "biodi_citation_keywords": SpecTable(
+        name="CitationKeyword",
+        orm_class=CitationKeyword,
+        key=None,
+        columns={"keyword_ids": "keyword_id"},
+        references={
+            "citation_id": "Citation",
+            "keyword_id": "Keyword",
+        },
+    ),
+    "biodi_article_grants": SpecTable(
+        name="ArticleGrant",
+        orm_class=ArticleGrant,
+        key=None,
+        columns={"grant_ids": "grant_id"},
+        references={
+            "article_id": "Article",
+            "grant_id": "Grant",
+        },
+    ),
+    "biodi_citation_identifiers": SpecTable(
+        name="CitationIdentifier",
+        orm_class=CitationIdentifier,
+        key=None,
+        columns={
+            "identifier_types": "identifier_type",
+            "identifiers": "identifier",
+        },
+        references={"citation_id": "Citation"},
+    ),
+    "biodi_citation_descriptors_qualifiers": SpecTable(
+        name="CitationDescriptorQualifier",
+        orm_class=CitationDescriptorQualifier,
+        key=None,
+        columns={
+            "descriptor_ids": "descriptor_id",
+            "are_descriptors_major": "is_descriptor_major",
+            "qualifier_ids": "qualifier_id",
+            "are_qualifiers_major": "is_qualifier_major",
+        },
+        references={"citation_id": "Citation"},
+    ),
+    "biodi_article_databank_accession_numbers": SpecTable(
+        name="ArticleDatabankAccessionNumber",
+        orm_class=ArticleDatabankAccessionNumber,
+        key=None,
+        columns={"accession_number_ids": "accession_number_id"},
+        references={
+            "article_id": "Article",
+            "databank_id": "Databank",
+            "accession_number_id": "AccessionNumber",
+        },
+    ),
+}
+
+
+def to_rows(spec: SpecTable, **kwargs) -> List[Dict[str, Any]]:
+    """Converts the keyword arguments of a DAL method into rows, i.e., one row
+    of the scalar arguments if there are no list arguments or one row per
+    list element otherwise.
+
+    Args:
+        spec (SpecTable): The specification of the table the DAL method
+            upserts.
+        **kwargs: The keyword arguments of the DAL method.
+
+    Returns:
+        List[Dict[str, Any]]: The rows keyed by column name.
+    """
+
+    scalars = {}
+    lists = {}
+    for arg, value in kwargs.items():
+        column = spec.columns.get(arg, arg)
+        if isinstance(value, list):
+            lists[column] = value
+        else:
+            scalars[column] = value
+
+    if not lists:
+        return [scalars]
+
+    rows = []
+    for values in zip(*lists.values()):
+        row = dict(scalars)
+        row.update(zip(lists.keys(), values))
+        rows.append(row)
+
+    return rows
+
+
+def get_link_key(table: sqlalchemy.Table) -> List[str]:
+    """Returns the columns of the unique constraint link rows are upserted
+    on, e.g., the article, author, and affiliation of an
+    `article_author_affiliations` row, falling back to the primary key. The
+    other columns, e.g., `ordinance`, are updated on conflict.
+
+    Args:
+        table (sqlalchemy.Table): The link table.
+
+    Returns:
+        List[str]: The names of the key columns.
+    """
+
+    for constraint in table.constraints:
+        if isinstance(constraint, sqlalchemy.UniqueConstraint):
+            return [column.name for column in constraint.columns]
+
+    return [column.name for column in table.primary_key.columns]
+
+
+def dedupe_link_rows(
+    rows: List[Dict[str, Any]],
+    columns_key: List[str],
+) -> List[Dict[str, Any]]:
+    """Keeps the last of the link rows sharing a key, as with successive
+    upserts, so that a single `INSERT ... ON CONFLICT DO UPDATE` statement
+    doesn't affect a row twice. Rows with a `NULL` key column never conflict
+    and are all kept.
+
+    Args:
+        rows (List[Dict[str, Any]]): The link rows.
+        columns_key (List[str]): The key columns as returned by
+            `get_link_key`.
+
+    Returns:
+        List[Dict[str, Any]]: The deduplicated rows in order of their first
+            occurrence.
+    """
+
+    rows_deduped = collections.OrderedDict()
+    for position, row in enumerate(rows):
+        key = tuple(row.get(column) for column in columns_key)
+        if None in key:
+            key = position
+        if key in rows_deduped:
+            rows_deduped[key].update(row)
+        else:
+            rows_deduped[key] = dict(row)
+
+    return list(rows_deduped.values())
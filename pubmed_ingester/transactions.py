@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+""" Unit-of-work transactions spanning many articles.
+
+This module contains the `TransactionUnitOfWork` class which stands in for
+the DAL of the `IngesterDocumentPubmedArticle` class so that a configurable
+number of articles are ingested in a single session and transaction rather
+than every `iodi_*` and `biodi_*` call committing its own session scope.
+
+Every article, or batch of articles, is ingested within a savepoint of the
+unit's transaction so that a failing article is rolled back on its own
+without rolling back the other articles of the unit.
+"""
+
+import functools
+import contextlib
+from typing import Optional
+
+import sqlalchemy.orm
+from fform.dals_pubmed import DalPubmed
+
+from pubmed_ingester.loggers import create_logger
+
+
+class TransactionUnitOfWork(object):
+    def __init__(self, dal: DalPubmed, size: int = 1000, **kwargs):
+        """Constructor and initialization.
+
+        Args:
+            dal (DalPubmed): The DAL whose methods are called within the
+                session of the unit of work. Any other attributes are
+                delegated to it.
+            size (int, optional): The number of articles after which the unit
+                of work should be committed. Defaults to 1000.
+        """
+
+        self.dal = dal
+        self.size = max(1, size)
+
+        self.logger = create_logger(
+            logger_name=type(self).__name__,
+            logger_level=kwargs.get("logger_level", "DEBUG")
+        )
+
+        # The session scope of the open unit of work, if any, and its session.
+        self.stack = None  # type: Optional[contextlib.ExitStack]
+        self.session = None  # type: Optional[sqlalchemy.orm.Session]
+
+        # The number of articles ingested in the open unit of work.
+        self.num_pending = 0
+        self.num_commits = 0
+        self.num_rollbacks = 0
+
+    def __getattr__(self, name: str):
+
+        # Avoid recursing before the DAL is set, e.g., when unpickling.
+        if name == "dal":
+            raise AttributeError(name)
+
+        attr = getattr(self.dal, name)
+
+        # Call the DAL methods within the session of the open unit of work
+        # rather than their own session scope.
+        if self.session is not None and name.startswith(
+            ("iodi_", "biodi_", "get_")
+        ):
+            return functools.partial(attr, session=self.session)
+
+        return attr
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the open unit of work holds enough articles to be
+        committed."""
+
+        return self.num_pending >= self.size
+
+    @contextlib.contextmanager
+    def session_scope(self, **kwargs):
+        """Yields the session of the open unit of work, which is committed
+        along with the unit, or a new session scope of the DAL if no unit of
+        work is open."""
+
+        if self.session is None:
+            with self.dal.session_scope(**kwargs) as session:
+                yield session
+        else:
+            yield self.session
+
+    def begin(self):
+        """Opens a unit of work through a session scope of the DAL unless one
+        is already open."""
+
+        if self.session is not None:
+            return
+
+        stack = contextlib.ExitStack()
+        self.session = stack.enter_context(self.dal.session_scope())
+        self.stack = stack
+        self.num_pending = 0
+
+    @contextlib.contextmanager
+    def savepoint(self, num_articles: int = 1):
+        """Ingests articles within a savepoint of the unit of work, opening
+        one if needed, which is rolled back, without the rest of the unit, if
+        an error is raised.
+
+        Args:
+            num_articles (int, optional): The number of articles ingested
+                within the savepoint. Defaults to 1.
+        """
+
+        self.begin()
+
+        savepoint = self.session.begin_nested()
+        try:
+            yield self.session
+        except Exception:
+            savepoint.rollback()
+            self.num_rollbacks += 1
+            raise
+
+        savepoint.commit()
+        self.num_pending += num_articles
+
+    def commit(self):
+        """Commits the open unit of work, if any."""
+
+        if self.session is None:
+            return
+
+        stack = self.stack
+        num_pending = self.num_pending
+        self.stack = None
+        self.session = None
+        self.num_pending = 0
+
+        # Exiting the session scope commits it or rolls it back and raises.
+        stack.close()
+        self.num_commits += 1
+
+        msg = "Committed unit of work of {} articles"
+        msg_fmt = msg.format(num_pending)
+        self.logger.debug(msg_fmt)
+
+    def rollback(self):
+        """Rolls back the open unit of work, if any."""
+
+        if self.session is None:
+            return
+
+        stack = self.stack
+        session = self.session
+        num_pending = self.num_pending
+        self.stack = None
+        self.session = None
+        self.num_pending = 0
+
+        try:
+            session.rollback()
+        finally:
+            stack.close()
+
+        msg = "Rolled back unit of work of {} articles"
+        msg_fmt = msg.format(num_pending)
+        self.logger.warning(msg_fmt)
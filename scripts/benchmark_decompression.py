@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the decompression backends of the `decompressors` module against
+reading a gzipped file through a bare `gzip.GzipFile` as the parser used to.
+
+Usage:
+    python -m scripts.benchmark_decompression medline19n0001.xml.gz
+"""
+
+import gzip
+import time
+import argparse
+
+from pubmed_ingester.decompressors import open_gzip_file
+from pubmed_ingester.decompressors import decompression_backends
+from pubmed_ingester.excs import DecompressionBackendUnavailable
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+
+
+# The size of the reads `lxml.etree.iterparse` performs on file-like objects.
+read_size = 32768
+
+
+def consume(file_xml):
+    """Reads a file-like object to exhaustion and returns the bytes read."""
+
+    num_bytes = 0
+    while True:
+        chunk = file_xml.read(read_size)
+        if not chunk:
+            break
+        num_bytes += len(chunk)
+
+    file_xml.close()
+
+    return num_bytes
+
+
+def parse(file_xml):
+    """Parses a file-like object and returns the number of articles."""
+
+    parser = ParserXmlPubmedArticle(logger_level="WARNING")
+
+    elements = parser.generate_xml_elements(
+        file_xml=file_xml,
+        element_tag="PubmedArticle",
+    )
+
+    num_articles = 0
+    for element in elements:
+        parser.parse_pubmed_article(element)
+        num_articles += 1
+
+    file_xml.close()
+
+    return num_articles
+
+
+def benchmark(filename, func, num_repeats):
+
+    openers = [("gzip.GzipFile", lambda: gzip.GzipFile(filename, mode="rb"))]
+    for backend in decompression_backends:
+        openers.append((
+            backend,
+            lambda _backend=backend: open_gzip_file(filename, _backend),
+        ))
+
+    for name, opener in openers:
+        durations = []
+        for _ in range(num_repeats):
+            try:
+                file_xml = opener()
+            except DecompressionBackendUnavailable as exc:
+                print("{:<16} unavailable: {}".format(name, exc))
+                break
+            start = time.perf_counter()
+            result = func(file_xml)
+            durations.append(time.perf_counter() - start)
+
+        if durations:
+            print("{:<16} {:>10.3f}s (best of {}) {:>14}".format(
+                name, min(durations), len(durations), result
+            ))
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description="Benchmarks the decompression backends."
+    )
+    argument_parser.add_argument(
+        "filename",
+        help="Gzipped Pubmed XML file to decompress.",
+    )
+    argument_parser.add_argument(
+        "--parse",
+        dest="do_parse",
+        action="store_true",
+        help="Time the full parsing instead of the decompression only.",
+    )
+    argument_parser.add_argument(
+        "--repeats",
+        dest="num_repeats",
+        type=int,
+        default=3,
+        help="Number of repetitions per backend.",
+    )
+    arguments = argument_parser.parse_args()
+
+    benchmark(
+        filename=arguments.filename,
+        func=parse if arguments.do_parse else consume,
+        num_repeats=arguments.num_repeats,
+    )
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""Compares the memory held by parsed Pubmed articles buffered as documents
+with and without interning low-cardinality values through the parser's
+intern table.
+
+Usage:
+    python -m scripts.benchmark_interning medline19n0001.xml.gz
+"""
+
+import argparse
+import itertools
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from scripts.benchmark_records import measure
+
+
+def main(args):
+
+    sizes = []
+    for name, intern_max_size in [
+        ("plain", 0),
+        ("interned", args.intern_max_size),
+    ]:
+        parser = ParserXmlPubmedArticle(
+            intern_max_size=intern_max_size,
+            logger_level="WARNING",
+        )
+
+        def load_documents():
+            return list(
+                itertools.islice(
+                    parser.parse(filename_xml=args.filename),
+                    args.num_articles,
+                )
+            )
+
+        documents, size = measure(load_documents)
+        num_articles = len(documents)
+        del documents
+
+        # The intern table itself is retained by the parser and thus counted.
+        sizes.append(size)
+        print("{:<12} {:>8} articles {:>10.1f} MiB {:>8.0f} B/article".format(
+            name, num_articles, size / 2 ** 20, size / num_articles
+        ))
+
+    print("{:<12} {:>8.1f} MiB per 10k articles ({:.1f}%)".format(
+        "saved",
+        (sizes[0] - sizes[1]) / num_articles * 10000 / 2 ** 20,
+        100.0 * (1 - sizes[1] / sizes[0]),
+    ))
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description=(
+            "Compares the memory of parsed Pubmed articles with and without "
+            "interning."
+        )
+    )
+    argument_parser.add_argument(
+        "filename",
+        help="Pubmed XML file to parse.",
+    )
+    argument_parser.add_argument(
+        "--num-articles",
+        dest="num_articles",
+        type=int,
+        default=10000,
+        help="Number of articles buffered in memory.",
+    )
+    argument_parser.add_argument(
+        "--intern-max-size",
+        dest="intern_max_size",
+        type=int,
+        default=100000,
+        help="Maximum size of the intern table.",
+    )
+    arguments = argument_parser.parse_args()
+
+    main(args=arguments)
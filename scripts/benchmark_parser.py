@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the throughput of the `ParserXmlPubmedArticle` class in
+articles-per-second.
+
+Two figures are reported for the engine selected through `--engine`, i.e.,
+the `etree.iterparse` based `ParserXmlPubmedArticle` class or the parser-target
+based `ParserXmlPubmedArticleTarget` class:
+- `parse`: The end-to-end throughput of the `parse` method including the
+    decompression and XML tokenization.
+- `parse_pubmed_article`: The throughput of the `parse_pubmed_article` method
+    alone over elements preloaded into memory.
+
+Usage:
+    python -m scripts.benchmark_parser medline19n0001.xml.gz
+    python -m scripts.benchmark_parser medline19n0001.xml.gz \
+        --sections MeshHeadingList
+    python -m scripts.benchmark_parser medline19n0001.xml.gz --engine target
+"""
+
+import copy
+import time
+import argparse
+import itertools
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.parser_targets import ParserXmlPubmedArticleTarget
+from pubmed_ingester.parser_targets import pubmed_article_tags
+
+
+def benchmark_parse(parser, filename, num_repeats, sections=None):
+
+    durations = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        num_articles = 0
+        for _ in parser.parse(filename_xml=filename, sections=sections):
+            num_articles += 1
+        durations.append(time.perf_counter() - start)
+
+    return num_articles, min(durations)
+
+
+def benchmark_parse_pubmed_article(
+    parser,
+    filename,
+    num_articles,
+    num_repeats,
+    sections=None,
+):
+
+    # Preload the elements making sure they aren't cleared by the generator.
+    file_xml = parser.open_xml_file(filename_xml=filename)
+    if isinstance(parser, ParserXmlPubmedArticleTarget):
+        elements = list(itertools.islice(
+            parser.generate_xml_elements_lite(
+                file_xml=file_xml,
+                element_tag="PubmedArticle",
+                tags=pubmed_article_tags,
+            ),
+            num_articles,
+        ))
+    else:
+        elements = [
+            copy.deepcopy(element) for element in itertools.islice(
+                parser.generate_xml_elements(
+                    file_xml=file_xml,
+                    element_tag="PubmedArticle",
+                ),
+                num_articles,
+            )
+        ]
+    file_xml.close()
+
+    durations = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        for element in elements:
+            parser.parse_pubmed_article(element=element, sections=sections)
+        durations.append(time.perf_counter() - start)
+
+    return len(elements), min(durations)
+
+
+def main(args):
+
+    if args.engine == "target":
+        parser = ParserXmlPubmedArticleTarget(logger_level="WARNING")
+    else:
+        parser = ParserXmlPubmedArticle(logger_level="WARNING")
+    sections = parser.validate_sections(sections=args.sections)
+
+    num_articles, duration = benchmark_parse(
+        parser=parser,
+        filename=args.filename,
+        num_repeats=args.num_repeats,
+        sections=sections,
+    )
+    print("{:<24} {:>8} articles {:>8.3f}s {:>10.0f} articles/s".format(
+        "parse", num_articles, duration, num_articles / duration
+    ))
+
+    num_articles, duration = benchmark_parse_pubmed_article(
+        parser=parser,
+        filename=args.filename,
+        num_articles=args.num_articles,
+        num_repeats=args.num_repeats,
+        sections=sections,
+    )
+    print("{:<24} {:>8} articles {:>8.3f}s {:>10.0f} articles/s".format(
+        "parse_pubmed_article", num_articles, duration, num_articles / duration
+    ))
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description="Benchmarks the Pubmed XML parser throughput."
+    )
+    argument_parser.add_argument(
+        "filename",
+        help="Pubmed XML file to parse.",
+    )
+    argument_parser.add_argument(
+        "--num-articles",
+        dest="num_articles",
+        type=int,
+        default=5000,
+        help="Number of articles preloaded for `parse_pubmed_article`.",
+    )
+    argument_parser.add_argument(
+        "--repeats",
+        dest="num_repeats",
+        type=int,
+        default=3,
+        help="Number of repetitions per benchmark.",
+    )
+    argument_parser.add_argument(
+        "--engine",
+        dest="engine",
+        choices=["iterparse", "target"],
+        default="iterparse",
+        help="Parser engine to benchmark.",
+    )
+    argument_parser.add_argument(
+        "--sections",
+        dest="sections",
+        nargs="+",
+        default=None,
+        help="Sections to project the parsing to (defaults to all).",
+    )
+    arguments = argument_parser.parse_args()
+
+    main(args=arguments)
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""Compares the memory held by parsed Pubmed articles buffered as `dict`
+documents against the same articles buffered as the named-tuple records of
+the `records` module.
+
+Memory is measured through `tracemalloc` and includes the strings which are
+shared between a document and its record.
+
+Usage:
+    python -m scripts.benchmark_records medline19n0001.xml.gz
+"""
+
+import gc
+import argparse
+import itertools
+import tracemalloc
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.records import from_document
+
+
+def measure(func):
+    """Returns the result of calling `func` and the traced memory it retains
+    in bytes."""
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, size
+
+
+def main(args):
+
+    parser = ParserXmlPubmedArticle(logger_level="WARNING")
+
+    def load_documents():
+        return list(
+            itertools.islice(
+                parser.parse(filename_xml=args.filename),
+                args.num_articles,
+            )
+        )
+
+    def load_records():
+        return [
+            from_document(document=document)
+            for document in itertools.islice(
+                parser.parse(filename_xml=args.filename),
+                args.num_articles,
+            )
+        ]
+
+    documents, size_documents = measure(load_documents)
+    num_articles = len(documents)
+    del documents
+
+    records, size_records = measure(load_records)
+    del records
+
+    for name, size in [
+        ("documents", size_documents),
+        ("records", size_records),
+    ]:
+        print("{:<12} {:>8} articles {:>10.1f} MiB {:>8.0f} B/article".format(
+            name, num_articles, size / 2 ** 20, size / num_articles
+        ))
+    print("{:<12} {:>26.1f}%".format(
+        "saved", 100.0 * (1 - size_records / size_documents)
+    ))
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description=(
+            "Compares the memory of parsed Pubmed articles as documents and "
+            "records."
+        )
+    )
+    argument_parser.add_argument(
+        "filename",
+        help="Pubmed XML file to parse.",
+    )
+    argument_parser.add_argument(
+        "--num-articles",
+        dest="num_articles",
+        type=int,
+        default=10000,
+        help="Number of articles buffered in memory.",
+    )
+    arguments = argument_parser.parse_args()
+
+    main(args=arguments)
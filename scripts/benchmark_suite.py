@@ -0,0 +1,348 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the parser offline over a synthetic Pubmed XML file generated
+through the `GeneratorPubmedArticleSet` class.
+
+Two tables are reported for the engine selected through `--engine`:
+- `parse`: The end-to-end throughput in articles-per-second and the peak
+    resident memory of the `parse` method over the full file, once parsing all
+    sections and once per section projected through the `sections` argument.
+    Every run takes place in a fresh process so that peak memory isn't
+    inherited from earlier runs.
+- `parse_*`: The throughput of the `parse_pubmed_article` method and the
+    `parse_*` method of every section alone over elements preloaded into
+    memory.
+
+Usage:
+    python -m scripts.benchmark_suite
+    python -m scripts.benchmark_suite --num-articles 100000 --engine target
+    python -m scripts.benchmark_suite --plain --num-mesh-headings 20
+"""
+
+import os
+import copy
+import time
+import argparse
+import resource
+import tempfile
+import itertools
+import multiprocessing
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.parsers import pubmed_article_sections
+from pubmed_ingester.parser_targets import ParserXmlPubmedArticleTarget
+from pubmed_ingester.parser_targets import pubmed_article_tags
+from pubmed_ingester.synthetic import GeneratorPubmedArticleSet
+
+
+# The `parse_*` method of every section and the path of its element under the
+# `<PubmedArticle>` element.
+section_methods = {
+    "MedlineJournalInfo": (
+        "parse_medline_journal_info",
+        ["MedlineCitation", "MedlineJournalInfo"],
+    ),
+    "ChemicalList": (
+        "parse_chemical_list",
+        ["MedlineCitation", "ChemicalList"],
+    ),
+    "MeshHeadingList": (
+        "parse_mesh_heading_list",
+        ["MedlineCitation", "MeshHeadingList"],
+    ),
+    "KeywordList": (
+        "parse_keyword_list",
+        ["MedlineCitation", "KeywordList"],
+    ),
+    "Journal": (
+        "parse_journal",
+        ["MedlineCitation", "Article", "Journal"],
+    ),
+    "Pagination": (
+        "parse_pagination",
+        ["MedlineCitation", "Article", "Pagination"],
+    ),
+    "Abstract": (
+        "parse_abstract",
+        ["MedlineCitation", "Article", "Abstract"],
+    ),
+    "AuthorList": (
+        "parse_author_list",
+        ["MedlineCitation", "Article", "AuthorList"],
+    ),
+    "DataBankList": (
+        "parse_databank_list",
+        ["MedlineCitation", "Article", "DataBankList"],
+    ),
+    "GrantList": (
+        "parse_grant_list",
+        ["MedlineCitation", "Article", "GrantList"],
+    ),
+    "PublicationTypeList": (
+        "parse_publication_type_list",
+        ["MedlineCitation", "Article", "PublicationTypeList"],
+    ),
+    "ArticleIdList": (
+        "parse_article_id_list",
+        ["PubmedData", "ArticleIdList"],
+    ),
+}
+
+
+def create_parser(engine):
+
+    if engine == "target":
+        return ParserXmlPubmedArticleTarget(logger_level="WARNING")
+
+    return ParserXmlPubmedArticle(logger_level="WARNING")
+
+
+def get_peak_rss():
+    """Returns the peak resident set size of the process in bytes."""
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_isolated(func, *args):
+    """Runs `func` in a fresh process and returns its result."""
+
+    with multiprocessing.Pool(processes=1) as pool:
+        return pool.apply(func, args)
+
+
+def benchmark_parse(engine, filename, num_repeats, sections=None):
+
+    parser = create_parser(engine=engine)
+
+    durations = []
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        num_articles = 0
+        for _ in parser.parse(filename_xml=filename, sections=sections):
+            num_articles += 1
+        durations.append(time.perf_counter() - start)
+
+    return num_articles, min(durations), get_peak_rss()
+
+
+def preload_elements(parser, filename, num_articles):
+    """Preloads elements making sure they aren't cleared by the generator."""
+
+    file_xml = parser.open_xml_file(filename_xml=filename)
+    if isinstance(parser, ParserXmlPubmedArticleTarget):
+        elements = list(itertools.islice(
+            parser.generate_xml_elements_lite(
+                file_xml=file_xml,
+                element_tag="PubmedArticle",
+                tags=pubmed_article_tags,
+            ),
+            num_articles,
+        ))
+    else:
+        elements = [
+            copy.deepcopy(element) for element in itertools.islice(
+                parser.generate_xml_elements(
+                    file_xml=file_xml,
+                    element_tag="PubmedArticle",
+                ),
+                num_articles,
+            )
+        ]
+    file_xml.close()
+
+    return elements
+
+
+def find_path(element, path):
+
+    for tag in path:
+        if element is None:
+            return None
+        element = element.find(tag)
+
+    return element
+
+
+def benchmark_parse_methods(engine, filename, num_articles, num_repeats):
+
+    parser = create_parser(engine=engine)
+    elements = preload_elements(
+        parser=parser,
+        filename=filename,
+        num_articles=num_articles,
+    )
+
+    def time_calls(method, elements_method):
+        durations = []
+        for _ in range(num_repeats):
+            start = time.perf_counter()
+            for element in elements_method:
+                method(element=element)
+            durations.append(time.perf_counter() - start)
+
+        return min(durations)
+
+    results = [
+        (
+            "parse_pubmed_article",
+            time_calls(parser.parse_pubmed_article, elements),
+        ),
+        (
+            "parse_header",
+            time_calls(parser.parse_header, elements),
+        ),
+    ]
+    for section in sorted(section_methods):
+        method_name, path = section_methods[section]
+        elements_section = [
+            find_path(element=element, path=path) for element in elements
+        ]
+        results.append((
+            method_name,
+            time_calls(getattr(parser, method_name), elements_section),
+        ))
+
+    return len(elements), results, get_peak_rss()
+
+
+def print_row(name, num_articles, duration, peak_rss=None):
+
+    row = "{:<30} {:>8} articles {:>8.3f}s {:>10.0f} articles/s".format(
+        name, num_articles, duration, num_articles / duration
+    )
+    if peak_rss is not None:
+        row += " {:>8.1f}MiB peak RSS".format(peak_rss / 1024 / 1024)
+    print(row)
+
+
+def main(args):
+
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        filename = os.path.join(
+            dir_tmp,
+            "synthetic.xml" if args.plain else "synthetic.xml.gz",
+        )
+
+        start = time.perf_counter()
+        generator = GeneratorPubmedArticleSet(
+            seed=args.seed,
+            num_authors_max=args.num_authors_max,
+            num_mesh_headings_mean=args.num_mesh_headings,
+            abstract_ratio=args.abstract_ratio,
+            email_ratio=args.email_ratio,
+            logger_level="WARNING",
+        )
+        generator.write(filename=filename, num_articles=args.num_articles)
+        print("Generated {} articles ({:.1f}MiB) in {:.1f}s".format(
+            args.num_articles,
+            os.path.getsize(filename) / 1024 / 1024,
+            time.perf_counter() - start,
+        ))
+
+        print("\nparse ({})".format(args.engine))
+        print_row("all", *run_isolated(
+            benchmark_parse,
+            args.engine,
+            filename,
+            args.num_repeats,
+        ))
+        for section in sorted(pubmed_article_sections):
+            print_row(section, *run_isolated(
+                benchmark_parse,
+                args.engine,
+                filename,
+                args.num_repeats,
+                {section},
+            ))
+
+        num_articles, results, peak_rss = run_isolated(
+            benchmark_parse_methods,
+            args.engine,
+            filename,
+            args.num_articles_preloaded,
+            args.num_repeats,
+        )
+        print("\nparse_* ({}, {:.1f}MiB peak RSS with preloaded elements)"
+              .format(args.engine, peak_rss / 1024 / 1024))
+        for method_name, duration in results:
+            print_row(method_name, num_articles, duration)
+
+
+if __name__ == "__main__":
+
+    argument_parser = argparse.ArgumentParser(
+        description="Benchmarks the parser over a synthetic Pubmed XML file."
+    )
+    argument_parser.add_argument(
+        "--num-articles",
+        dest="num_articles",
+        type=int,
+        default=20000,
+        help="Number of articles in the synthetic file.",
+    )
+    argument_parser.add_argument(
+        "--num-articles-preloaded",
+        dest="num_articles_preloaded",
+        type=int,
+        default=5000,
+        help="Number of articles preloaded for the `parse_*` methods.",
+    )
+    argument_parser.add_argument(
+        "--repeats",
+        dest="num_repeats",
+        type=int,
+        default=3,
+        help="Number of repetitions per benchmark.",
+    )
+    argument_parser.add_argument(
+        "--engine",
+        dest="engine",
+        choices=["iterparse", "target"],
+        default="iterparse",
+        help="Parser engine to benchmark.",
+    )
+    argument_parser.add_argument(
+        "--plain",
+        dest="plain",
+        action="store_true",
+        help="Generate a plain rather than gzipped XML file.",
+    )
+    argument_parser.add_argument(
+        "--seed",
+        dest="seed",
+        type=int,
+        default=0,
+        help="Seed of the synthetic articles.",
+    )
+    argument_parser.add_argument(
+        "--num-authors-max",
+        dest="num_authors_max",
+        type=int,
+        default=12,
+        help="Maximum number of authors per article.",
+    )
+    argument_parser.add_argument(
+        "--num-mesh-headings",
+        dest="num_mesh_headings",
+        type=float,
+        default=10.0,
+        help="Mean number of MeSH headings per article.",
+    )
+    argument_parser.add_argument(
+        "--abstract-ratio",
+        dest="abstract_ratio",
+        type=float,
+        default=0.8,
+        help="Ratio of articles with an abstract.",
+    )
+    argument_parser.add_argument(
+        "--email-ratio",
+        dest="email_ratio",
+        type=float,
+        default=0.2,
+        help="Ratio of affiliations with an email address.",
+    )
+    arguments = argument_parser.parse_args()
+
+    main(args=arguments)
@@ -0,0 +1,209 @@
+# coding=utf-8
+
+import os
+import glob
+import gzip
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pubmed_ingester.caches import CacheLru
+from pubmed_ingester.ingesters import IngesterDocumentPubmedArticle
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.pubmed_ingester import ingest_file
+from tests.assets.PMID30516271 import document as doc_pmid30516271
+from tests.assets.PMID30516272 import document as doc_pmid30516272
+from tests.assets.PMID30516273 import document as doc_pmid30516273
+
+
+class TestCacheDocuments(unittest.TestCase):
+    """Tests the caching of parsed documents."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+        self.filename = os.path.join(self.cache_dir, "pubmed.xml.gz")
+        self._write_file(documents=[doc_pmid30516271, doc_pmid30516272])
+
+        self.parser = ParserXmlPubmedArticle(
+            cache_dir=os.path.join(self.cache_dir, "cache"),
+            logger_level="WARNING",
+        )
+
+    def _write_file(self, documents):
+        with gzip.open(self.filename, "wt", encoding="utf-8") as fout:
+            fout.write("<PubmedArticleSet>")
+            for document in documents:
+                fout.write(document)
+            fout.write("</PubmedArticleSet>")
+
+    def _get_entries(self):
+        return glob.glob(os.path.join(self.cache_dir, "cache", "*"))
+
+    def test_parse_cached(self):
+        """ Tests that a second parse streams the same documents from the
+            cache without parsing the file.
+        """
+
+        pubmed_articles = list(self.parser.parse(filename_xml=self.filename))
+        self.assertEqual(len(pubmed_articles), 2)
+        self.assertEqual(len(self._get_entries()), 1)
+
+        def generate_pubmed_articles(*args, **kwargs):
+            raise AssertionError("File parsed despite the cache.")
+            yield
+
+        self.parser.generate_pubmed_articles = generate_pubmed_articles
+
+        pubmed_articles_cached = list(
+            self.parser.parse(filename_xml=self.filename)
+        )
+        self.assertEqual(pubmed_articles_cached, pubmed_articles)
+
+    def test_parse_stale(self):
+        """ Tests that a changed file is parsed again and its previous entry
+            removed.
+        """
+
+        list(self.parser.parse(filename_xml=self.filename))
+        entries = self._get_entries()
+
+        self._write_file(documents=[doc_pmid30516273])
+        pubmed_articles = list(self.parser.parse(filename_xml=self.filename))
+
+        self.assertEqual(len(pubmed_articles), 1)
+        self.assertEqual(
+            pubmed_articles[0]["MedlineCitation"]["PMID"]["PMID"],
+            "30516273",
+        )
+        entries_new = self._get_entries()
+        self.assertEqual(len(entries_new), 1)
+        self.assertNotEqual(entries_new, entries)
+
+    def test_ingest_file_cached(self):
+        """ Tests that a second ingestion of a file, filtering articles and
+            yielding deletions, is served from the cache with the same
+            articles and deletions.
+        """
+
+        self._write_file(documents=[
+            doc_pmid30516271,
+            "<DeleteCitation><PMID Version=\"1\">1</PMID></DeleteCitation>",
+            doc_pmid30516272,
+        ])
+
+        ingester = mock.Mock(batch_size=1)
+        ingester.is_ingestible = IngesterDocumentPubmedArticle.is_ingestible
+        ingester.ingest.return_value = 1
+        ingester.delete_citations.return_value = 1
+
+        result = ingest_file(
+            filename=self.filename,
+            parser=self.parser,
+            ingester=ingester,
+        )
+        self.assertEqual(len(self._get_entries()), 1)
+        calls = ingester.mock_calls
+
+        def generate_pubmed_articles(*args, **kwargs):
+            raise AssertionError("File parsed despite the cache.")
+            yield
+
+        self.parser.generate_pubmed_articles = generate_pubmed_articles
+        ingester.reset_mock()
+
+        result_cached = ingest_file(
+            filename=self.filename,
+            parser=self.parser,
+            ingester=ingester,
+        )
+
+        self.assertEqual(ingester.mock_calls, calls)
+        self.assertEqual(ingester.ingest.call_count, 2)
+        ingester.delete_citations.assert_called_once_with(pmids=["1"])
+        for key in ["num_articles", "num_ingested", "num_deleted"]:
+            self.assertEqual(result_cached[key], result[key])
+
+    def test_parse_cached_filter(self):
+        """ Tests that the article filter and deletions are applied to the
+            documents read back from the cache.
+        """
+
+        self._write_file(documents=[
+            doc_pmid30516271,
+            "<DeleteCitation><PMID Version=\"1\">1</PMID></DeleteCitation>",
+            doc_pmid30516272,
+        ])
+
+        list(self.parser.parse(filename_xml=self.filename))
+
+        pubmed_articles = list(self.parser.parse(
+            filename_xml=self.filename,
+            article_filter=lambda header: header["PMID"] != "30516271",
+            do_yield_deletions=True,
+        ))
+
+        self.assertEqual(
+            pubmed_articles,
+            [
+                {"DeleteCitation": {"PMIDs": ["1"]}},
+                pubmed_articles[1],
+            ],
+        )
+        self.assertEqual(
+            pubmed_articles[1]["MedlineCitation"]["PMID"]["PMID"],
+            "30516272",
+        )
+        self.assertEqual(self.parser.num_articles_skipped, 1)
+
+    def test_parse_partial(self):
+        """ Tests that neither partial nor projected parses are cached."""
+
+        pubmed_articles = self.parser.parse(filename_xml=self.filename)
+        next(pubmed_articles)
+        pubmed_articles.close()
+
+        list(self.parser.parse(
+            filename_xml=self.filename,
+            sections={"MeshHeadingList"},
+        ))
+
+        self.assertEqual(self._get_entries(), [])
+
+
+class TestCacheLru(unittest.TestCase):
+    """Tests the `CacheLru` class."""
+
+    def test_get_put(self):
+        """ Tests that the least recently used entries are evicted and that
+            hits and misses are counted.
+        """
+
+        cache = CacheLru(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        # Using `a` makes `b` the least recently used entry.
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    def test_disabled(self):
+        """ Tests that nothing is cached if the maximum size is 0. """
+
+        cache = CacheLru(max_size=0)
+        cache.put("a", 1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
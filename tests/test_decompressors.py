@@ -0,0 +1,71 @@
+# coding=utf-8
+
+import os
+import gzip
+import tempfile
+import unittest
+
+from pubmed_ingester.decompressors import open_gzip_file
+from pubmed_ingester.decompressors import decompression_backends
+from pubmed_ingester.excs import DecompressionBackendUnavailable
+from pubmed_ingester.excs import InvalidArguments
+
+
+class TestDecompressors(unittest.TestCase):
+    """Tests the decompression backends."""
+
+    def setUp(self):
+        """Writes out a gzipped file spanning several read-ahead chunks."""
+
+        self.content = os.urandom(1024 * 64) * 40
+
+        fd, self.filename = tempfile.mkstemp(suffix=".gz")
+        os.close(fd)
+        with gzip.open(self.filename, "wb") as fout:
+            fout.write(self.content)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_open_gzip_file(self):
+        """ Tests that the `open_gzip_file` function yields the decompressed
+            content under every available backend.
+        """
+
+        for backend in decompression_backends:
+            with self.subTest(backend=backend):
+                try:
+                    reader = open_gzip_file(
+                        filename=self.filename,
+                        backend=backend,
+                        chunk_size=1024 * 100,
+                        max_chunks=2,
+                    )
+                except DecompressionBackendUnavailable:
+                    continue
+
+                chunks = []
+                while True:
+                    chunk = reader.read(32768)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                reader.close()
+
+                self.assertEqual(b"".join(chunks), self.content)
+
+    def test_open_gzip_file_close_early(self):
+        """ Tests that a reader can be closed before reaching EOF."""
+
+        with open_gzip_file(
+            filename=self.filename,
+            chunk_size=1024,
+            max_chunks=1,
+        ) as reader:
+            self.assertEqual(reader.read(10), self.content[:10])
+
+    def test_open_gzip_file_invalid_backend(self):
+        """ Tests that an unknown backend raises `InvalidArguments`."""
+
+        with self.assertRaises(InvalidArguments):
+            open_gzip_file(filename=self.filename, backend="unknown")
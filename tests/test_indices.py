@@ -0,0 +1,67 @@
+# coding=utf-8
+
+import datetime
+import unittest
+
+from pubmed_ingester.indices import IndexRevisions
+
+
+class TestIndexRevisions(unittest.TestCase):
+    """Tests the `IndexRevisions` class."""
+
+    def setUp(self):
+        self.index = IndexRevisions(logger_level="WARNING")
+        # Rows are deliberately unsorted.
+        self.index.load(rows=[
+            (30516272, datetime.date(2018, 12, 5)),
+            (1, None),
+            (30516271, datetime.date(2018, 12, 5)),
+        ])
+
+    def test_load(self):
+        """ Tests that the loaded rows are sorted by PMID and looked up."""
+
+        self.assertEqual(list(self.index.pmids), [1, 30516271, 30516272])
+        self.assertEqual(len(self.index), 3)
+        self.assertIn(1, self.index)
+        self.assertNotIn(2, self.index)
+        self.assertIsNone(self.index.get(1))
+        self.assertIsNone(self.index.get(2))
+        self.assertEqual(
+            self.index.get(30516271),
+            datetime.date(2018, 12, 5),
+        )
+
+    def test_update_remove(self):
+        """ Tests that updates and deletions take precedence over the loaded
+            rows.
+        """
+
+        self.index.update(pmid=30516271, date_revised=datetime.date(2019, 1, 1))
+        self.index.update(pmid=2, date_revised=datetime.date(2019, 1, 1))
+        self.index.remove(pmid=30516272)
+
+        self.assertEqual(self.index.get(30516271), datetime.date(2019, 1, 1))
+        self.assertEqual(self.index.get(2), datetime.date(2019, 1, 1))
+        self.assertNotIn(30516272, self.index)
+        self.assertIsNone(self.index.get(30516272))
+
+    def test_is_revised(self):
+        """ Tests that only new or revised articles are reported as
+            revised.
+        """
+
+        header = {"PMID": "30516271", "DateRevised": datetime.date(2018, 12, 5)}
+        self.assertFalse(self.index.is_revised(header=header))
+
+        header["DateRevised"] = datetime.date(2019, 1, 1)
+        self.assertTrue(self.index.is_revised(header=header))
+
+        header = {"PMID": "2", "DateRevised": None}
+        self.assertTrue(self.index.is_revised(header=header))
+
+        header = {"PMID": "1", "DateRevised": None}
+        self.assertFalse(self.index.is_revised(header=header))
+
+        self.index.remove(pmid=1)
+        self.assertTrue(self.index.is_revised(header=header))
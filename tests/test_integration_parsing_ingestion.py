@@ -1,7 +1,18 @@
 # coding=utf-8
 
+import copy
+from unittest import mock
+
+import sqlalchemy
 from lxml import etree
 
+from fform.orm_base import Base
+from fform.orm_pubmed import Citation
+from fform.orm_pubmed import PublicationType
+
+from pubmed_ingester.ingesters import IngesterDocumentPubmedArticle
+from pubmed_ingester.loaders import LoaderCopyPubmedArticle
+
 from tests.bases import TestBase
 from tests.assets.PMID1 import document as doc_pmid1
 from tests.assets.PMID30516271 import document as doc_pmid30516271
@@ -118,3 +129,332 @@ class TestIntegrationParsingIngestion(TestBase):
         obj_id = self.ingester.ingest(document=article)
 
         self.assertEqual(obj_id, 1)
+
+    def _parse_samples(self):
+        """ Parses all sample PubMed article XML documents. """
+
+        return [
+            self._parse_sample(sample=sample)
+            for sample in [
+                doc_pmid1,
+                doc_pmid30516271,
+                doc_pmid30516272,
+                doc_pmid30516273,
+                doc_pmid30516284,
+                doc_pmid30516287,
+                doc_pmid30518562,
+            ]
+        ]
+
+    def _count_rows(self):
+        """ Counts the rows of every table in the schema. """
+
+        counts = {}
+        with self.dal.session_scope() as session:
+            for table in Base.metadata.sorted_tables:
+                query = sqlalchemy.select([
+                    sqlalchemy.func.count(),
+                ]).select_from(table)
+                counts[table.name] = session.execute(query).scalar()
+
+        return counts
+
+    def test_integration_ingest_many(self):
+        """ Tests the `ingest_many` method of the
+            `IngesterDocumentPubmedArticle` class by ingesting all sample
+            PubMed article XML documents one by one and then in a single batch
+            into a recreated schema asserting that the same citations and
+            number of records per table were ingested with the link rows of
+            all articles inserted together.
+        """
+
+        articles = self._parse_samples()
+
+        citation_ids = [
+            self.ingester.ingest(document=article) for article in articles
+        ]
+        counts = self._count_rows()
+
+        Base.metadata.drop_all(self.dal.engine)
+        Base.metadata.create_all(self.dal.engine)
+        # The cached IDs refer to the dropped rows.
+        for cache in self.ingester.caches.values():
+            cache.clear()
+
+        with mock.patch.object(
+            self.ingester,
+            "insert_links",
+            wraps=self.ingester.insert_links,
+        ) as insert_links:
+            citation_ids_many = self.ingester.ingest_many(documents=articles)
+
+        self.assertEqual(citation_ids_many, citation_ids)
+        self.assertEqual(self._count_rows(), counts)
+        insert_links.assert_called_once()
+        self.assertIsNone(self.ingester.links)
+
+    def _dump_rows(self):
+        """ Retrieves the rows of every table in the schema in a stable order
+            with their primary keys removed and their foreign keys replaced
+            by the referenced rows so that they don't depend on the order
+            rows were inserted in.
+        """
+
+        rows = {}
+        rows_by_id = {}
+        with self.dal.session_scope() as session:
+            for table in Base.metadata.sorted_tables:
+                column_pk = list(table.primary_key.columns)[0]
+                rows_by_id[table.name] = {}
+                for row in session.execute(table.select()):
+                    values = []
+                    for column in table.columns:
+                        if column.primary_key:
+                            continue
+                        value = row[column]
+                        for foreign_key in column.foreign_keys:
+                            name = foreign_key.column.table.name
+                            value = rows_by_id[name].get(value)
+                        values.append(value)
+                    rows_by_id[table.name][row[column_pk]] = tuple(values)
+                rows[table.name] = sorted(
+                    rows_by_id[table.name].values(),
+                    key=repr,
+                )
+
+        return rows
+
+    def _parse_sample_revised(self):
+        """ Parses the PMID30516287 PubMed article XML document and a revision
+            of it listing its authors in reverse order.
+        """
+
+        article = self._parse_sample(sample=doc_pmid30516287)
+
+        article_revised = copy.deepcopy(article)
+        article_revised["MedlineCitation"]["Article"]["Article"]["AuthorList"][
+            "Authors"
+        ].reverse()
+
+        return article, article_revised
+
+    def test_integration_ingest_many_revision(self):
+        """ Tests the `ingest_many` method of the
+            `IngesterDocumentPubmedArticle` class by ingesting an article and
+            a revision of it with reordered authors one by one and then in
+            batches into a recreated schema asserting that the link rows of
+            the revision replaced those of the article in both cases.
+        """
+
+        article, article_revised = self._parse_sample_revised()
+
+        self.ingester.ingest(document=article)
+        rows_article = self._dump_rows()
+        self.ingester.ingest(document=article_revised)
+        rows = self._dump_rows()
+
+        self.assertNotEqual(
+            rows["article_author_affiliations"],
+            rows_article["article_author_affiliations"],
+        )
+
+        Base.metadata.drop_all(self.dal.engine)
+        Base.metadata.create_all(self.dal.engine)
+        self.ingester.clear_caches()
+
+        self.ingester.ingest_many(documents=[article])
+        self.ingester.ingest_many(documents=[article_revised])
+
+        self.assertEqual(self._dump_rows(), rows)
+
+    def test_integration_loader_copy(self):
+        """ Tests the `LoaderCopyPubmedArticle` class by ingesting all sample
+            PubMed article XML documents one by one through the DAL and then
+            through `COPY` into a recreated schema asserting that the same
+            citations and number of records per table were ingested, and
+            that reloading them with a revised article updates the same
+            records as reingesting them through the DAL.
+        """
+
+        articles = self._parse_samples()
+        article, article_revised = self._parse_sample_revised()
+        articles_revised = [
+            article_revised if _article == article else _article
+            for _article in articles
+        ]
+
+        citation_ids = [
+            self.ingester.ingest(document=article) for article in articles
+        ]
+        counts = self._count_rows()
+        for _article in articles_revised:
+            self.ingester.ingest(document=_article)
+        rows = self._dump_rows()
+
+        Base.metadata.drop_all(self.dal.engine)
+        Base.metadata.create_all(self.dal.engine)
+
+        loader = LoaderCopyPubmedArticle(dal=self.dal)
+        citation_ids_copy = loader.ingest_many(documents=articles)
+
+        self.assertEqual(citation_ids_copy, citation_ids)
+        self.assertEqual(self._count_rows(), counts)
+
+        # Reloading the articles with a revision neither duplicates them nor
+        # leaves stale columns, e.g., the `ordinance` of reordered authors.
+        self.assertEqual(
+            loader.ingest_many(documents=articles_revised),
+            citation_ids,
+        )
+        self.assertEqual(self._dump_rows(), rows)
+
+    def _parse_samples_unit_of_work(self):
+        """ Parses all sample PubMed article XML documents and an article
+            failing to be ingested after its journal and article records.
+        """
+
+        articles = self._parse_samples()
+
+        article_invalid = copy.deepcopy(articles[1])
+        medline_citation = article_invalid["MedlineCitation"]
+        medline_citation["PMID"]["PMID"] = "2"
+        medline_citation["DateCreated"]["Date"] = "invalid"
+
+        return articles, article_invalid
+
+    def test_integration_unit_of_work(self):
+        """ Tests the unit-of-work mode of the `IngesterDocumentPubmedArticle`
+            class by ingesting all sample PubMed article XML documents and an
+            invalid one through the `ingest` method asserting that only the
+            invalid article was rolled back and that the same records were
+            ingested as without it.
+        """
+
+        articles, article_invalid = self._parse_samples_unit_of_work()
+
+        citation_ids = [
+            self.ingester.ingest(document=article) for article in articles
+        ]
+        counts = self._count_rows()
+
+        Base.metadata.drop_all(self.dal.engine)
+        Base.metadata.create_all(self.dal.engine)
+
+        ingester = IngesterDocumentPubmedArticle(
+            dal=self.dal,
+            unit_of_work_size=3,
+        )
+        citation_ids_unit_of_work = [
+            ingester.ingest(document=article)
+            for article in articles[:3] + [article_invalid] + articles[3:]
+        ]
+        ingester.commit()
+
+        self.assertEqual(
+            citation_ids_unit_of_work,
+            citation_ids[:3] + [None] + citation_ids[3:],
+        )
+        self.assertEqual(self._count_rows(), counts)
+        self.assertEqual(ingester.unit_of_work.num_commits, 3)
+        self.assertEqual(ingester.unit_of_work.num_rollbacks, 1)
+
+    def test_integration_unit_of_work_ingest_many(self):
+        """ Tests the unit-of-work mode of the `IngesterDocumentPubmedArticle`
+            class by ingesting all sample PubMed article XML documents and an
+            invalid one through the `ingest_many` method asserting that the
+            failing batch was ingested again one by one skipping the invalid
+            article.
+        """
+
+        articles, article_invalid = self._parse_samples_unit_of_work()
+
+        for article in articles:
+            self.ingester.ingest(document=article)
+        counts = self._count_rows()
+
+        Base.metadata.drop_all(self.dal.engine)
+        Base.metadata.create_all(self.dal.engine)
+
+        ingester = IngesterDocumentPubmedArticle(
+            dal=self.dal,
+            unit_of_work_size=100,
+        )
+        citation_ids_unit_of_work = ingester.ingest_many(
+            documents=articles + [article_invalid],
+        )
+        ingester.commit()
+
+        # Sequences aren't rolled back so the IDs differ.
+        self.assertNotIn(None, citation_ids_unit_of_work[:-1])
+        self.assertIsNone(citation_ids_unit_of_work[-1])
+        self.assertEqual(self._count_rows(), counts)
+        self.assertEqual(ingester.unit_of_work.num_commits, 1)
+
+    def test_integration_identity_caches(self):
+        """ Tests the caches of upserted entity IDs of the
+            `IngesterDocumentPubmedArticle` class by ingesting the
+            PMID30516271 PubMed article XML document twice asserting that the
+            second ingestion hits the caches and yields the same citation.
+        """
+
+        article = self._parse_sample(sample=doc_pmid30516271)
+
+        obj_id = self.ingester.ingest(document=article)
+        self.assertEqual(self.ingester.caches["Journal"].hits, 0)
+
+        self.assertEqual(self.ingester.ingest(document=article), obj_id)
+        self.assertEqual(self.ingester.caches["Journal"].hits, 1)
+        self.assertEqual(self.ingester.caches["JournalInfo"].hits, 1)
+        self.assertGreater(self.ingester.caches["Author"].hits, 0)
+
+    def test_integration_identity_caches_changed(self):
+        """ Tests the caches of upserted entity IDs of the
+            `IngesterDocumentPubmedArticle` class by ingesting a publication
+            type twice under the same UID but a different name asserting that
+            the second ingestion misses the cache and updates the name.
+        """
+
+        document = {
+            "PublicationType": {
+                "UI": "D016428",
+                "PublicationType": "Journal Article",
+            },
+        }
+        document_renamed = copy.deepcopy(document)
+        document_renamed["PublicationType"]["PublicationType"] = "Article"
+
+        ids = self.ingester.ingest_publication_types(documents=[document])
+        ids_renamed = self.ingester.ingest_publication_types(
+            documents=[document_renamed]
+        )
+
+        self.assertEqual(ids_renamed, ids)
+        self.assertEqual(self.ingester.caches["PublicationType"].hits, 0)
+
+        with self.dal.engine.connect() as connection:
+            names = connection.execute(
+                sqlalchemy.select([PublicationType.publication_type])
+            ).fetchall()
+        self.assertEqual(names, [("Article",)])
+
+    def test_integration_delete_citations(self):
+        """ Tests the `delete_citations` method of the
+            `IngesterDocumentPubmedArticle` class by ingesting the
+            PMID30516271 PubMed article XML document and deleting it asserting
+            that the citation was deleted and unknown PMIDs were ignored.
+        """
+
+        article = self._parse_sample(sample=doc_pmid30516271)
+        self.ingester.ingest(document=article)
+
+        num_deleted = self.ingester.delete_citations(
+            pmids=["30516271", "12345"],
+        )
+
+        self.assertEqual(num_deleted, 1)
+        citation = self.dal.get_by_attr(
+            orm_class=Citation,
+            attr_name="pmid",
+            attr_value=30516271,
+        )
+        self.assertIsNone(citation)
@@ -0,0 +1,233 @@
+# coding=utf-8
+
+import datetime
+import unittest
+from unittest import mock
+
+from pubmed_ingester.loaders import LoaderCopyPubmedArticle
+from pubmed_ingester.loaders import StagerCopy
+from pubmed_ingester.tables import entity_tables
+from pubmed_ingester.tables import link_tables
+
+
+class TestStagerCopy(unittest.TestCase):
+    """Tests the `StagerCopy` class."""
+
+    def setUp(self):
+        self.dal = mock.Mock()
+        self.stager = StagerCopy(dal=self.dal)
+
+    def test_stage_entities(self):
+        """ Tests that entity rows are staged under their columns once per
+            key and their keys are returned in place of IDs.
+        """
+
+        keys = self.stager.biodi_keywords(
+            keywords=["a", "b", "a"],
+            md5s=[b"1", b"2", b"1"],
+        )
+
+        self.assertEqual(keys, [b"1", b"2", b"1"])
+        self.assertEqual(
+            list(self.stager.entities["Keyword"].values()),
+            [{"keyword": "a", "md5": b"1"}, {"keyword": "b", "md5": b"2"}],
+        )
+        self.assertEqual(len(self.stager), 2)
+
+        key = self.stager.iodi_citation(pmid=1, article_id=b"3")
+
+        self.assertEqual(key, 1)
+        self.assertEqual(
+            self.stager.entities["Citation"][1],
+            {"pmid": 1, "article_id": b"3"},
+        )
+        self.dal.iodi_citation.assert_not_called()
+
+    def test_stage_links(self):
+        """ Tests that link rows are staged with the scalar arguments repeated
+            on every row.
+        """
+
+        self.stager.biodi_citation_keywords(citation_id=1, keyword_ids=[2, 3])
+
+        self.assertEqual(
+            self.stager.links["CitationKeyword"],
+            [
+                {"citation_id": 1, "keyword_id": 2},
+                {"citation_id": 1, "keyword_id": 3},
+            ],
+        )
+
+        self.stager.clear()
+
+        self.assertEqual(self.stager.links["CitationKeyword"], [])
+
+    def test_delegation(self):
+        """ Tests that methods which aren't staged are delegated to the DAL.
+        """
+
+        self.stager.iodi_journal(issn="1234-5678")
+        self.stager.session_scope()
+
+        self.dal.iodi_journal.assert_called_once_with(issn="1234-5678")
+        self.dal.session_scope.assert_called_once_with()
+
+
+class ErrorDeadlock(Exception):
+    """Stands in for the `psycopg2` error raised on deadlocks."""
+
+    pgcode = "40P01"
+
+
+class TestLoaderCopyPubmedArticle(unittest.TestCase):
+    """Tests the `LoaderCopyPubmedArticle` class."""
+
+    def setUp(self):
+        self.dal = mock.Mock()
+        self.connection = self.dal.engine.raw_connection.return_value
+        self.loader = LoaderCopyPubmedArticle(dal=self.dal, retry_delay=0)
+
+    def test_format_value(self):
+        """ Tests the formatting of values under the text format of `COPY`.
+        """
+
+        format_value = LoaderCopyPubmedArticle._format_value
+
+        self.assertEqual(format_value(None), "\\N")
+        self.assertEqual(format_value(True), "t")
+        self.assertEqual(format_value(False), "f")
+        self.assertEqual(format_value(12), "12")
+        self.assertEqual(format_value(b"\x01\xff"), "\\\\x01ff")
+        self.assertEqual(
+            format_value(datetime.date(2018, 12, 5)),
+            "2018-12-05",
+        )
+        self.assertEqual(
+            format_value("a\tb\nc\\d\re"),
+            "a\\tb\\nc\\\\d\\re",
+        )
+
+    def test_resolve_references(self):
+        """ Tests that the IDs of merged entity rows are substituted for the
+            keys held by the reference columns of rows while other values,
+            e.g., cached IDs, and `None` are kept.
+        """
+
+        rows = [
+            {"article_id": b"1", "author_id": b"2", "affiliation_id": None},
+            {"article_id": b"1", "author_id": 7, "affiliation_id": b"3"},
+        ]
+        ids = {
+            "Article": {b"1": 10},
+            "Author": {b"2": 20},
+            "Affiliation": {b"3": 30},
+        }
+
+        LoaderCopyPubmedArticle._resolve_references(
+            spec=link_tables["biodi_article_author_affiliations"],
+            rows=rows,
+            ids=ids,
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                {"article_id": 10, "author_id": 20, "affiliation_id": None},
+                {"article_id": 10, "author_id": 7, "affiliation_id": 30},
+            ],
+        )
+
+    def test_flush_caches(self):
+        """ Tests that a flush replaces the keys the identity caches were
+            filled with while staging with the IDs of the merged entity rows,
+            under the UID and name of publication types, and leaves the
+            staged rows untouched.
+        """
+
+        keys = self.loader.dal.biodi_keywords(keywords=["a"], md5s=[b"1"])
+        self.loader.caches["Keyword"].put(b"1", keys[0])
+        keys = self.loader.dal.biodi_publication_types(
+            uids=["D016428"],
+            publication_types=["Journal Article"],
+        )
+        self.loader.caches["PublicationType"].put(
+            ("D016428", "Journal Article"),
+            keys[0],
+        )
+        rows_staged = {
+            name: list(rows.values())
+            for name, rows in self.loader.dal.entities.items()
+        }
+
+        ids = {spec.name: {} for spec in entity_tables.values()}
+        ids["Keyword"] = {b"1": 5}
+        ids["PublicationType"] = {"D016428": 6}
+        ids["Citation"] = {1: 7}
+
+        with mock.patch.object(
+            self.loader,
+            "_merge_rows",
+            return_value=ids,
+        ) as mock_merge_rows:
+            citation_ids = self.loader.flush()
+
+        self.assertEqual(citation_ids, {1: 7})
+        self.assertEqual(self.loader.caches["Keyword"].get(b"1"), 5)
+        self.assertEqual(
+            self.loader.caches["PublicationType"].get(
+                ("D016428", "Journal Article")
+            ),
+            6,
+        )
+        self.assertEqual(
+            mock_merge_rows.call_args[1]["rows_entities"]["Keyword"],
+            rows_staged["Keyword"],
+        )
+        self.assertIsNot(
+            mock_merge_rows.call_args[1]["rows_entities"]["Keyword"][0],
+            rows_staged["Keyword"][0],
+        )
+        self.assertEqual(len(self.loader.dal), 0)
+
+    def test_flush_retry(self):
+        """ Tests that a flush failing on a deadlock is rolled back and
+            retried.
+        """
+
+        with mock.patch.object(
+            self.loader,
+            "_merge_rows",
+            side_effect=[ErrorDeadlock(), {"Citation": {1: 10}}],
+        ) as mock_merge_rows:
+            citation_ids = self.loader.flush()
+
+        self.assertEqual(citation_ids, {1: 10})
+        self.assertEqual(mock_merge_rows.call_count, 2)
+        self.connection.rollback.assert_called_once_with()
+        self.connection.commit.assert_called_once_with()
+        self.connection.close.assert_called_once_with()
+
+    def test_flush_retry_exhausted(self):
+        """ Tests that a flush failing on deadlocks more than `max_attempts`
+            times or on other errors raises the error and clears the identity
+            caches.
+        """
+
+        self.loader.caches["Keyword"].put(b"1", 1)
+
+        for error, num_attempts in [
+            (ErrorDeadlock(), self.loader.max_attempts),
+            (ValueError(), 1),
+        ]:
+            with mock.patch.object(
+                self.loader,
+                "_merge_rows",
+                side_effect=error,
+            ) as mock_merge_rows:
+                with self.assertRaises(type(error)):
+                    self.loader.flush()
+
+            self.assertEqual(mock_merge_rows.call_count, num_attempts)
+
+        self.connection.commit.assert_not_called()
+        self.assertIsNone(self.loader.caches["Keyword"].get(b"1"))
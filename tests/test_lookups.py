@@ -0,0 +1,184 @@
+# coding=utf-8
+
+import argparse
+import contextlib
+import unittest
+from unittest import mock
+
+from pubmed_ingester.lookups import LookupMesh
+from pubmed_ingester.pubmed_ingester import main
+
+
+class TestLookupMesh(unittest.TestCase):
+    """Tests the `LookupMesh` class."""
+
+    def setUp(self):
+        self.lookup = LookupMesh(logger_level="WARNING")
+        self.lookup.load(
+            descriptors=[("D000001", 1), ("D000002", 2)],
+            qualifiers=[("Q000001", 1)],
+        )
+
+    @staticmethod
+    def _create_dal(rows):
+        """ Creates a mock DAL whose sessions return `rows` for any query. """
+
+        session = mock.Mock()
+        session.execute.return_value = rows
+
+        dal = mock.Mock()
+        dal.session_scope.side_effect = lambda: contextlib.nullcontext(session)
+
+        return dal
+
+    def test_get_ids_known(self):
+        """ Tests that known UIs are looked up without querying the DB. """
+
+        dal = self._create_dal(rows=[])
+
+        self.assertEqual(
+            self.lookup.get_descriptor_ids(
+                dal=dal,
+                uis=["D000002", "D000001", "D000002"],
+            ),
+            [2, 1, 2],
+        )
+        self.assertEqual(
+            self.lookup.get_qualifier_ids(dal=dal, uis=["Q000001"]),
+            [1],
+        )
+        dal.session_scope.assert_not_called()
+
+    def test_get_ids_unknown(self):
+        """ Tests that unknown UIs are resolved with a single query and
+            remembered, along with those found missing, until refreshed.
+        """
+
+        dal = self._create_dal(rows=[("D000003", 3)])
+
+        self.assertEqual(
+            self.lookup.get_descriptor_ids(
+                dal=dal,
+                uis=["D000001", "D000003", "D000004", "D000003"],
+            ),
+            [1, 3, None, 3],
+        )
+        self.assertEqual(dal.session_scope.call_count, 1)
+
+        self.assertEqual(
+            self.lookup.get_descriptor_ids(
+                dal=dal,
+                uis=["D000003", "D000004"],
+            ),
+            [3, None],
+        )
+        self.assertEqual(dal.session_scope.call_count, 1)
+
+        # Reloading forgets the UIs found missing.
+        self.lookup.load(descriptors=[("D000004", 4)], qualifiers=[])
+        self.assertEqual(
+            self.lookup.get_descriptor_ids(dal=dal, uis=["D000004"]),
+            [4],
+        )
+        self.assertEqual(len(self.lookup), 1)
+
+    def test_missing_ttl(self):
+        """ Tests that UIs found missing are looked up again once they've been
+            remembered for longer than `missing_ttl` seconds.
+        """
+
+        with mock.patch("pubmed_ingester.lookups.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            lookup = LookupMesh(missing_ttl=60, logger_level="WARNING")
+            dal = self._create_dal(rows=[])
+
+            for time_lookup in [100.0, 159.0]:
+                monotonic.return_value = time_lookup
+                self.assertEqual(
+                    lookup.get_descriptor_ids(dal=dal, uis=["D000003"]),
+                    [None],
+                )
+            self.assertEqual(dal.session_scope.call_count, 1)
+
+            # The descriptor added since is resolved once the TTL expired.
+            dal_added = self._create_dal(rows=[("D000003", 3)])
+            monotonic.return_value = 160.0
+            self.assertEqual(
+                lookup.get_descriptor_ids(dal=dal_added, uis=["D000003"]),
+                [3],
+            )
+            self.assertEqual(dal_added.session_scope.call_count, 1)
+            self.assertEqual(lookup.descriptors_missing, set())
+
+    def test_load_lazily(self):
+        """ Tests that a lookup loaded lazily is loaded on the first lookup of
+            any UIs only.
+        """
+
+        lookup = LookupMesh(do_load_lazily=True, logger_level="WARNING")
+        dal = self._create_dal(rows=[])
+
+        def load_mesh(dal):
+            lookup.load(
+                descriptors=[("D000001", 1)],
+                qualifiers=[("Q000001", 1)],
+            )
+
+        with mock.patch.object(
+            lookup,
+            "load_mesh",
+            side_effect=load_mesh,
+        ) as mock_load_mesh:
+            self.assertEqual(lookup.get_descriptor_ids(dal=dal, uis=[]), [])
+            mock_load_mesh.assert_not_called()
+
+            self.assertEqual(
+                lookup.get_descriptor_ids(dal=dal, uis=["D000001"]),
+                [1],
+            )
+            self.assertEqual(
+                lookup.get_qualifier_ids(dal=dal, uis=["Q000001"]),
+                [1],
+            )
+
+        mock_load_mesh.assert_called_once_with(dal=dal)
+        dal.session_scope.assert_not_called()
+
+    def test_main_workers_share_lookup(self):
+        """ Tests that the `pubmed_ingester` main module loads the lookup
+            once before forking worker processes, freezing the garbage
+            collector meanwhile, and hands it to every worker.
+        """
+
+        args = argparse.Namespace(
+            filenames=["pubmed-1.xml", "pubmed-2.xml"],
+            config_file=None,
+            workers=2,
+            incremental=False,
+            dedupe=True,
+        )
+
+        with mock.patch.multiple(
+            "pubmed_ingester.pubmed_ingester",
+            load_config=mock.DEFAULT,
+            create_planner=mock.DEFAULT,
+            load_lookup_mesh=mock.DEFAULT,
+            gc=mock.DEFAULT,
+            multiprocessing=mock.DEFAULT,
+        ) as mocks:
+            mocks["load_config"].return_value = {}
+            pool = mocks["multiprocessing"].Pool
+            pool_entered = pool.return_value.__enter__.return_value
+            pool_entered.imap_unordered.return_value = []
+            main(args=args)
+
+        mocks["load_lookup_mesh"].assert_called_once_with(cfg={})
+        self.assertEqual(
+            pool.call_args[1]["initargs"][2:],
+            (
+                mocks["create_planner"].return_value,
+                mocks["load_lookup_mesh"].return_value,
+            ),
+        )
+        mocks["gc"].freeze.assert_called_once_with()
+        mocks["gc"].unfreeze.assert_called_once_with()
@@ -0,0 +1,133 @@
+# coding=utf-8
+
+import os
+import tempfile
+import unittest
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.parser_targets import ParserXmlPubmedArticleTarget
+from tests.assets.PMID1 import document as doc_pmid1
+from tests.assets.PMID30516271 import document as doc_pmid30516271
+from tests.assets.PMID30516272 import document as doc_pmid30516272
+from tests.assets.PMID30516273 import document as doc_pmid30516273
+from tests.assets.PMID30516284 import document as doc_pmid30516284
+from tests.assets.PMID30516287 import document as doc_pmid30516287
+from tests.assets.PMID30518562 import document as doc_pmid30518562
+from tests.assets.pubmed_sample_xml import pubmed_sample_xml
+
+
+class TestParserTarget(unittest.TestCase):
+    """Tests the conformance of the `ParserXmlPubmedArticleTarget` class to
+    the `ParserXmlPubmedArticle` class."""
+
+    def setUp(self):
+        self.parser = ParserXmlPubmedArticle(logger_level="WARNING")
+        self.parser_target = ParserXmlPubmedArticleTarget(
+            logger_level="WARNING",
+            # Use a small read size so that elements span multiple feeds.
+            read_size=512,
+        )
+
+    def _write_file(self, content):
+        """ Writes out an XML file with the given content and returns its
+            filename.
+        """
+
+        fd, filename = tempfile.mkstemp(suffix=".xml")
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        with open(filename, "w", encoding="utf-8") as fout:
+            fout.write(content)
+
+        return filename
+
+    def _assert_conformance(
+        self,
+        filename,
+        sections=None,
+        do_yield_deletions=False,
+    ):
+
+        pubmed_articles = list(self.parser.parse(
+            filename_xml=filename,
+            sections=sections,
+            do_yield_deletions=do_yield_deletions,
+        ))
+        pubmed_articles_target = list(self.parser_target.parse(
+            filename_xml=filename,
+            sections=sections,
+            do_yield_deletions=do_yield_deletions,
+        ))
+
+        self.assertTrue(pubmed_articles)
+        self.assertEqual(pubmed_articles_target, pubmed_articles)
+
+    def test_parse_assets(self):
+        """ Tests that the PubMed article assets are parsed into the same
+            documents by both engines.
+        """
+
+        documents = [
+            doc_pmid1,
+            doc_pmid30516271,
+            doc_pmid30516272,
+            doc_pmid30516273,
+            doc_pmid30516284,
+            doc_pmid30516287,
+            doc_pmid30518562,
+        ]
+
+        for document in documents:
+            filename = self._write_file(
+                "<PubmedArticleSet>{}</PubmedArticleSet>".format(document)
+            )
+            self._assert_conformance(filename=filename)
+            self._assert_conformance(
+                filename=filename,
+                sections={"MeshHeadingList", "AuthorList"},
+            )
+
+        filename = self._write_file(pubmed_sample_xml)
+        self._assert_conformance(filename=filename)
+
+    def test_parse_mixed_content(self):
+        """ Tests that text following skipped child elements, e.g., inline
+            markup, isn't attributed to the parent element.
+        """
+
+        document = doc_pmid30516271.replace(
+            "<ArticleTitle>Spatial scale",
+            "<ArticleTitle>Spatial <i>scale</i> &amp; <b>size</b>",
+        ).replace(
+            "<AbstractText>The abundance",
+            "<AbstractText><sup>1</sup>The abundance",
+        )
+        filename = self._write_file(
+            "<PubmedArticleSet>{}</PubmedArticleSet>".format(document)
+        )
+
+        self._assert_conformance(filename=filename)
+
+    def test_parse_delete_citations(self):
+        """ Tests that `<DeleteCitation>` elements are parsed into the same
+            documents by both engines.
+        """
+
+        filename = self._write_file(
+            "<PubmedArticleSet>{}<DeleteCitation>"
+            '<PMID Version="1">12345</PMID>'
+            '<PMID Version="1">12346</PMID>'
+            "</DeleteCitation></PubmedArticleSet>".format(doc_pmid30516271)
+        )
+
+        self._assert_conformance(filename=filename, do_yield_deletions=True)
+
+        documents = list(self.parser_target.parse(
+            filename_xml=filename,
+            do_yield_deletions=True,
+        ))
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(
+            documents[-1],
+            {"DeleteCitation": {"PMIDs": ["12345", "12346"]}},
+        )
@@ -0,0 +1,127 @@
+# coding=utf-8
+
+import datetime
+import unittest
+
+from lxml import etree
+
+from pubmed_ingester.parser_utils import parse_date_element
+from pubmed_ingester.parser_utils import extract_year_from_medlinedate
+from pubmed_ingester.parser_utils import normalize_affiliation
+from pubmed_ingester.parser_utils import clean_affiliation_email
+from pubmed_ingester.parser_utils import extract_affiliation_email
+
+
+class TestNormalizeAffiliation(unittest.TestCase):
+    """Tests the `normalize_affiliation` function."""
+
+    def test_normalize_affiliation(self):
+        """ Tests that affiliations are split into their text without the email
+            and the email.
+        """
+
+        samples = [
+            (
+                "Dept of Biology, Univ of Bath, UK. j.doe@bath.ac.uk.",
+                ("Dept of Biology, Univ of Bath, UK.", "j.doe@bath.ac.uk"),
+            ),
+            (
+                "Dept of Biology, Univ of Bath, UK. Electronic address: "
+                "j.doe@bath.ac.uk",
+                (
+                    "Dept of Biology, Univ of Bath, UK. Electronic address: ",
+                    "j.doe@bath.ac.uk",
+                ),
+            ),
+            (
+                "Dept of Biology, Univ of Bath, UK.",
+                ("Dept of Biology, Univ of Bath, UK.", None),
+            ),
+            ("", (None, None)),
+            (None, (None, None)),
+        ]
+
+        for affiliation, expected in samples:
+            self.assertEqual(normalize_affiliation(affiliation), expected)
+            self.assertEqual(
+                clean_affiliation_email(affiliation),
+                expected[0],
+            )
+            self.assertEqual(
+                extract_affiliation_email(affiliation),
+                expected[1],
+            )
+
+    def test_normalize_affiliation_cached(self):
+        """ Tests that repeated affiliations are served from the cache."""
+
+        affiliation = "Dept of Chemistry, Univ of Bath, UK. a.b@bath.ac.uk"
+
+        normalize_affiliation(affiliation)
+        hits = normalize_affiliation.cache_info().hits
+        normalize_affiliation(affiliation)
+
+        self.assertEqual(normalize_affiliation.cache_info().hits, hits + 1)
+
+
+class TestParseDateElement(unittest.TestCase):
+    """Tests the `parse_date_element` function."""
+
+    def test_parse_date_element(self):
+        """ Tests the parsing of date elements with numeric and abbreviated
+            months, invalid dates, and `<MedlineDate>` ranges.
+        """
+
+        samples = [
+            (
+                "<PubDate><Year>2018</Year><Month>Dec</Month>"
+                "<Day>05</Day></PubDate>",
+                {
+                    "Year": "2018",
+                    "Month": "12",
+                    "Day": "05",
+                    "Date": datetime.date(2018, 12, 5),
+                },
+            ),
+            (
+                "<DateRevised><Year>2018</Year><Month>02</Month>"
+                "<Day>30</Day></DateRevised>",
+                {"Year": "2018", "Month": "02", "Day": "30", "Date": None},
+            ),
+            (
+                "<PubDate><MedlineDate>1998 Dec-1999 Jan</MedlineDate>"
+                "</PubDate>",
+                {"Year": 1998, "Month": None, "Day": None, "Date": None},
+            ),
+            (
+                "<PubDate><Year>2001</Year>"
+                "<MedlineDate>1998 Dec-1999 Jan</MedlineDate></PubDate>",
+                {"Year": "2001", "Month": None, "Day": None, "Date": None},
+            ),
+        ]
+
+        for sample, expected in samples:
+            element = etree.fromstring(sample)
+            self.assertEqual(parse_date_element(element), expected)
+
+        self.assertEqual(
+            parse_date_element(None),
+            {"Year": None, "Month": None, "Day": None, "Date": None},
+        )
+        self.assertEqual(
+            extract_year_from_medlinedate(etree.fromstring(samples[2][0])),
+            1998,
+        )
+
+    def test_parse_date_element_fresh(self):
+        """ Tests that memoized dates are returned as new dictionaries."""
+
+        element = etree.fromstring(
+            "<DateRevised><Year>2018</Year><Month>12</Month>"
+            "<Day>05</Day></DateRevised>"
+        )
+
+        date = parse_date_element(element)
+        date["Year"] = None
+
+        self.assertEqual(parse_date_element(element)["Year"], "2018")
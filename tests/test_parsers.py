@@ -1,8 +1,23 @@
 # coding=utf-8
 
+import io
+import os
+import gzip
+import datetime
+import tempfile
+
 from lxml import etree
 
+from pubmed_ingester.excs import InvalidArguments
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
 from tests.bases import TestBase
+from tests.assets.PMID1 import document as doc_pmid1
+from tests.assets.PMID30516271 import document as doc_pmid30516271
+from tests.assets.PMID30516272 import document as doc_pmid30516272
+from tests.assets.PMID30516273 import document as doc_pmid30516273
+from tests.assets.PMID30516284 import document as doc_pmid30516284
+from tests.assets.PMID30516287 import document as doc_pmid30516287
+from tests.assets.PMID30518562 import document as doc_pmid30518562
 from tests.assets.pubmed_sample_xml import pubmed_sample_xml
 from tests.assets.pubmed_sample_parsed import pubmed_sample_parsed
 
@@ -22,6 +37,49 @@ class TestParser(TestBase):
 
         return article
 
+    @staticmethod
+    def _get_rss():
+        """ Returns the current resident set size of the process in bytes."""
+
+        with open("/proc/self/statm") as finp:
+            num_pages = int(finp.read().split()[1])
+
+        return num_pages * os.sysconf("SC_PAGE_SIZE")
+
+    def _write_assets_file(self, num_repeats=1, pmids_deleted=None):
+        """ Writes out a gzipped Pubmed XML file with all PubMed article assets
+            repeated `num_repeats` times, followed by a `<DeleteCitation>`
+            element with `pmids_deleted` if defined, and returns its filename.
+        """
+
+        documents = [
+            doc_pmid1,
+            doc_pmid30516271,
+            doc_pmid30516272,
+            doc_pmid30516273,
+            doc_pmid30516284,
+            doc_pmid30516287,
+            doc_pmid30518562,
+        ]
+
+        fd, filename = tempfile.mkstemp(suffix=".xml.gz")
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        with gzip.open(filename, "wt", encoding="utf-8") as fout:
+            fout.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            fout.write("<PubmedArticleSet>\n")
+            for _ in range(num_repeats):
+                for document in documents:
+                    fout.write(document)
+            if pmids_deleted:
+                fout.write("<DeleteCitation>\n")
+                for pmid in pmids_deleted:
+                    fout.write('<PMID Version="1">{}</PMID>\n'.format(pmid))
+                fout.write("</DeleteCitation>\n")
+            fout.write("</PubmedArticleSet>\n")
+
+        return filename
+
     def setUp(self):
         super(TestParser, self).setUp()
         tree = etree.fromstring(pubmed_sample_xml.encode("utf-8"))
@@ -143,3 +201,429 @@ class TestParser(TestBase):
         )
 
         self.assertEqual(_eval, _refr)
+
+    def test_generate_xml_elements_constant_memory(self):
+        """ Tests that the `parse` method of the `ParserXmlPubmedArticle` class
+            streams a large file without the resident memory growing between
+            the first and the last article.
+        """
+
+        num_articles = 30000
+
+        # Write out a large synthetic file by repeating the PMID1 article
+        # under different PMIDs.
+        fd, filename = tempfile.mkstemp(suffix=".xml.gz")
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        with gzip.open(filename, "wt", encoding="utf-8") as fout:
+            fout.write("<PubmedArticleSet>\n")
+            for pmid in range(1, num_articles + 1):
+                fout.write(doc_pmid1.replace(
+                    '<PMID Version="1">1</PMID>',
+                    '<PMID Version="1">{}</PMID>'.format(pmid),
+                ))
+            fout.write("</PubmedArticleSet>\n")
+
+        rss_first = None
+        rss_peak = 0
+        for idx, _ in enumerate(self.parser.parse(filename_xml=filename)):
+            # Skip the first articles to allow for allocator warm-up.
+            if idx == 1000:
+                rss_first = self._get_rss()
+            elif idx > 1000 and idx % 100 == 0:
+                rss_peak = max(rss_peak, self._get_rss())
+
+        self.assertEqual(idx + 1, num_articles)
+        # Emptied elements retained under the root would add several MB over
+        # this many articles.
+        self.assertLess(rss_peak - rss_first, 2 * 1024 * 1024)
+
+    def test_parse_parallel(self):
+        """ Tests that the `parse_parallel` method of the
+            `ParserXmlPubmedArticle` class yields the same documents in the
+            same order as the `parse` method.
+        """
+
+        filename = self._write_assets_file(num_repeats=5)
+
+        _refr = list(self.parser.parse(filename_xml=filename))
+        _eval = list(self.parser.parse_parallel(
+            filename_xml=filename,
+            num_processes=2,
+            chunk_size=3,
+        ))
+
+        self.assertEqual(len(_refr), 35)
+        self.assertEqual(_eval, _refr)
+
+    def test_parse_parallel_stats(self):
+        """ Tests that the `parse_parallel` method of the
+            `ParserXmlPubmedArticle` class merges the parser statistics of the
+            worker processes into those of the parent's parser.
+        """
+
+        filename = self._write_assets_file(num_repeats=5)
+        parser = ParserXmlPubmedArticle(
+            do_collect_stats=True,
+            logger_level="WARNING",
+        )
+
+        list(parser.parse(filename_xml=filename))
+        counts_refr = dict(parser.stats.counts)
+
+        list(parser.parse_parallel(
+            filename_xml=filename,
+            num_processes=2,
+            chunk_size=3,
+        ))
+        counts_eval = dict(parser.stats.counts)
+
+        self.assertEqual(counts_refr["parse_pubmed_article"], 35)
+        self.assertEqual(counts_eval, counts_refr)
+
+    def test_generate_xml_chunks(self):
+        """ Tests that the `generate_xml_chunks` method of the
+            `ParserXmlPubmedArticle` class splits elements correctly regardless
+            of where reads fall.
+        """
+
+        content = (
+            b"<PubmedArticleSet><PubmedArticle><a>1</a></PubmedArticle>"
+            b"<PubmedArticle><a>2</a></PubmedArticle>"
+            b"<PubmedArticle><a>3</a></PubmedArticle></PubmedArticleSet>"
+        )
+
+        for read_size in [1, 7, 16, len(content)]:
+            chunks = list(self.parser.generate_xml_chunks(
+                file_xml=io.BytesIO(content),
+                element_tag="PubmedArticle",
+                num_elements=2,
+                read_size=read_size,
+            ))
+
+            self.assertEqual(chunks, [
+                b"<PubmedArticle><a>1</a></PubmedArticle>"
+                b"<PubmedArticle><a>2</a></PubmedArticle>",
+                b"<PubmedArticle><a>3</a></PubmedArticle>",
+            ])
+
+    def test_parse_batches(self):
+        """ Tests the `parse_batches` method of the `ParserXmlPubmedArticle`
+            class asserting that the batches hold the same data as the parsed
+            documents.
+        """
+
+        filename = self._write_assets_file(num_repeats=1)
+        pubmed_articles = list(self.parser.parse(filename_xml=filename))
+
+        batches = list(self.parser.parse_batches(
+            filename_xml=filename,
+            batch_size=3,
+        ))
+
+        # Seven articles should yield batches of 3, 3, and 1 citations.
+        self.assertEqual(
+            [len(batch["citations"]["pmid"]) for batch in batches],
+            [3, 3, 1],
+        )
+
+        # All columns of an entity type should be of equal length.
+        for batch in batches:
+            for entity, columns in batch.items():
+                lengths = set(len(values) for values in columns.values())
+                self.assertEqual(len(lengths), 1, entity)
+
+        pmids = []
+        num_authors = 0
+        num_keywords = 0
+        for batch in batches:
+            pmids.extend(batch["citations"]["pmid"])
+            num_authors += len(batch["authors"]["pmid"])
+            num_keywords += len(batch["keywords"]["pmid"])
+
+        self.assertEqual(pmids, [
+            int(pubmed_article["MedlineCitation"]["PMID"]["PMID"])
+            for pubmed_article in pubmed_articles
+        ])
+        self.assertEqual(num_authors, sum(
+            len(
+                pubmed_article["MedlineCitation"]["Article"]["Article"][
+                    "AuthorList"
+                ].get("Authors", [])
+            ) for pubmed_article in pubmed_articles
+        ))
+        self.assertEqual(num_keywords, sum(
+            len(
+                pubmed_article["MedlineCitation"]["KeywordList"].get(
+                    "Keywords", []
+                )
+            ) for pubmed_article in pubmed_articles
+        ))
+
+    def test_parse_batches_sections(self):
+        """ Tests the `parse_batches` method of the `ParserXmlPubmedArticle`
+            class with a narrow projection asserting that the projected
+            sections are batched as in a full parse while the rest are empty.
+        """
+
+        filename = self._write_assets_file(num_repeats=1)
+
+        batches = list(self.parser.parse_batches(
+            filename_xml=filename,
+            batch_size=3,
+        ))
+        batches_projected = list(self.parser.parse_batches(
+            filename_xml=filename,
+            batch_size=3,
+            sections={"MeshHeadingList"},
+        ))
+
+        self.assertEqual(len(batches_projected), len(batches))
+
+        for batch, batch_projected in zip(batches, batches_projected):
+            self.assertEqual(
+                batch_projected["citations"]["pmid"],
+                batch["citations"]["pmid"],
+            )
+            self.assertEqual(
+                batch_projected["mesh_headings"],
+                batch["mesh_headings"],
+            )
+            self.assertFalse(batch_projected["authors"]["pmid"])
+            self.assertFalse(batch_projected["keywords"]["pmid"])
+            self.assertFalse(batch_projected["grants"]["pmid"])
+            self.assertEqual(
+                set(batch_projected["citations"]["journal_title"]),
+                {None},
+            )
+
+    def test_parse_sections(self):
+        """ Tests the `sections` projection of the `parse` method of the
+            `ParserXmlPubmedArticle` class asserting that requested sections
+            are parsed as in a full parse while the rest are left empty.
+        """
+
+        filename = self._write_assets_file(num_repeats=1)
+        sections = {"MeshHeadingList", "AuthorList"}
+
+        pubmed_articles = list(self.parser.parse(filename_xml=filename))
+        pubmed_articles_projected = list(self.parser.parse(
+            filename_xml=filename,
+            sections=sections,
+        ))
+
+        self.assertEqual(len(pubmed_articles_projected), len(pubmed_articles))
+
+        for pubmed_article, pubmed_article_projected in zip(
+            pubmed_articles,
+            pubmed_articles_projected,
+        ):
+            citation = pubmed_article["MedlineCitation"]
+            citation_projected = pubmed_article_projected["MedlineCitation"]
+            article = citation["Article"]["Article"]
+            article_projected = citation_projected["Article"]["Article"]
+
+            self.assertEqual(citation_projected["PMID"], citation["PMID"])
+            self.assertEqual(
+                citation_projected["DateRevised"],
+                citation["DateRevised"],
+            )
+            self.assertEqual(
+                article_projected["ArticleTitle"],
+                article["ArticleTitle"],
+            )
+            self.assertEqual(
+                citation_projected["MeshHeadingList"],
+                citation["MeshHeadingList"],
+            )
+            self.assertEqual(
+                article_projected["AuthorList"],
+                article["AuthorList"],
+            )
+
+            # Unrequested sections should be empty.
+            self.assertEqual(citation_projected["ChemicalList"], {})
+            self.assertEqual(citation_projected["KeywordList"], {})
+            self.assertEqual(article_projected["Journal"], {})
+            self.assertEqual(article_projected["Abstract"], {})
+            self.assertEqual(article_projected["GrantList"], {})
+            self.assertIsNone(article_projected["Language"])
+            self.assertEqual(
+                pubmed_article_projected["PubmedData"]["ArticleIdList"],
+                {},
+            )
+
+    def test_parse_sections_invalid(self):
+        """ Tests that unknown sections raise an `InvalidArguments`
+            exception.
+        """
+
+        filename = self._write_assets_file(num_repeats=1)
+
+        with self.assertRaises(InvalidArguments):
+            list(self.parser.parse(
+                filename_xml=filename,
+                sections={"MeshHeadingList", "Unknown"},
+            ))
+
+    def test_parse_interning(self):
+        """ Tests that low-cardinality values are shared across parsed
+            documents and that the intern table is bounded.
+        """
+
+        filename = self._write_assets_file(num_repeats=2)
+
+        pubmed_articles = list(self.parser.parse(filename_xml=filename))
+        num_articles = len(pubmed_articles) // 2
+
+        for pubmed_article, pubmed_article_repeat in zip(
+            pubmed_articles[:num_articles],
+            pubmed_articles[num_articles:],
+        ):
+            journal = pubmed_article["MedlineCitation"]["Article"]["Article"][
+                "Journal"
+            ]
+            journal_repeat = pubmed_article_repeat["MedlineCitation"][
+                "Article"
+            ]["Article"]["Journal"]
+            self.assertIs(journal["Title"], journal_repeat["Title"])
+            self.assertIs(
+                pubmed_article["MedlineCitation"]["Status"],
+                pubmed_article_repeat["MedlineCitation"]["Status"],
+            )
+
+        self.parser.intern_table.clear()
+        self.parser.intern_max_size = 5
+        list(self.parser.parse(filename_xml=filename))
+        self.assertEqual(len(self.parser.intern_table), 5)
+
+    def test_parse_article_filter(self):
+        """ Tests that articles rejected by the article filter are skipped
+            before being parsed and counted.
+        """
+
+        filename = self._write_assets_file(num_repeats=1)
+
+        headers = []
+
+        def article_filter(header):
+            headers.append(header)
+            return header["PMID"] != "30516272"
+
+        # Parsing of rejected articles would fail.
+        parse_pubmed_article = self.parser.parse_pubmed_article
+
+        def parse_pubmed_article_checked(element, sections=None):
+            pmid = element.find("MedlineCitation").find("PMID").text
+            self.assertNotEqual(pmid, "30516272")
+            return parse_pubmed_article(element=element, sections=sections)
+
+        self.parser.parse_pubmed_article = parse_pubmed_article_checked
+
+        pubmed_articles = list(self.parser.parse(
+            filename_xml=filename,
+            article_filter=article_filter,
+        ))
+
+        self.assertEqual(len(headers), 7)
+        self.assertEqual(
+            headers[1],
+            {
+                "PMID": "30516271",
+                "Version": "1",
+                "Status": "Publisher",
+                "Owner": "NLM",
+                "DateRevised": datetime.date(2018, 12, 5),
+            },
+        )
+        self.assertEqual(len(pubmed_articles), 6)
+        self.assertEqual(self.parser.num_articles_skipped, 1)
+        self.assertNotIn(
+            "30516272",
+            [
+                pubmed_article["MedlineCitation"]["PMID"]["PMID"]
+                for pubmed_article in pubmed_articles
+            ],
+        )
+
+    def test_parse_delete_citations(self):
+        """ Tests that `<DeleteCitation>` elements are only parsed into
+            `DeleteCitation` documents when requested.
+        """
+
+        filename = self._write_assets_file(
+            num_repeats=1,
+            pmids_deleted=["12345", "12346"],
+        )
+
+        pubmed_articles = list(self.parser.parse(filename_xml=filename))
+        self.assertEqual(len(pubmed_articles), 7)
+
+        documents = list(self.parser.parse(
+            filename_xml=filename,
+            article_filter=lambda header: header["PMID"] != "30516272",
+            do_yield_deletions=True,
+        ))
+
+        self.assertEqual(len(documents), 7)
+        self.assertEqual(
+            documents[-1],
+            {"DeleteCitation": {"PMIDs": ["12345", "12346"]}},
+        )
+        self.assertEqual(self.parser.num_articles_skipped, 1)
+
+    def test_parse_stats(self):
+        """ Tests that the `parse_*` method calls are only recorded when
+            instrumentation is enabled.
+        """
+
+        filename = self._write_assets_file(num_repeats=2)
+
+        self.assertIsNone(self.parser.stats)
+        self.assertNotIn("parse_author", vars(self.parser))
+
+        parser = ParserXmlPubmedArticle(
+            do_collect_stats=True,
+            logger_level="WARNING",
+        )
+        pubmed_articles = list(parser.parse(filename_xml=filename))
+
+        self.assertEqual(pubmed_articles, list(self.parser.parse(filename)))
+        stats = parser.stats.as_dict()
+        self.assertEqual(stats["parse_pubmed_article"]["count"], 14)
+        self.assertEqual(stats["parse_medline_citation"]["count"], 14)
+        self.assertGreater(stats["parse_author"]["count"], 14)
+        self.assertGreater(stats["parse_date_element"]["count"], 14)
+        self.assertGreater(
+            stats["parse_pubmed_article"]["duration"],
+            stats["parse_medline_citation"]["duration"],
+        )
+        self.assertNotIn("parse_pubmed_articles", stats)
+
+    def test_prefetch_xml_file(self):
+        """ Tests that prefetched files are parsed off their read-ahead reader
+            into the same documents and that unopened readers are released.
+        """
+
+        filename = self._write_assets_file(num_repeats=2)
+        pubmed_articles = list(self.parser.parse(filename_xml=filename))
+
+        self.parser.prefetch_max_size = 1024
+        self.parser.prefetch_xml_file(filename_xml=filename, chunk_size=512)
+        file_xml = self.parser.files_prefetched[filename]
+        # The read-ahead is capped at `prefetch_max_size` bytes.
+        self.assertEqual(file_xml._queue.maxsize, 2)
+
+        self.assertEqual(
+            list(self.parser.parse(filename_xml=filename)),
+            pubmed_articles,
+        )
+        self.assertEqual(self.parser.files_prefetched, {})
+
+        # Files that fail to open are only opened, and fail, when parsed.
+        self.parser.prefetch_xml_file(filename_xml="/nonexistent.xml.gz")
+        self.assertEqual(self.parser.files_prefetched, {})
+
+        self.parser.prefetch_xml_file(filename_xml=filename)
+        self.parser.discard_prefetched_xml_file(filename_xml=filename)
+        self.assertEqual(self.parser.files_prefetched, {})
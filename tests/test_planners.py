@@ -0,0 +1,189 @@
+# coding=utf-8
+
+import os
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+import unittest
+from unittest import mock
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.planners import PlannerLastWriter
+from pubmed_ingester.pubmed_ingester import main
+from tests.assets.PMID1 import document as doc_pmid1
+from tests.assets.PMID30516271 import document as doc_pmid30516271
+from tests.assets.PMID30516272 import document as doc_pmid30516272
+
+
+class TestPlannerLastWriter(unittest.TestCase):
+    """Tests the `PlannerLastWriter` class."""
+
+    def setUp(self):
+        self.parser = ParserXmlPubmedArticle(logger_level="WARNING")
+
+    def _write_file(self, documents, pmids_deleted=None):
+        """ Writes out a Pubmed XML file with the given article documents
+            followed by a `<DeleteCitation>` element with `pmids_deleted` if
+            defined, and returns its filename.
+        """
+
+        fd, filename = tempfile.mkstemp(suffix=".xml")
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        with open(filename, "w", encoding="utf-8") as fout:
+            fout.write("<PubmedArticleSet>\n")
+            for document in documents:
+                fout.write(document)
+            if pmids_deleted:
+                fout.write("<DeleteCitation>\n")
+                for pmid in pmids_deleted:
+                    fout.write('<PMID Version="1">{}</PMID>\n'.format(pmid))
+                fout.write("</DeleteCitation>\n")
+            fout.write("</PubmedArticleSet>\n")
+
+        return filename
+
+    def test_plan(self):
+        """ Tests that every PMID is planned out of the last file it appears
+            in unless it's deleted in or after that file.
+        """
+
+        filename_baseline = self._write_file(
+            documents=[doc_pmid1, doc_pmid30516271, doc_pmid30516272],
+        )
+        filename_update_01 = self._write_file(
+            documents=[doc_pmid30516271],
+            pmids_deleted=["1", "30516272"],
+        )
+        filename_update_02 = self._write_file(
+            documents=[doc_pmid30516272],
+        )
+
+        planner = PlannerLastWriter(
+            filenames=[
+                filename_baseline,
+                filename_update_01,
+                filename_update_02,
+            ],
+            logger_level="WARNING",
+        )
+        planner.plan(parser=self.parser)
+
+        self.assertIsNone(planner.get_file_index(pmid=1))
+        self.assertEqual(planner.get_file_index(pmid=30516271), 1)
+        self.assertEqual(planner.get_file_index(pmid=30516272), 2)
+        self.assertIsNone(planner.get_file_index(pmid=99999999))
+
+        header = {"PMID": "30516271"}
+        self.assertFalse(
+            planner.is_planned(header=header, filename=filename_baseline)
+        )
+        self.assertTrue(
+            planner.is_planned(header=header, filename=filename_update_01)
+        )
+
+        # The deletion of a PMID re-added in a later file is skipped.
+        self.assertEqual(
+            planner.filter_deletions(
+                pmids=["1", "30516272"],
+                filename=filename_update_01,
+            ),
+            ["1"],
+        )
+
+    def test_plan_article_filter(self):
+        """ Tests that articles rejected by the article filter aren't
+            planned.
+        """
+
+        filename = self._write_file(
+            documents=[doc_pmid1, doc_pmid30516271],
+        )
+
+        planner = PlannerLastWriter(
+            filenames=[filename],
+            logger_level="WARNING",
+        )
+        planner.plan(
+            parser=self.parser,
+            article_filter=lambda header: header["PMID"] != "1",
+        )
+
+        self.assertIsNone(planner.get_file_index(pmid=1))
+        self.assertEqual(planner.get_file_index(pmid=30516271), 0)
+
+    def test_plan_num_processes(self):
+        """ Tests that files scanned in parallel by pool processes creating
+            parsers of their own are planned as when scanned serially.
+        """
+
+        filenames = [
+            self._write_file(documents=[doc_pmid1, doc_pmid30516271]),
+            self._write_file(documents=[doc_pmid30516271], pmids_deleted=["1"]),
+            self._write_file(documents=[doc_pmid30516272]),
+        ]
+
+        planner = PlannerLastWriter(
+            filenames=filenames,
+            logger_level="WARNING",
+        )
+        with mock.patch(
+            "pubmed_ingester.planners.multiprocessing.Pool",
+            wraps=multiprocessing.Pool,
+        ) as mock_pool:
+            planner.plan(parser=self.parser, num_processes=2)
+
+        self.assertEqual(
+            mock_pool.call_args[1]["initargs"],
+            (ParserXmlPubmedArticle, self.parser.get_worker_kwargs(), None),
+        )
+
+        self.assertIsNone(planner.get_file_index(pmid=1))
+        self.assertEqual(planner.get_file_index(pmid=30516271), 1)
+        self.assertEqual(planner.get_file_index(pmid=30516272), 2)
+
+    def test_plan_cache(self):
+        """ Tests that files are scanned without going through the cache of
+            the parser, which would fully parse and cache every article.
+        """
+
+        filename = self._write_file(documents=[doc_pmid1, doc_pmid30516271])
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        planner = PlannerLastWriter(
+            filenames=[filename],
+            logger_level="WARNING",
+        )
+        planner.plan(
+            parser=ParserXmlPubmedArticle(
+                cache_dir=cache_dir,
+                logger_level="WARNING",
+            ),
+        )
+
+        self.assertEqual(planner.get_file_index(pmid=30516271), 0)
+        self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_main_workers_require_dedupe(self):
+        """ Tests that the `pubmed_ingester` main module refuses to ingest
+            files with more than one worker without a plan as the files would
+            be ingested out of order.
+        """
+
+        args = argparse.Namespace(
+            filenames=["pubmed-1.xml", "pubmed-2.xml"],
+            config_file=None,
+            workers=2,
+            incremental=False,
+            dedupe=False,
+        )
+
+        with mock.patch(
+            "pubmed_ingester.pubmed_ingester.load_config"
+        ) as load_config:
+            with self.assertRaises(ValueError):
+                main(args=args)
+
+        load_config.assert_not_called()
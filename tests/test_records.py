@@ -0,0 +1,59 @@
+# coding=utf-8
+
+import unittest
+
+from lxml import etree
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.records import from_document
+from pubmed_ingester.records import to_document
+from pubmed_ingester.records import PubmedArticle
+from tests.assets.PMID1 import document as doc_pmid1
+from tests.assets.PMID30516271 import document as doc_pmid30516271
+from tests.assets.PMID30516272 import document as doc_pmid30516272
+from tests.assets.PMID30516273 import document as doc_pmid30516273
+from tests.assets.PMID30516284 import document as doc_pmid30516284
+from tests.assets.PMID30516287 import document as doc_pmid30516287
+from tests.assets.PMID30518562 import document as doc_pmid30518562
+from tests.assets.pubmed_sample_xml import pubmed_sample_xml
+
+
+class TestRecords(unittest.TestCase):
+    """Tests the conversions between documents and records."""
+
+    def setUp(self):
+        self.parser = ParserXmlPubmedArticle(logger_level="WARNING")
+
+    def _parse_sample(self, sample):
+        element = etree.fromstring(text=sample)
+        if element.tag != "PubmedArticle":
+            element = element.find("PubmedArticle")
+
+        return self.parser.parse_pubmed_article(element=element)
+
+    def test_round_trip(self):
+        """ Tests that converting the parsed PubMed article assets into records
+            and back yields the original documents.
+        """
+
+        samples = [
+            doc_pmid1,
+            doc_pmid30516271,
+            doc_pmid30516272,
+            doc_pmid30516273,
+            doc_pmid30516284,
+            doc_pmid30516287,
+            doc_pmid30518562,
+            pubmed_sample_xml.encode("utf-8"),
+        ]
+
+        for sample in samples:
+            document = self._parse_sample(sample=sample)
+            record = from_document(document=document)
+
+            self.assertIsInstance(record, PubmedArticle)
+            self.assertEqual(
+                record.citation.pmid,
+                document["MedlineCitation"]["PMID"]["PMID"],
+            )
+            self.assertEqual(to_document(record=record), document)
@@ -0,0 +1,36 @@
+# coding=utf-8
+
+import unittest
+
+from pubmed_ingester.stats import StatsParser
+
+
+class TestStatsParser(unittest.TestCase):
+    """Tests the `StatsParser` class."""
+
+    def test_wrap(self):
+        """ Tests that the calls of wrapped callables are recorded, including
+            those raising exceptions, and reset.
+        """
+
+        stats = StatsParser()
+
+        def parse_fail():
+            raise ValueError
+
+        parse_add = stats.wrap("parse_add", lambda a, b: a + b)
+        parse_fail = stats.wrap("parse_fail", parse_fail)
+
+        self.assertEqual(parse_add(1, b=2), 3)
+        self.assertEqual(parse_add(2, 3), 5)
+        self.assertRaises(ValueError, parse_fail)
+
+        result = stats.as_dict()
+        self.assertEqual(result["parse_add"]["count"], 2)
+        self.assertEqual(result["parse_fail"]["count"], 1)
+        self.assertGreaterEqual(result["parse_add"]["duration"], 0)
+        self.assertIn("parse_add 2 calls", stats.summary())
+
+        stats.reset()
+        self.assertEqual(stats.as_dict(), {})
+        self.assertEqual(stats.summary(), "")
@@ -0,0 +1,82 @@
+# coding=utf-8
+
+import os
+import tempfile
+import unittest
+
+from lxml import etree
+
+from pubmed_ingester.parsers import ParserXmlPubmedArticle
+from pubmed_ingester.synthetic import GeneratorPubmedArticleSet
+
+
+class TestGeneratorPubmedArticleSet(unittest.TestCase):
+    """Tests the `GeneratorPubmedArticleSet` class."""
+
+    def setUp(self):
+        self.generator = GeneratorPubmedArticleSet(
+            seed=1,
+            num_authors_max=4,
+            logger_level="WARNING",
+        )
+        self.parser = ParserXmlPubmedArticle(logger_level="WARNING")
+
+    def test_generate_article_deterministic(self):
+        """ Tests that the same seed and PMID generate the same article
+            regardless of the generator instance.
+        """
+
+        generator = GeneratorPubmedArticleSet(
+            seed=1,
+            num_authors_max=4,
+            logger_level="WARNING",
+        )
+
+        self.assertEqual(
+            etree.tostring(self.generator.generate_article(pmid=10)),
+            etree.tostring(generator.generate_article(pmid=10)),
+        )
+        self.assertNotEqual(
+            etree.tostring(self.generator.generate_article(pmid=10)),
+            etree.tostring(self.generator.generate_article(pmid=11)),
+        )
+
+    def test_write(self):
+        """ Tests that written files, gzipped or plain, are parsed into the
+            generated articles and deletions.
+        """
+
+        for suffix in [".xml", ".xml.gz"]:
+            fd, filename = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+            self.addCleanup(os.remove, filename)
+
+            self.generator.write(
+                filename=filename,
+                num_articles=50,
+                pmid_start=100,
+                pmids_deleted=[1, 2],
+            )
+
+            documents = list(self.parser.parse(
+                filename_xml=filename,
+                do_yield_deletions=True,
+            ))
+
+            self.assertEqual(len(documents), 51)
+            self.assertEqual(
+                [
+                    document["MedlineCitation"]["PMID"]["PMID"]
+                    for document in documents[:-1]
+                ],
+                [str(pmid) for pmid in range(100, 150)],
+            )
+            self.assertEqual(
+                documents[-1],
+                {"DeleteCitation": {"PMIDs": ["1", "2"]}},
+            )
+            for document in documents[:-1]:
+                authors = document["MedlineCitation"]["Article"]["Article"][
+                    "AuthorList"
+                ]["Authors"]
+                self.assertTrue(1 <= len(authors) <= 4)
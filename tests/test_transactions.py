@@ -0,0 +1,128 @@
+# coding=utf-8
+
+import argparse
+import contextlib
+import unittest
+from unittest import mock
+
+from pubmed_ingester.pubmed_ingester import main
+from pubmed_ingester.transactions import TransactionUnitOfWork
+
+
+class TestTransactionUnitOfWork(unittest.TestCase):
+    """Tests the `TransactionUnitOfWork` class."""
+
+    def setUp(self):
+        self.session = mock.Mock()
+
+        self.dal = mock.Mock()
+        self.dal.session_scope.side_effect = self._session_scope
+
+        self.unit_of_work = TransactionUnitOfWork(
+            dal=self.dal,
+            size=2,
+            logger_level="WARNING",
+        )
+
+    @contextlib.contextmanager
+    def _session_scope(self):
+        """ Mimics the `session_scope` method of the DAL. """
+
+        try:
+            yield self.session
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def test_delegation(self):
+        """ Tests that DAL methods are called within their own session scope
+            when no unit of work is open.
+        """
+
+        self.unit_of_work.iodi_journal(issn="1234-5678")
+        with self.unit_of_work.session_scope() as session:
+            self.assertIs(session, self.session)
+
+        self.dal.iodi_journal.assert_called_once_with(issn="1234-5678")
+        self.assertEqual(self.session.commit.call_count, 1)
+
+    def test_commit(self):
+        """ Tests that the articles of a unit of work share a single session
+            committed once the unit is committed.
+        """
+
+        for _ in range(2):
+            self.assertFalse(self.unit_of_work.is_full)
+            with self.unit_of_work.savepoint():
+                self.unit_of_work.iodi_journal(issn="1234-5678")
+                with self.unit_of_work.session_scope() as session:
+                    self.assertIs(session, self.session)
+
+        self.assertTrue(self.unit_of_work.is_full)
+        self.assertEqual(self.dal.session_scope.call_count, 1)
+        self.dal.iodi_journal.assert_called_with(
+            issn="1234-5678",
+            session=self.session,
+        )
+        savepoint = self.session.begin_nested.return_value
+        self.assertEqual(savepoint.commit.call_count, 2)
+        self.session.commit.assert_not_called()
+
+        self.unit_of_work.commit()
+
+        self.assertEqual(self.session.commit.call_count, 1)
+        self.assertEqual(self.unit_of_work.num_commits, 1)
+        self.assertFalse(self.unit_of_work.is_full)
+
+        # Once committed DAL methods use their own session scope again.
+        self.unit_of_work.iodi_journal(issn="1234-5678")
+        self.dal.iodi_journal.assert_called_with(issn="1234-5678")
+
+    def test_rollback(self):
+        """ Tests that a failing savepoint is rolled back on its own and that
+            rolling back the unit of work discards it.
+        """
+
+        with self.unit_of_work.savepoint():
+            pass
+
+        with self.assertRaises(ValueError):
+            with self.unit_of_work.savepoint():
+                raise ValueError
+
+        savepoint = self.session.begin_nested.return_value
+        self.assertEqual(savepoint.rollback.call_count, 1)
+        self.assertEqual(self.unit_of_work.num_pending, 1)
+        self.assertEqual(self.unit_of_work.num_rollbacks, 1)
+
+        self.unit_of_work.rollback()
+
+        self.assertEqual(self.session.rollback.call_count, 1)
+        self.assertIsNone(self.unit_of_work.session)
+        self.assertEqual(self.unit_of_work.num_commits, 0)
+
+    def test_main_workers_refuse_unit_of_work(self):
+        """ Tests that the `pubmed_ingester` main module refuses to ingest
+            files in units of work with more than one worker as the units
+            could deadlock on shared records.
+        """
+
+        args = argparse.Namespace(
+            filenames=["pubmed-1.xml", "pubmed-2.xml"],
+            config_file=None,
+            workers=2,
+            incremental=False,
+            dedupe=True,
+        )
+
+        with mock.patch.multiple(
+            "pubmed_ingester.pubmed_ingester",
+            load_config=mock.DEFAULT,
+            create_planner=mock.DEFAULT,
+        ) as mocks:
+            mocks["load_config"].return_value = {"unit_of_work_size": 100}
+            with self.assertRaises(ValueError):
+                main(args=args)
+
+        mocks["create_planner"].assert_not_called()